@@ -0,0 +1,103 @@
+"""
+Compares the per-frame encode/decode cost of the JSON libraries supported by
+`galadriel_node.sdk.codec` on realistic websocket payloads.
+
+Usage: python benchmarks/codec_benchmark.py [--iterations N]
+"""
+
+import argparse
+import base64
+import json
+import os
+import timeit
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Tuple
+
+from galadriel_node.sdk import codec
+
+Codec = Tuple[Callable[[Any], Any], Callable[[Any], Any]]
+
+
+def _get_codecs() -> Dict[str, Codec]:
+    codecs: Dict[str, Codec] = {"json": (json.dumps, json.loads)}
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        codecs["orjson"] = (orjson.dumps, orjson.loads)
+    except ImportError:
+        pass
+    try:
+        import msgspec  # pylint: disable=import-outside-toplevel
+
+        codecs["msgspec"] = (msgspec.json.encode, msgspec.json.decode)
+    except ImportError:
+        pass
+    return codecs
+
+
+def _get_payloads() -> Dict[str, Any]:
+    chunk = {
+        "request_id": "5b0c9f7e-6a4e-4a8e-9f43-0d7a2f6f0e11",
+        "error": None,
+        "chunk": {
+            "id": "chat-6d7c1ff0a4d74d7b9d7a0d2c8e2c3b1a",
+            "object": "chat.completion.chunk",
+            "created": 1730000000,
+            "model": "neuralmagic/Meta-Llama-3.1-8B-Instruct-FP8",
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": " token"},
+                    "logprobs": None,
+                    "finish_reason": None,
+                }
+            ],
+            "usage": None,
+        },
+        "status": 1,
+    }
+    pong = {
+        "protocol": "ping-pong",
+        "data": {
+            "protocol_version": "1.0",
+            "message_type": 2,
+            "node_id": "node-0d7a2f6f",
+            "nonce": "f1c2d3e4",
+            "api_ping_time": [23, 25, None, 24],
+        },
+    }
+    image = {
+        "request_id": "5b0c9f7e-6a4e-4a8e-9f43-0d7a2f6f0e11",
+        "images": [base64.b64encode(os.urandom(1024 * 1024)).decode("utf-8")],
+        "error": None,
+    }
+    return {"chunk": chunk, "pong": pong, "image": image}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"Active node codec: {codec.CODEC_NAME}")
+    print(f"{'payload':<8} {'codec':<8} {'encode us':>10} {'decode us':>10}")
+    for payload_name, payload in _get_payloads().items():
+        # The image payload is large, fewer iterations are enough
+        iterations = max(args.iterations // 1000, 10)
+        if payload_name != "image":
+            iterations = args.iterations
+        for codec_name, (encode, decode) in _get_codecs().items():
+            encoded = encode(payload)
+            encode_time = timeit.timeit(lambda: encode(payload), number=iterations)
+            decode_time = timeit.timeit(lambda: decode(encoded), number=iterations)
+            print(
+                f"{payload_name:<8} {codec_name:<8} "
+                f"{encode_time / iterations * 1e6:>10.2f} "
+                f"{decode_time / iterations * 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
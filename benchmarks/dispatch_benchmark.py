@@ -0,0 +1,149 @@
+"""
+Measures the per-message dispatch cost of the inbound message router for each
+message kind, next to the previous trial-and-error parsing: inference request
+check, then image generation validation, then the protocol handler.
+
+The router's handlers validate the request like the node's handlers do and then
+drop it, so both paths measure classification, validation and routing.
+
+Usage: python benchmarks/dispatch_benchmark.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+
+from galadriel_node.sdk.image_generation import validate_image_generation_request
+from galadriel_node.sdk.protocol.entities import InferenceRequest
+from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
+from galadriel_node.sdk.protocol.protocol_handler import MessageKind
+from galadriel_node.sdk.protocol.protocol_handler import ProtocolHandler
+
+MESSAGES: Dict[str, Any] = {
+    "inference": {
+        "id": "5b0c9f7e-6a4e-4a8e-9f43-0d7a2f6f0e11",
+        "chat_request": {
+            "model": "neuralmagic/Meta-Llama-3.1-8B-Instruct-FP8",
+            "messages": [{"role": "user", "content": "Hello"}],
+            "stream": True,
+        },
+    },
+    "image": {
+        "request_id": "5b0c9f7e-6a4e-4a8e-9f43-0d7a2f6f0e11",
+        "prompt": "A cat in a hat",
+        "image": None,
+        "n": 1,
+        "size": None,
+    },
+    "ping": {
+        "protocol": "ping-pong",
+        "data": {
+            "protocol_version": "1.0",
+            "message_type": 1,
+            "node_id": "node-0d7a2f6f",
+            "nonce": "f1c2d3e4",
+            "rtt": 23,
+            "ping_streak": 10,
+            "miss_streak": 0,
+        },
+    },
+    "reconnect": {
+        "protocol": "ping-pong",
+        "data": {
+            "protocol_version": "1.0",
+            "message_type": 3,
+            "node_id": "node-0d7a2f6f",
+            "nonce": "f1c2d3e4",
+            "reconnect_request": False,
+        },
+    },
+}
+
+
+# pylint: disable=too-few-public-methods
+class _Writer:
+    async def send(self, message: Any, priority: Any = None) -> None:
+        pass
+
+
+class _ApiPingJob:
+    async def get_and_clear_ping_time(self) -> list:
+        return []
+
+
+async def _noop(_: Any) -> None:
+    pass
+
+
+# Validate like the node's handlers do, so both paths pay for the same parsing
+async def _start_inference(data: Any) -> None:
+    await _noop(InferenceRequest.get_inference_request(data))
+
+
+async def _start_image_generation(data: Any) -> None:
+    await _noop(validate_image_generation_request(data=data))
+
+
+def _create_handler() -> ProtocolHandler:
+    handler = ProtocolHandler("node-0d7a2f6f", _Writer())  # type: ignore[arg-type]
+    handler.register(
+        "ping-pong", PingPongProtocol(_ApiPingJob())  # type: ignore[arg-type]
+    )
+    handler.register_handler(MessageKind.INFERENCE, _start_inference)
+    handler.register_handler(MessageKind.IMAGE_GENERATION, _start_image_generation)
+    return handler
+
+
+async def _trial_and_error_dispatch(handler: ProtocolHandler, data: Any) -> None:
+    inference_request = InferenceRequest.get_inference_request(data)
+    if inference_request is not None:
+        await _noop(inference_request)
+        return
+    image_request = validate_image_generation_request(data=data)
+    if image_request is not None:
+        await _noop(image_request)
+        return
+    await handler.handle(data)
+
+
+async def _time(
+    dispatch: Callable[[Any], Awaitable[None]], data: Any, iterations: int
+) -> float:
+    # Warm up caches and pydantic's validators before timing
+    for _ in range(iterations // 10):
+        await dispatch(data)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await dispatch(data)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def _run(iterations: int) -> None:
+    handler = _create_handler()
+    print(f"{'message':<10} {'router us':>10} {'trial-and-error us':>19}")
+    for name, data in MESSAGES.items():
+        router_time = await _time(handler.dispatch, data, iterations)
+        legacy_time = await _time(
+            lambda message: _trial_and_error_dispatch(handler, message),
+            data,
+            iterations,
+        )
+        print(f"{name:<10} {router_time:>10.2f} {legacy_time:>19.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=10_000)
+    args = parser.parse_args()
+    # Logging of the protocol handler would dominate the measurement
+    logging.disable(logging.CRITICAL)
+    asyncio.run(_run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ import typer
 from rich.table import Table
 
 from galadriel_node.config import config
-from galadriel_node.sdk.upgrade import version_aware_get
 from galadriel_node.sdk.logging_utils import get_node_logger
 
 network_app = typer.Typer(
@@ -22,10 +21,15 @@ def network_stats(
     api_url: str = typer.Option(config.GALADRIEL_API_URL, help="API url"),
     api_key: str = typer.Option(config.GALADRIEL_API_KEY, help="API key"),
 ):
+    # Imported here, so the CLI starts without the HTTP client
+    # pylint: disable=import-outside-toplevel
+    from galadriel_node.sdk import http_client
+    from galadriel_node.sdk.upgrade import version_aware_get
+
     config.validate()
 
     status, response_json = asyncio.run(
-        version_aware_get(api_url, "network/stats", api_key)
+        http_client.closing(version_aware_get(api_url, "network/stats", api_key))
     )
 
     if status == HTTPStatus.OK and response_json:
@@ -8,15 +8,15 @@ import rich
 import typer
 
 from galadriel_node.config import config
-from galadriel_node.llm_backends import vllm
-from galadriel_node.sdk import long_benchmark
+from galadriel_node.config import parse_llm_base_urls
 from galadriel_node.sdk.entities import AuthenticationError
 from galadriel_node.sdk.entities import SdkError
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.logging_utils import init_logging
-from galadriel_node.sdk.node import check_llm
-from galadriel_node.sdk.node import run_node
-from galadriel_node.sdk.upgrade import version_aware_get
+
+# Commands import what they run, so the CLI starts without loading the node's
+# dependencies for every command
+# pylint: disable=import-outside-toplevel
 
 node_app = typer.Typer(
     name="node",
@@ -42,10 +42,17 @@ def node_run(
     """
     Entry point for running the node with retry logic and connection handling.
     """
+    from galadriel_node.sdk import http_client
+    from galadriel_node.sdk.node import run_node
+
     init_logging(debug)
     config.validate()
     try:
-        asyncio.run(run_node.execute(api_url, rpc_url, api_key, node_id, llm_base_url))
+        asyncio.run(
+            http_client.closing(
+                run_node.execute(api_url, rpc_url, api_key, node_id, llm_base_url)
+            )
+        )
     except AuthenticationError:
         logger.error("Authentication failed. Please check your API key and try again.")
         sys.exit(1)
@@ -66,11 +73,16 @@ def node_status(
     node_id: str = typer.Option(config.GALADRIEL_NODE_ID, help="Node ID"),
     debug: bool = typer.Option(False, help="Enable debug mode"),
 ):
+    from galadriel_node.sdk import http_client
+    from galadriel_node.sdk.upgrade import version_aware_get
+
     init_logging(debug)
     config.validate()
     status, response_json = asyncio.run(
-        version_aware_get(
-            api_url, "node/info", api_key, query_params={"node_id": node_id}
+        http_client.closing(
+            version_aware_get(
+                api_url, "node/info", api_key, query_params={"node_id": node_id}
+            )
         )
     )
     if status == HTTPStatus.OK and response_json:
@@ -99,11 +111,15 @@ def llm_status(
     ),
     debug: bool = typer.Option(False, help="Enable debug mode"),
 ):
+    from galadriel_node.llm_backends import vllm
+    from galadriel_node.sdk import http_client
+    from galadriel_node.sdk.node import check_llm
+
     init_logging(debug)
     config.validate()
-    if not llm_base_url:
-        llm_base_url = vllm.LLM_BASE_URL
-    asyncio.run(check_llm.execute(llm_base_url, model_id))
+    llm_base_urls = parse_llm_base_urls(llm_base_url) or [vllm.LLM_BASE_URL]
+    for url in llm_base_urls:
+        asyncio.run(http_client.closing(check_llm.execute(url, model_id)))
 
 
 @node_app.command("benchmark", help="Benchmarks the node")
@@ -116,11 +132,13 @@ def benchmark(
     requests: int = typer.Option(10, help="How many requests per worker"),
     debug: bool = typer.Option(False, help="Enable debug mode"),
 ):
+    from galadriel_node.llm_backends import vllm
+    from galadriel_node.sdk import long_benchmark
+
     init_logging(debug)
     config.validate()
-    if not llm_base_url:
-        llm_base_url = vllm.LLM_BASE_URL
-    asyncio.run(long_benchmark.execute(llm_base_url, model_id, concurrency, requests))
+    llm_base_urls = parse_llm_base_urls(llm_base_url) or [vllm.LLM_BASE_URL]
+    asyncio.run(long_benchmark.execute(llm_base_urls, model_id, concurrency, requests))
 
 
 @node_app.command("stats", help="Get node stats")
@@ -130,11 +148,16 @@ def node_stats(
     node_id: str = typer.Option(config.GALADRIEL_NODE_ID, help="Node ID"),
     debug: bool = typer.Option(False, help="Enable debug mode"),
 ):
+    from galadriel_node.sdk import http_client
+    from galadriel_node.sdk.upgrade import version_aware_get
+
     init_logging(debug)
     config.validate()
     status, response_json = asyncio.run(
-        version_aware_get(
-            api_url, "node/stats", api_key, query_params={"node_id": node_id}
+        http_client.closing(
+            version_aware_get(
+                api_url, "node/stats", api_key, query_params={"node_id": node_id}
+            )
         )
     )
     if status == HTTPStatus.OK and response_json:
@@ -171,10 +194,12 @@ def node_upgrade(
 
 
 if __name__ == "__main__":
+    from galadriel_node.sdk.node.run_node import execute
+
     try:
         init_logging(True)
         asyncio.run(
-            run_node.execute(
+            execute(
                 config.GALADRIEL_API_URL,
                 config.GALADRIEL_RPC_URL,
                 config.GALADRIEL_API_KEY,
@@ -1,6 +1,7 @@
 import os
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -31,6 +32,23 @@ DEFAULT_LOCAL_VALUES = {
 }
 
 
+def parse_llm_base_urls(llm_base_url: Optional[str]) -> List[str]:
+    """
+    GALADRIEL_LLM_BASE_URL can be a comma separated list of LLM backends.
+    """
+    if not llm_base_url:
+        return []
+    return [url.strip() for url in llm_base_url.split(",") if url.strip()]
+
+
+def parse_rpc_urls(rpc_url: str) -> List[str]:
+    """
+    GALADRIEL_RPC_URL can be a comma separated list of Galadriel servers, the node
+    connects to the fastest.
+    """
+    return [url.strip() for url in rpc_url.split(",") if url.strip()]
+
+
 def valid_production_url(url, expected_scheme):
     if PRODUCTION_DOMAIN in url:
         parsed_url = urlparse(url)
@@ -39,7 +57,7 @@ def valid_production_url(url, expected_scheme):
 
 
 class Config:
-    # pylint: disable=C0103
+    # pylint: disable=C0103,R0915
     def __init__(
         self, is_load_env: bool = True, environment: str = DEFAULT_ENVIRONMENT
     ):
@@ -66,7 +84,64 @@ class Config:
         self.GALADRIEL_API_PING_INTERVAL = float(
             os.getenv("GALADRIEL_API_PING_INTERVAL", "60")
         )
+        # Comma separated host[:port] targets probed besides the API domain
+        self.GALADRIEL_API_PING_TARGETS = [
+            target.strip()
+            for target in os.getenv("GALADRIEL_API_PING_TARGETS", "").split(",")
+            if target.strip()
+        ]
+        # Also measure ICMP ping times, needs raw socket privileges
+        self.GALADRIEL_API_PING_ICMP = (
+            os.getenv("GALADRIEL_API_PING_ICMP", "false").lower() == "true"
+        )
         self.RECONNECT_JOB_INTERVAL = float(os.getenv("RECONNECT_JOB_INTERVAL", "10"))
+        # Websocket write buffer high watermark in bytes, sending waits above it
+        self.GALADRIEL_WEBSOCKET_WRITE_LIMIT = int(
+            os.getenv("GALADRIEL_WEBSOCKET_WRITE_LIMIT", "65536")
+        )
+        # Coalesce streamed chunks of a request into batched frames, 0 disables it
+        self.GALADRIEL_CHUNK_COALESCING_WINDOW_MS = float(
+            os.getenv("GALADRIEL_CHUNK_COALESCING_WINDOW_MS", "0")
+        )
+        self.GALADRIEL_CHUNK_COALESCING_MAX_BYTES = int(
+            os.getenv("GALADRIEL_CHUNK_COALESCING_MAX_BYTES", "16384")
+        )
+        # "exponential" always waits at least 24 seconds, "jitter" connects again
+        # right away after a clean close and backs off with jitter after failures
+        self.GALADRIEL_RECONNECT_POLICY = os.getenv(
+            "GALADRIEL_RECONNECT_POLICY", "exponential"
+        )
+        # Keep a standby connection open to take over when the active one is lost
+        self.GALADRIEL_RECONNECT_STANDBY = (
+            os.getenv("GALADRIEL_RECONNECT_STANDBY", "false").lower() == "true"
+        )
+        # How long a replaced connection may keep streaming its requests before it is closed
+        self.GALADRIEL_RECONNECT_DRAIN_TIMEOUT = float(
+            os.getenv("GALADRIEL_RECONNECT_DRAIN_TIMEOUT", "600")
+        )
+        # With several RPC urls, how often their handshake times are measured again
+        self.GALADRIEL_RPC_PROBE_INTERVAL = float(
+            os.getenv("GALADRIEL_RPC_PROBE_INTERVAL", "300")
+        )
+        # Share by which another RPC url has to be faster to move the node there
+        self.GALADRIEL_RPC_SWITCH_MARGIN = float(
+            os.getenv("GALADRIEL_RPC_SWITCH_MARGIN", "0.2")
+        )
+        # Maximum number of inference frames queued for the websocket writer
+        self.GALADRIEL_MAX_PENDING_INFERENCE_MESSAGES = int(
+            os.getenv("GALADRIEL_MAX_PENDING_INFERENCE_MESSAGES", "256")
+        )
+        # Buffer streamed chunks until the server acks them, so streams resume after
+        # a short disconnect. Bounded per request in bytes and in seconds
+        self.GALADRIEL_STREAM_RESUMPTION = (
+            os.getenv("GALADRIEL_STREAM_RESUMPTION", "false").lower() == "true"
+        )
+        self.GALADRIEL_STREAM_RESUMPTION_MAX_BYTES = int(
+            os.getenv("GALADRIEL_STREAM_RESUMPTION_MAX_BYTES", "1048576")
+        )
+        self.GALADRIEL_STREAM_RESUMPTION_MAX_AGE = float(
+            os.getenv("GALADRIEL_STREAM_RESUMPTION_MAX_AGE", "30")
+        )
 
         # Other settings
         self.GALADRIEL_MODEL_ID = os.getenv(
@@ -82,6 +157,79 @@ class Config:
                 "GALADRIEL_LLM_BASE_URL", default_values.get("GALADRIEL_LLM_BASE_URL")
             )
         )
+        # Start one vLLM server per GPU instead of a single one
+        self.GALADRIEL_VLLM_DATA_PARALLEL = (
+            os.getenv("GALADRIEL_VLLM_DATA_PARALLEL", "false").lower() == "true"
+        )
+        # JSON object overriding fields of the resolved vLLM launch profile,
+        # e.g. {"tensor_parallel_size": 2, "max_num_seqs": 64}
+        self.GALADRIEL_VLLM_LAUNCH_PROFILE = os.getenv("GALADRIEL_VLLM_LAUNCH_PROFILE")
+        # Keep vLLM running when the node stops and reattach to it on the next start
+        self.GALADRIEL_VLLM_DETACHED = (
+            os.getenv("GALADRIEL_VLLM_DETACHED", "false").lower() == "true"
+        )
+        self.GALADRIEL_VLLM_STATE_FILE = os.getenv(
+            "GALADRIEL_VLLM_STATE_FILE", os.path.expanduser("~/.galadriel_vllm.json")
+        )
+        # Supervision of locally started vLLM servers, a server is restarted when its
+        # process dies or it fails this many health probes in a row
+        self.GALADRIEL_VLLM_SUPERVISOR_INTERVAL = float(
+            os.getenv("GALADRIEL_VLLM_SUPERVISOR_INTERVAL", "5")
+        )
+        self.GALADRIEL_VLLM_SUPERVISOR_MAX_FAILED_PROBES = int(
+            os.getenv("GALADRIEL_VLLM_SUPERVISOR_MAX_FAILED_PROBES", "3")
+        )
+        # A restarted server not ready after this many seconds is restarted again
+        self.GALADRIEL_VLLM_RESTART_TIMEOUT = float(
+            os.getenv("GALADRIEL_VLLM_RESTART_TIMEOUT", "900")
+        )
+        # Health probes of the LLM backends in the pool
+        self.GALADRIEL_LLM_HEALTH_CHECK_INTERVAL = float(
+            os.getenv("GALADRIEL_LLM_HEALTH_CHECK_INTERVAL", "10")
+        )
+        self.GALADRIEL_LLM_HEALTH_CHECK_TIMEOUT = float(
+            os.getenv("GALADRIEL_LLM_HEALTH_CHECK_TIMEOUT", "5")
+        )
+        # Stream the LLM backend's SSE events to the websocket without re-serializing them
+        self.GALADRIEL_LLM_SSE_PASSTHROUGH = (
+            os.getenv("GALADRIEL_LLM_SSE_PASSTHROUGH", "false").lower() == "true"
+        )
+        # Inference requests running against the LLM backends at once, 0 reads the
+        # limit from the launch command of locally started vLLM servers
+        self.GALADRIEL_MAX_CONCURRENT_REQUESTS = int(
+            os.getenv("GALADRIEL_MAX_CONCURRENT_REQUESTS", "0")
+        )
+        # Inference requests waiting for a free slot, any more are rejected with 429
+        self.GALADRIEL_ADMISSION_QUEUE_DEPTH = int(
+            os.getenv("GALADRIEL_ADMISSION_QUEUE_DEPTH", "16")
+        )
+        # Adapt the concurrency limit to keep time to first token and inter-token
+        # latency inside the SLO, in seconds. Never above the limit above
+        self.GALADRIEL_ADAPTIVE_CONCURRENCY = (
+            os.getenv("GALADRIEL_ADAPTIVE_CONCURRENCY", "false").lower() == "true"
+        )
+        self.GALADRIEL_TIME_TO_FIRST_TOKEN_SLO = float(
+            os.getenv("GALADRIEL_TIME_TO_FIRST_TOKEN_SLO", "2")
+        )
+        self.GALADRIEL_INTER_TOKEN_LATENCY_SLO = float(
+            os.getenv("GALADRIEL_INTER_TOKEN_LATENCY_SLO", "0.1")
+        )
+        # How often the load reported in pong responses is refreshed, in seconds
+        self.GALADRIEL_CAPACITY_REFRESH_INTERVAL = float(
+            os.getenv("GALADRIEL_CAPACITY_REFRESH_INTERVAL", "1")
+        )
+        # Health checks report the average of the last samples of the utilization
+        # sampler, a window of 1 reports the latest sample
+        self.GALADRIEL_UTILIZATION_SAMPLE_INTERVAL = float(
+            os.getenv("GALADRIEL_UTILIZATION_SAMPLE_INTERVAL", "1")
+        )
+        self.GALADRIEL_UTILIZATION_WINDOW = int(
+            os.getenv("GALADRIEL_UTILIZATION_WINDOW", "5")
+        )
+        # Maximum number of image generation jobs waiting for the diffusion worker
+        self.GALADRIEL_DIFFUSION_QUEUE_DEPTH = int(
+            os.getenv("GALADRIEL_DIFFUSION_QUEUE_DEPTH", "4")
+        )
         self.GALADRIEL_MODEL_COMMIT_HASH = "3aed33c3d2bfa212a137f6c855d79b5426862b24"
         self.MINIMUM_COMPLETIONS_TOKENS_PER_SECOND = 264
         self.MINIMUM_COMPLETIONS_TOKENS_PER_SECOND_PER_MODEL = {
@@ -134,8 +282,9 @@ class Config:
 
         if not valid_production_url(config.GALADRIEL_API_URL, "https"):
             raise SdkError(f"Expected {config.GALADRIEL_API_URL} to use HTTPS scheme")
-        if not valid_production_url(config.GALADRIEL_RPC_URL, "wss"):
-            raise SdkError(f"Expected {config.GALADRIEL_RPC_URL} to use WSS scheme")
+        for rpc_url in parse_rpc_urls(config.GALADRIEL_RPC_URL):
+            if not valid_production_url(rpc_url, "wss"):
+                raise SdkError(f"Expected {rpc_url} to use WSS scheme")
 
     def parse_val(self, val) -> Optional[str]:
         if val == "None":
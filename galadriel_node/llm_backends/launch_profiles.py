@@ -0,0 +1,210 @@
+import dataclasses
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.system.entities import GPUInfo
+
+CONTEXT_SIZE = 8192
+DEFAULT_GPU_MEMORY_UTILIZATION = 0.95
+MULTI_GPU_MEMORY_UTILIZATION = 0.92  # leaves room for NCCL buffers
+MAX_TENSOR_PARALLEL_SIZE = 8  # tensor parallelism does not scale past one NVLink domain
+WEIGHTS_OVERHEAD = (
+    1.2  # activations, CUDA graphs and the minimum KV cache on top of weights
+)
+SMALL_VRAM_MB = 20000  # 12GB vram is not supported, not sure about what is in between
+MIN_KV_CACHE_SHARE = (
+    0.3  # below this share of free memory the KV cache is stored in fp8
+)
+DEFAULT_MAX_NUM_SEQS = 256  # vLLM's default
+CONSTRAINED_MAX_NUM_SEQS = 128
+CONSTRAINED_MAX_NUM_BATCHED_TOKENS = 8192
+
+# Bytes per parameter, matched against the lowercase model id in this order
+QUANTIZATIONS = [
+    (("w4a16", "awq", "int4", "gptq", "4bit"), 0.5),
+    (("fp8", "w8a8", "w8a16", "int8", "8bit"), 1.0),
+]
+FP16_BYTES_PER_PARAMETER = 2.0
+MODEL_SIZE_PATTERN = re.compile(r"(?<![\d.])(\d+(?:\.\d+)?)b(?![a-z])")
+
+
+@dataclass
+class ModelSpec:
+    parameters_billions: float
+    bytes_per_parameter: float
+
+    @property
+    def weights_mb(self) -> float:
+        return self.parameters_billions * 1e9 * self.bytes_per_parameter / 2**20
+
+
+@dataclass
+class LaunchProfile:
+    tensor_parallel_size: int = 1
+    pipeline_parallel_size: int = 1
+    # Number of independent vLLM servers, only used in data-parallel mode
+    data_parallel_size: int = 1
+    max_num_seqs: int = DEFAULT_MAX_NUM_SEQS
+    max_num_batched_tokens: Optional[int] = None
+    kv_cache_dtype: Optional[str] = None
+    gpu_memory_utilization: float = DEFAULT_GPU_MEMORY_UTILIZATION
+    max_model_len: int = CONTEXT_SIZE
+
+    @property
+    def gpus_per_server(self) -> int:
+        return self.tensor_parallel_size * self.pipeline_parallel_size
+
+    def to_args(self) -> List[str]:
+        args = [
+            "--max-model-len",
+            str(self.max_model_len),
+            "--gpu-memory-utilization",
+            str(self.gpu_memory_utilization),
+            "--max_num_seqs",
+            str(self.max_num_seqs),
+        ]
+        if self.tensor_parallel_size > 1:
+            args.extend(["--tensor-parallel-size", str(self.tensor_parallel_size)])
+        if self.pipeline_parallel_size > 1:
+            args.extend(["--pipeline-parallel-size", str(self.pipeline_parallel_size)])
+        if self.kv_cache_dtype:
+            args.extend(["--kv_cache_dtype", self.kv_cache_dtype])
+        if self.max_num_batched_tokens:
+            args.extend(["--max_num_batched_tokens", str(self.max_num_batched_tokens)])
+        return args
+
+
+def parse_model_spec(model_id: str) -> Optional[ModelSpec]:
+    """
+    Reads the parameter count and quantization from a model id,
+    e.g. "neuralmagic/Meta-Llama-3.1-70B-Instruct-quantized.w4a16".
+    """
+    name = model_id.lower().split("/")[-1]
+    match = MODEL_SIZE_PATTERN.search(name)
+    if not match:
+        return None
+    bytes_per_parameter = FP16_BYTES_PER_PARAMETER
+    for markers, size in QUANTIZATIONS:
+        if any(marker in name for marker in markers):
+            bytes_per_parameter = size
+            break
+    return ModelSpec(
+        parameters_billions=float(match.group(1)),
+        bytes_per_parameter=bytes_per_parameter,
+    )
+
+
+def parse_overrides(raw_overrides: Optional[str]) -> Dict[str, Any]:
+    """
+    Parses the operator's GALADRIEL_VLLM_LAUNCH_PROFILE JSON object.
+    """
+    if not raw_overrides:
+        return {}
+    try:
+        overrides = json.loads(raw_overrides)
+    except json.JSONDecodeError:
+        raise SdkError("GALADRIEL_VLLM_LAUNCH_PROFILE must be a JSON object")
+    if not isinstance(overrides, dict):
+        raise SdkError("GALADRIEL_VLLM_LAUNCH_PROFILE must be a JSON object")
+    known_fields = {field.name for field in dataclasses.fields(LaunchProfile)}
+    unknown_fields = set(overrides) - known_fields
+    if unknown_fields:
+        raise SdkError(
+            f"Unknown GALADRIEL_VLLM_LAUNCH_PROFILE fields: {sorted(unknown_fields)}"
+        )
+    return overrides
+
+
+def resolve_launch_profile(
+    model_id: str,
+    gpu_info: GPUInfo,
+    data_parallel: bool = False,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> LaunchProfile:
+    """
+    Picks vLLM launch parameters for the model on the given GPUs.
+
+    A server gets the fewest GPUs the model fits on, in data-parallel mode the
+    remaining GPUs run more servers. Pipeline parallelism is only added when the model
+    does not fit into MAX_TENSOR_PARALLEL_SIZE GPUs. Parallelism set in `overrides` is
+    used as is, the operator may know better than the size estimate.
+    """
+    overrides = overrides or {}
+    spec = parse_model_spec(model_id)
+    required_mb = spec.weights_mb * WEIGHTS_OVERHEAD if spec else 0.0
+    if "tensor_parallel_size" in overrides or "pipeline_parallel_size" in overrides:
+        tensor_parallel_size = overrides.get("tensor_parallel_size", 1)
+        pipeline_parallel_size = overrides.get("pipeline_parallel_size", 1)
+    else:
+        tensor_parallel_size, pipeline_parallel_size = _resolve_parallelism(
+            model_id, required_mb, gpu_info
+        )
+    gpus_per_server = tensor_parallel_size * pipeline_parallel_size
+    gpu_memory_utilization = DEFAULT_GPU_MEMORY_UTILIZATION
+    if gpus_per_server > 1:
+        gpu_memory_utilization = MULTI_GPU_MEMORY_UTILIZATION
+
+    usable_mb = gpu_info.vram * gpu_memory_utilization
+    weights_per_gpu_mb = spec.weights_mb / gpus_per_server if spec else 0.0
+    free_share = (usable_mb - weights_per_gpu_mb) / usable_mb if usable_mb else 0.0
+    profile = LaunchProfile(
+        tensor_parallel_size=tensor_parallel_size,
+        pipeline_parallel_size=pipeline_parallel_size,
+        gpu_memory_utilization=gpu_memory_utilization,
+    )
+    if gpu_info.vram <= SMALL_VRAM_MB or free_share < MIN_KV_CACHE_SHARE:
+        profile.kv_cache_dtype = "fp8"
+        profile.max_num_seqs = CONSTRAINED_MAX_NUM_SEQS
+        profile.max_num_batched_tokens = CONSTRAINED_MAX_NUM_BATCHED_TOKENS
+
+    profile = dataclasses.replace(profile, **overrides)
+    if data_parallel:
+        profile.data_parallel_size = max(
+            1, gpu_info.gpu_count // profile.gpus_per_server
+        )
+    else:
+        profile.data_parallel_size = 1
+    return profile
+
+
+def _resolve_parallelism(
+    model_id: str, required_mb: float, gpu_info: GPUInfo
+) -> Tuple[int, int]:
+    if required_mb <= gpu_info.vram * DEFAULT_GPU_MEMORY_UTILIZATION:
+        return 1, 1
+    usable_mb = gpu_info.vram * MULTI_GPU_MEMORY_UTILIZATION
+    max_tensor_parallel_size = min(
+        _largest_power_of_two(max(gpu_info.gpu_count, 1)), MAX_TENSOR_PARALLEL_SIZE
+    )
+    tensor_parallel_size = 2
+    while (
+        tensor_parallel_size < max_tensor_parallel_size
+        and required_mb > tensor_parallel_size * usable_mb
+    ):
+        tensor_parallel_size *= 2
+    tensor_parallel_size = min(tensor_parallel_size, max_tensor_parallel_size)
+    if required_mb <= tensor_parallel_size * usable_mb:
+        return tensor_parallel_size, 1
+
+    pipeline_parallel_size = math.ceil(required_mb / (tensor_parallel_size * usable_mb))
+    if tensor_parallel_size * pipeline_parallel_size > gpu_info.gpu_count:
+        raise SdkError(
+            f"Model {model_id} needs about {int(required_mb)}MB of VRAM, "
+            f"it does not fit into {gpu_info.gpu_count} x {gpu_info.vram}MB GPUs"
+        )
+    return tensor_parallel_size, pipeline_parallel_size
+
+
+def _largest_power_of_two(n: int) -> int:
+    power = 1
+    while power * 2 <= n:
+        power *= 2
+    return power
@@ -1,18 +1,45 @@
 import importlib.metadata
+import os
 import subprocess
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import List
 from typing import Optional
 
 import psutil
 
+from galadriel_node.config import config
+from galadriel_node.llm_backends.launch_profiles import LaunchProfile
+from galadriel_node.llm_backends.launch_profiles import parse_overrides
+from galadriel_node.llm_backends.launch_profiles import resolve_launch_profile
 from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.system.entities import GPUInfo
 from galadriel_node.sdk.system.report_hardware import get_gpu_info
 
-CONTEXT_SIZE = 8192
-LLM_BASE_URL = "http://127.0.0.1:19434"
+VLLM_HOST = "127.0.0.1"
+VLLM_PORT = 19434
+LLM_BASE_URL = f"http://{VLLM_HOST}:{VLLM_PORT}"
+LOG_FILE = "vllm.log"
 
 logger = get_node_logger()
 
 
+@dataclass
+class VllmProcess:
+    pid: int
+    port: int
+    log_file: str
+    gpu_ids: List[int] = field(default_factory=list)
+    # How the process was launched, so it can be launched the same way again
+    command: List[str] = field(default_factory=list)
+    env: Optional[Dict[str, str]] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{VLLM_HOST}:{self.port}"
+
+
 def is_installed() -> bool:
     try:
         importlib.metadata.version("vllm")
@@ -21,6 +48,13 @@ def is_installed() -> bool:
         return False
 
 
+def installed_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("vllm")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
 def is_process_running(pid: int) -> bool:
     """Check if a process with a given PID is still running."""
     try:
@@ -30,6 +64,25 @@ def is_process_running(pid: int) -> bool:
         return False
 
 
+def get_max_num_seqs(process: VllmProcess) -> Optional[int]:
+    """
+    Returns how many sequences the server schedules at once, read from the command it
+    was launched with. vLLM does not expose the limit on its metrics endpoint.
+    """
+    command = process.command
+    if not command:
+        try:
+            command = psutil.Process(process.pid).cmdline()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+    if "--max_num_seqs" not in command:
+        return None
+    try:
+        return int(command[command.index("--max_num_seqs") + 1])
+    except (IndexError, ValueError):
+        return None
+
+
 def stop(pid: int) -> bool:
     try:
         process = psutil.Process(pid)
@@ -41,44 +94,138 @@ def stop(pid: int) -> bool:
         return False
 
 
-# pylint: disable=R1732
-def start(model_name: str) -> Optional[int]:
-    gpu_info = get_gpu_info()
-    try:
-        command = [
-            "vllm",
-            "serve",
-            model_name,
-            "--max-model-len",
-            "8192",
-            "--gpu-memory-utilization",
-            "0.95",
-            "--host",
-            "127.0.0.1",
-            "--port",
-            "19434",
-            "--disable-frontend-multiprocessing",
-        ]
-        # 12GB vram is not supported, not sure about what is in between
-        if gpu_info.vram <= 20000:
-            command.extend(
-                [
-                    "--kv_cache_dtype",
-                    "fp8",
-                    "--max_num_seqs",
-                    "128",
-                    "--max_num_batched_tokens",
-                    "8192",
-                ]
-            )
-        with open("vllm.log", "a", encoding="utf-8") as log_file:
-            process = subprocess.Popen(
-                command, stdout=log_file, stderr=log_file, start_new_session=True
+def get_launch_profile(
+    model_name: str, gpu_info: GPUInfo, data_parallel: bool = False
+) -> LaunchProfile:
+    return resolve_launch_profile(
+        model_name,
+        gpu_info,
+        data_parallel=data_parallel,
+        overrides=parse_overrides(config.GALADRIEL_VLLM_LAUNCH_PROFILE),
+    )
+
+
+def build_command(model_name: str, port: int, profile: LaunchProfile) -> List[str]:
+    return [
+        "vllm",
+        "serve",
+        model_name,
+        "--host",
+        VLLM_HOST,
+        "--port",
+        str(port),
+        "--disable-frontend-multiprocessing",
+        *profile.to_args(),
+    ]
+
+
+def plan(
+    model_name: str, data_parallel: bool = False, gpu_info: Optional[GPUInfo] = None
+) -> List[VllmProcess]:
+    """
+    Resolves the launch profile and returns the vLLM servers to start, without
+    starting them. The returned processes have no PID yet.
+    """
+    if gpu_info is None:
+        gpu_info = get_gpu_info()
+    profile = get_launch_profile(model_name, gpu_info, data_parallel=data_parallel)
+    logger.info(f"vLLM launch profile: {profile}")
+    if not data_parallel:
+        command = build_command(model_name, VLLM_PORT, profile)
+        return [VllmProcess(pid=0, port=VLLM_PORT, log_file=LOG_FILE, command=command)]
+    processes = []
+    for replica in range(profile.data_parallel_size):
+        port = VLLM_PORT + replica
+        gpu_ids = list(
+            range(
+                replica * profile.gpus_per_server,
+                (replica + 1) * profile.gpus_per_server,
             )
-            logger.debug(
-                f'Started vllm process with PID: {process.pid}, logging to "vllm.log"'
+        )
+        env = {
+            **os.environ,
+            "CUDA_VISIBLE_DEVICES": ",".join(str(gpu_id) for gpu_id in gpu_ids),
+        }
+        processes.append(
+            VllmProcess(
+                pid=0,
+                port=port,
+                log_file=f"vllm-{replica}.log",
+                gpu_ids=gpu_ids,
+                command=build_command(model_name, port, profile),
+                env=env,
             )
-            return process.pid
+        )
+    return processes
+
+
+def start(model_name: str) -> Optional[int]:
+    try:
+        [process] = plan(model_name)
+        return _spawn(process.command, process.log_file)
     except Exception as _:
         logger.error("Error starting vllm process.", exc_info=True)
         return None
+
+
+def start_data_parallel(
+    model_name: str, gpu_info: Optional[GPUInfo] = None
+) -> List[VllmProcess]:
+    """
+    Starts as many vLLM servers as the launch profile allows, each pinned to its own
+    GPUs with CUDA_VISIBLE_DEVICES and listening on its own port. Processes that were
+    started are stopped again if any of them fails to start.
+    """
+    try:
+        processes = plan(model_name, data_parallel=True, gpu_info=gpu_info)
+    except Exception as _:
+        logger.error("Error starting vllm processes.", exc_info=True)
+        return []
+    return spawn_all(processes)
+
+
+def spawn_all(processes: List[VllmProcess]) -> List[VllmProcess]:
+    """
+    Spawns planned processes, stopping the already started ones if any of them fails.
+    """
+    started: List[VllmProcess] = []
+    try:
+        for process in processes:
+            process.pid = _spawn(process.command, process.log_file, process.env)
+            started.append(process)
+    except Exception as _:
+        logger.error("Error starting vllm processes.", exc_info=True)
+        for process in started:
+            stop(process.pid)
+        return []
+    return started
+
+
+def respawn(process: VllmProcess, model_name: str) -> Optional[int]:
+    """
+    Launches a stopped vLLM process again and returns the new PID.
+    Processes without a recorded command were started by `start`.
+    """
+    if not process.command:
+        return start(model_name)
+    try:
+        return _spawn(process.command, process.log_file, process.env)
+    except Exception as _:
+        logger.error("Error restarting vllm process.", exc_info=True)
+        return None
+
+
+# pylint: disable=R1732
+def _spawn(command: List[str], log_file_name: str, env: Optional[Dict] = None) -> int:
+    with open(log_file_name, "a", encoding="utf-8") as log_file:
+        process = subprocess.Popen(
+            command,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+            env=env,
+        )
+        logger.debug(
+            f'Started vllm process with PID: {process.pid}, logging to "{log_file_name}"'
+        )
+        return process.pid
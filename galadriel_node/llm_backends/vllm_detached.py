@@ -0,0 +1,186 @@
+"""
+Detached vLLM servers outlive the node process, so restarting or upgrading the node
+reattaches to them instead of loading the model again.
+
+The launched servers are recorded in a state file next to a lock file, which keeps
+two nodes from starting vLLM at the same time. A recorded server is only reused when
+it is still running with the same model, launch command and vLLM version.
+"""
+
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import psutil
+
+from galadriel_node.llm_backends import vllm
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+logger = get_node_logger()
+
+
+@dataclass
+class DetachedState:
+    model_name: str
+    vllm_version: Optional[str]
+    processes: List[vllm.VllmProcess]
+
+
+def start(
+    model_name: str, data_parallel: bool, state_file: str
+) -> Tuple[List[vllm.VllmProcess], bool]:
+    """
+    Returns the vLLM servers for the model and whether they were already running.
+    """
+    planned = vllm.plan(model_name, data_parallel=data_parallel)
+    with _locked(state_file):
+        state = load_state(state_file)
+        if state is not None:
+            running = _find_running(state)
+            if _is_compatible(state, running, model_name, planned):
+                for process, running_process in zip(planned, running):
+                    process.pid = running_process.pid
+                return planned, True
+            for process in running:
+                logger.info(
+                    f"Stopping incompatible vLLM process with PID {process.pid}."
+                )
+                vllm.stop(process.pid)
+        processes = vllm.spawn_all(planned)
+        if processes:
+            save_state(
+                state_file,
+                DetachedState(
+                    model_name=model_name,
+                    vllm_version=vllm.installed_version(),
+                    processes=processes,
+                ),
+            )
+        return processes, False
+
+
+def load_state(state_file: str) -> Optional[DetachedState]:
+    try:
+        with open(state_file, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        return DetachedState(
+            model_name=data["model_name"],
+            vllm_version=data["vllm_version"],
+            processes=[
+                vllm.VllmProcess(
+                    pid=process["pid"],
+                    port=process["port"],
+                    log_file=process["log_file"],
+                    gpu_ids=process["gpu_ids"],
+                    command=process["command"],
+                )
+                for process in data["processes"]
+            ],
+        )
+    except FileNotFoundError:
+        return None
+    except (ValueError, KeyError, TypeError):
+        logger.error(f"Ignoring invalid vLLM state file {state_file}", exc_info=True)
+        return None
+
+
+def save_state(state_file: str, state: DetachedState) -> None:
+    # The environment is not stored, it holds the operator's secrets
+    data = {
+        "model_name": state.model_name,
+        "vllm_version": state.vllm_version,
+        "processes": [
+            {
+                "pid": process.pid,
+                "port": process.port,
+                "log_file": process.log_file,
+                "gpu_ids": process.gpu_ids,
+                "command": process.command,
+            }
+            for process in state.processes
+        ],
+    }
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(tmp_file, state_file)
+
+
+@contextmanager
+def _locked(state_file: str) -> Iterator[None]:
+    with open(f"{state_file}.lock", "w", encoding="utf-8") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _find_running(state: DetachedState) -> List[vllm.VllmProcess]:
+    running = []
+    for process in state.processes:
+        pid = _find_pid(process)
+        if pid is not None:
+            running.append(
+                vllm.VllmProcess(
+                    pid=pid,
+                    port=process.port,
+                    log_file=process.log_file,
+                    gpu_ids=process.gpu_ids,
+                    command=process.command,
+                )
+            )
+    return running
+
+
+def _find_pid(process: vllm.VllmProcess) -> Optional[int]:
+    """
+    Finds the live process running the recorded command. The recorded PID is tried
+    first, the supervisor may have restarted the server under a new one since.
+    """
+    if _runs_command(process.pid, process.command):
+        return process.pid
+    for candidate in psutil.process_iter():
+        if _runs_command(candidate.pid, process.command):
+            return candidate.pid
+    return None
+
+
+def _runs_command(pid: int, command: List[str]) -> bool:
+    if not vllm.is_process_running(pid):
+        return False
+    try:
+        cmdline = psutil.Process(pid).cmdline()
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return False
+    # The vllm entrypoint is usually run through the python interpreter
+    arguments = command[1:]
+    return len(cmdline) >= len(command) and cmdline[-len(arguments) :] == arguments
+
+
+def _is_compatible(
+    state: DetachedState,
+    running: List[vllm.VllmProcess],
+    model_name: str,
+    planned: List[vllm.VllmProcess],
+) -> bool:
+    if state.model_name != model_name:
+        logger.info(f"Running vLLM serves {state.model_name}, not {model_name}.")
+        return False
+    if state.vllm_version != vllm.installed_version():
+        logger.info(f"Running vLLM is version {state.vllm_version}, upgrading it.")
+        return False
+    if len(running) != len(state.processes):
+        return False
+    recorded = [(p.command, p.gpu_ids) for p in running]
+    expected = [(p.command, p.gpu_ids) for p in planned]
+    if recorded != expected:
+        logger.info("vLLM launch profile changed, restarting vLLM.")
+        return False
+    return True
@@ -0,0 +1,140 @@
+import math
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.protocol.entities import InferenceResponse
+from galadriel_node.sdk.time_tracker import is_response_with_tokens
+
+MIN_LIMIT = 1
+# The limit is multiplied by this when a request misses the latency SLO
+BACKOFF_FACTOR = 0.75
+
+logger = get_node_logger()
+
+
+@dataclass
+class StreamLatency:
+    """
+    Time to first token and mean inter-token latency of a single stream, measured
+    like TimeTracker does for the benchmarks but from the chunks sent to the server.
+    """
+
+    started_at: float = field(default_factory=time.monotonic)
+    first_token_at: Optional[float] = None
+    last_token_at: Optional[float] = None
+    tokens: int = 0
+
+    def chunk_received(self, response: InferenceResponse) -> None:
+        if not is_response_with_tokens(response):
+            return
+        now = time.monotonic()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        self.last_token_at = now
+        self.tokens += 1
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def inter_token_latency(self) -> Optional[float]:
+        if self.tokens < 2 or self.first_token_at is None or not self.last_token_at:
+            return None
+        return (self.last_token_at - self.first_token_at) / (self.tokens - 1)
+
+
+@dataclass
+class AdaptiveLimitStats:
+    limit: int
+    samples: int = 0
+    violations: int = 0
+    increases: int = 0
+    decreases: int = 0
+    last_time_to_first_token: Optional[float] = None
+    last_inter_token_latency: Optional[float] = None
+
+
+class AdaptiveLimit:
+    """
+    Adapts the number of concurrent streams sent to the LLM backend with additive
+    increase and multiplicative decrease, so time to first token and inter-token
+    latency stay inside the SLO whatever the mix of prompt lengths.
+
+    The limit grows by one after a limit's worth of streams met the SLO while the
+    limit was fully used, and shrinks by BACKOFF_FACTOR when a stream misses it.
+    Streams started before the last decrease ran under the old limit, so their misses
+    do not shrink the limit again.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        time_to_first_token_slo: float,
+        inter_token_latency_slo: float,
+        min_limit: int = MIN_LIMIT,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.time_to_first_token_slo = time_to_first_token_slo
+        self.inter_token_latency_slo = inter_token_latency_slo
+        self.stats = AdaptiveLimitStats(limit=max_limit)
+        self._met_slo = 0
+        self._decreased_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self.stats.limit
+
+    def update(self, latency: StreamLatency, saturated: bool) -> int:
+        """
+        Records a finished stream and returns the new limit. `saturated` tells if
+        every slot of the current limit was in use.
+        """
+        time_to_first_token = latency.time_to_first_token
+        if time_to_first_token is None:
+            # Failed requests say nothing about the backend's latency
+            return self.limit
+        inter_token_latency = latency.inter_token_latency
+        self.stats.samples += 1
+        self.stats.last_time_to_first_token = time_to_first_token
+        self.stats.last_inter_token_latency = inter_token_latency
+        if time_to_first_token > self.time_to_first_token_slo or (
+            inter_token_latency is not None
+            and inter_token_latency > self.inter_token_latency_slo
+        ):
+            self.stats.violations += 1
+            if latency.started_at >= self._decreased_at:
+                self._decrease()
+        elif saturated:
+            self._met_slo += 1
+            if self._met_slo >= self.limit:
+                self._increase()
+        return self.limit
+
+    def _decrease(self) -> None:
+        self._met_slo = 0
+        self._decreased_at = time.monotonic()
+        limit = max(self.min_limit, math.floor(self.limit * BACKOFF_FACTOR))
+        if limit == self.limit:
+            return
+        self.stats.decreases += 1
+        logger.info(
+            f"Latency SLO missed (TTFT: {self.stats.last_time_to_first_token:.3f}s, "
+            f"ITL: {self.stats.last_inter_token_latency or 0:.3f}s), "
+            f"concurrency limit {self.limit} -> {limit}"
+        )
+        self.stats.limit = limit
+
+    def _increase(self) -> None:
+        self._met_slo = 0
+        if self.limit >= self.max_limit:
+            return
+        self.stats.increases += 1
+        self.stats.limit += 1
+        logger.debug(f"Latency SLO met, concurrency limit raised to {self.limit}")
@@ -0,0 +1,122 @@
+import asyncio
+from collections import deque
+from typing import Deque
+from typing import Optional
+
+from galadriel_node.sdk.adaptive_concurrency import AdaptiveLimit
+from galadriel_node.sdk.adaptive_concurrency import StreamLatency
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+logger = get_node_logger()
+
+
+class AdmissionTicket:
+    """
+    A request's place in the admission controller, either a running slot or a place
+    in the wait queue. Released exactly once, when the request's task is done.
+    """
+
+    def __init__(self, controller: "AdmissionController", granted: bool):
+        self._controller = controller
+        self._granted: asyncio.Future = asyncio.get_running_loop().create_future()
+        if granted:
+            self._granted.set_result(None)
+        self._released = False
+
+    @property
+    def holds_slot(self) -> bool:
+        return self._granted.done() and not self._granted.cancelled()
+
+    async def wait(self) -> StreamLatency:
+        """
+        Waits until the request may run against the backend. The returned latency
+        is measured from then, time spent in the queue is not the backend's.
+        """
+        await self._granted
+        return StreamLatency()
+
+    def record(self, latency: StreamLatency) -> None:
+        self._controller.record(latency)
+
+    def grant(self) -> bool:
+        if self._granted.done():
+            return False
+        self._granted.set_result(None)
+        return True
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._controller.release(self)
+
+
+class AdmissionController:
+    """
+    Keeps the inference requests running against the LLM backend at its concurrency
+    limit. vLLM queues everything over max_num_seqs internally and time to first token
+    grows without bound, so requests over the limit wait in a small queue here and
+    anything beyond that is rejected right away, letting the server route it to
+    another node. With an adaptive limit the limit follows the observed latencies.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        queue_depth: int,
+        adaptive_limit: Optional[AdaptiveLimit] = None,
+    ):
+        self.limit = adaptive_limit.limit if adaptive_limit else limit
+        self.queue_depth = queue_depth
+        self.adaptive_limit = adaptive_limit
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: Deque[AdmissionTicket] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def admit(self) -> Optional[AdmissionTicket]:
+        """
+        Returns a ticket for the request, or None if the wait queue is full.
+        """
+        if self.running < self.limit:
+            self.running += 1
+            ticket = AdmissionTicket(self, granted=True)
+        elif len(self._waiters) < self.queue_depth:
+            ticket = AdmissionTicket(self, granted=False)
+            self._waiters.append(ticket)
+        else:
+            self.rejected += 1
+            return None
+        self.admitted += 1
+        return ticket
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        if not ticket.holds_slot:
+            # Cancelled while waiting
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+            return
+        # The slot is handed to the longest waiting request, unless the limit shrank
+        while self.running <= self.limit and self._waiters:
+            if self._waiters.popleft().grant():
+                return
+        self.running -= 1
+
+    def record(self, latency: StreamLatency) -> None:
+        """
+        Feeds the latency of a finished stream to the adaptive limit.
+        """
+        if self.adaptive_limit is None:
+            return
+        saturated = self.running >= self.limit or bool(self._waiters)
+        self.set_limit(self.adaptive_limit.update(latency, saturated))
+
+    def set_limit(self, limit: int) -> None:
+        self.limit = limit
+        while self.running < self.limit and self._waiters:
+            if self._waiters.popleft().grant():
+                self.running += 1
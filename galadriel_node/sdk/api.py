@@ -6,9 +6,9 @@ from urllib.parse import urlencode
 from urllib.parse import urljoin
 from http import HTTPStatus
 
-import aiohttp
 from aiohttp import ClientConnectorError
 
+from galadriel_node.sdk import http_client
 from galadriel_node.sdk.entities import SdkError
 
 CLIENT_NAME = "gpu-node"
@@ -16,28 +16,49 @@ CLIENT_VERSION = importlib.metadata.version("galadriel-node")
 
 
 async def get(
-    api_url: str, endpoint: str, api_key: str, query_params: Optional[Dict] = None
+    api_url: str,
+    endpoint: str,
+    api_key: str,
+    query_params: Optional[Dict] = None,
+    memoize: bool = False,
 ) -> Tuple[int, Dict]:
+    """
+    With `memoize` the response is shared with the other memoized GETs of the same
+    URL, e.g. node/info is fetched once at startup.
+    """
     if query_params:
         encoded_params = urlencode(query_params)
         url = urljoin(api_url + "/", endpoint) + f"?{encoded_params}"
     else:
         url = urljoin(api_url + "/", endpoint)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "client_name": CLIENT_NAME,
-                    "client_version": CLIENT_VERSION,
-                },
-            ) as response:
-                if response.status in [HTTPStatus.OK, HTTPStatus.UPGRADE_REQUIRED]:
-                    return response.status, await response.json()
-
-                return response.status, {}
+        if memoize:
+            return await http_client.memoized(
+                (url, api_key), lambda: _get(url, api_key)
+            )
+        return await _get(url, api_key)
     except ClientConnectorError:
         raise SdkError(f"Cannot connect to {api_url}, make sure it is correct")
     except Exception:
         raise SdkError(f"Failed to GET API endpoint: {endpoint}")
+
+
+async def _get(url: str, api_key: str) -> Tuple[int, Dict]:
+    return await http_client.with_retry(
+        lambda: _fetch(url, api_key), retry_on=http_client.GET_ERRORS
+    )
+
+
+async def _fetch(url: str, api_key: str) -> Tuple[int, Dict]:
+    async with http_client.get_session().get(
+        url,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "client_name": CLIENT_NAME,
+            "client_version": CLIENT_VERSION,
+        },
+    ) as response:
+        if response.status in [HTTPStatus.OK, HTTPStatus.UPGRADE_REQUIRED]:
+            return response.status, await response.json()
+
+        return response.status, {}
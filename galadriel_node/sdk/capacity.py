@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urljoin
+
+import aiohttp
+
+from galadriel_node.config import config
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.admission import AdmissionController
+from galadriel_node.sdk.llm_router import LlmRouter
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.protocol.entities import NodeCapacity
+
+# Share of the KV cache blocks in use, between 0 and 1
+KV_CACHE_USAGE_METRIC = "vllm:gpu_cache_usage_perc"
+THROUGHPUT_WINDOW = 10  # Tokens per second are averaged over this many seconds
+METRICS_TIMEOUT = 1.0  # Seconds, a slow backend must not hold the snapshot back
+
+logger = get_node_logger()
+
+
+def parse_kv_cache_usage(metrics: str) -> Optional[float]:
+    """
+    Returns the highest KV cache usage in vLLM's Prometheus metrics, there is one
+    sample per served model.
+    """
+    usage: Optional[float] = None
+    for line in metrics.splitlines():
+        if not line.startswith(KV_CACHE_USAGE_METRIC):
+            continue
+        name, _, value = line.rpartition(" ")
+        if name.split("{")[0] != KV_CACHE_USAGE_METRIC:
+            continue
+        try:
+            sample = float(value)
+        except ValueError:
+            continue
+        usage = sample if usage is None else max(usage, sample)
+    return usage
+
+
+class CapacityMonitor:
+    """
+    Refreshes a snapshot of the node's load in the background, so the pong
+    response reports it without waiting on the backends.
+    """
+
+    def __init__(
+        self,
+        llm: LlmRouter,
+        admission: Optional[AdmissionController] = None,
+        interval: float = config.GALADRIEL_CAPACITY_REFRESH_INTERVAL,
+    ):
+        self.llm = llm
+        self.admission = admission
+        self.interval = interval
+        self.snapshot = NodeCapacity(in_flight=0, queued=0, tokens_per_second=0)
+        self._token_samples: Deque[Tuple[float, int]] = deque()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.error("Failed to refresh the node capacity", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> None:
+        kv_cache_usage = await self._scrape_kv_cache_usage()
+        self.snapshot = NodeCapacity(
+            in_flight=self.llm.in_flight(),
+            queued=self.admission.queued if self.admission else 0,
+            tokens_per_second=self._tokens_per_second(),
+            kv_cache_usage=kv_cache_usage,
+            admission_limit=self.admission.limit if self.admission else None,
+        )
+
+    def _tokens_per_second(self) -> float:
+        now = time.monotonic()
+        self._token_samples.append((now, self.llm.streamed_tokens))
+        while now - self._token_samples[0][0] > THROUGHPUT_WINDOW:
+            self._token_samples.popleft()
+        started_at, started_tokens = self._token_samples[0]
+        if now <= started_at:
+            return 0.0
+        return (self.llm.streamed_tokens - started_tokens) / (now - started_at)
+
+    async def _scrape_kv_cache_usage(self) -> Optional[float]:
+        session = http_client.get_session()
+        results = await asyncio.gather(
+            *[
+                _scrape(session, backend.base_url)
+                for backend in self.llm.healthy_backends()
+            ]
+        )
+        usages = [usage for usage in results if usage is not None]
+        return max(usages) if usages else None
+
+
+async def _scrape(session: aiohttp.ClientSession, base_url: str) -> Optional[float]:
+    try:
+        async with session.get(
+            urljoin(base_url, "/metrics"),
+            timeout=aiohttp.ClientTimeout(total=METRICS_TIMEOUT),
+        ) as response:
+            if response.status != 200:
+                return None
+            return parse_kv_cache_usage(await response.text())
+    except Exception as e:
+        logger.debug(f"Failed to read metrics of {base_url}: {e}")
+        return None
@@ -0,0 +1,109 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List
+from typing import Optional
+
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
+
+# Sent by the node and echoed back by the server if it accepts batched frames
+COALESCING_HEADER = "Chunk-Coalescing"
+
+
+@dataclass
+class CoalescingStats:
+    chunks: int = 0
+    frames: int = 0
+
+    def reset(self) -> None:
+        self.chunks = 0
+        self.frames = 0
+
+
+class ChunkCoalescer:
+    """
+    Buffers the encoded chunks of a single inference request and writes them as one
+    `{"batch": [...]}` frame once `window_seconds` has passed since the first buffered
+    chunk or once `max_bytes` is reached, whichever comes first.
+
+    The chunks are already JSON encoded, so the batch is spliced together as a string
+    instead of being decoded and encoded again.
+    """
+
+    def __init__(
+        self,
+        writer: WebsocketWriter,
+        window_seconds: float,
+        max_bytes: int,
+        stats: Optional[CoalescingStats] = None,
+    ):
+        self._writer = writer
+        self._window_seconds = window_seconds
+        self._max_bytes = max_bytes
+        self._stats = stats or CoalescingStats()
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._error: Optional[Exception] = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, message: str) -> None:
+        self._raise_if_flush_failed()
+        self._stats.chunks += 1
+        self._buffer.append(message)
+        self._buffered_bytes += len(message)
+        if self._buffered_bytes >= self._max_bytes:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def flush(self, wait: bool = False) -> None:
+        """
+        Writes the buffered chunks as one frame, with `wait` it returns once the
+        frame was written, see WebsocketWriter.send.
+        """
+        self._cancel_flush_task()
+        async with self._lock:
+            if not self._buffer:
+                return
+            buffer = self._buffer
+            self._buffer = []
+            self._buffered_bytes = 0
+            self._stats.frames += 1
+            await self._writer.send(_encode_batch(buffer), wait=wait)
+
+    async def close(self) -> None:
+        self._raise_if_flush_failed()
+        await self.flush()
+
+    def discard(self) -> None:
+        """
+        Drops the buffered chunks of a cancelled request.
+        """
+        self._cancel_flush_task()
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def _raise_if_flush_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _cancel_flush_task(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._window_seconds)
+        # Past this point the task must not be cancelled, it owns the buffer being sent
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            # Surfaced to the request on its next add() or close()
+            self._error = e
+
+
+def _encode_batch(messages: List[str]) -> str:
+    if len(messages) == 1:
+        return messages[0]
+    return '{"batch":[' + ",".join(messages) + "]}"
@@ -0,0 +1,64 @@
+"""
+JSON codec for the websocket hot path.
+
+Uses orjson or msgspec when one of them is installed and falls back to the standard
+library otherwise. Frames are sent as websocket text frames, so `dumps` always
+returns a str.
+"""
+
+import json
+from typing import Any
+from typing import Union
+
+# pylint: disable=invalid-name
+CODEC_NAME: str
+
+
+class DecodeError(ValueError):
+    pass
+
+
+try:
+    # pylint: disable=no-member
+    import orjson
+
+    CODEC_NAME = "orjson"
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(data: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as e:
+            raise DecodeError(str(e)) from e
+
+except ImportError:
+    try:
+        import msgspec
+
+        _encoder = msgspec.json.Encoder()
+        _decoder = msgspec.json.Decoder()
+
+        CODEC_NAME = "msgspec"
+
+        def dumps(obj: Any) -> str:
+            return _encoder.encode(obj).decode("utf-8")
+
+        def loads(data: Union[str, bytes]) -> Any:
+            try:
+                return _decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise DecodeError(str(e)) from e
+
+    except ImportError:
+        CODEC_NAME = "json"
+
+        def dumps(obj: Any) -> str:
+            return json.dumps(obj)
+
+        def loads(data: Union[str, bytes]) -> Any:
+            try:
+                return json.loads(data)
+            except json.JSONDecodeError as e:
+                raise DecodeError(str(e)) from e
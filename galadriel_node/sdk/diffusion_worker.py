@@ -0,0 +1,104 @@
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any
+from typing import List
+from typing import Optional
+
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+logger = get_node_logger()
+
+
+class DiffusionQueueFullError(SdkError):
+    pass
+
+
+@dataclass
+class _DiffusionJob:
+    prompt: str
+    image: Optional[str]
+    n: int
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+
+
+class DiffusionWorker:
+    """
+    Runs image generation on a dedicated thread, so the asyncio loop keeps
+    serving ping-pong and health-check messages while a job is running.
+
+    The worker thread is the only one calling the pipeline after initialization.
+    Jobs wait in a bounded queue, anything beyond `queue_depth` is rejected
+    immediately with DiffusionQueueFullError.
+    """
+
+    def __init__(self, pipeline: Any, queue_depth: int):
+        self._pipeline = pipeline
+        # A maxsize of 0 would make the queue unbounded, at least one job waits
+        self._queue: queue.Queue[Optional[_DiffusionJob]] = queue.Queue(
+            maxsize=max(queue_depth, 1)
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="diffusion-worker", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, prompt: str, image: Optional[str], n: int) -> asyncio.Future:
+        """
+        Queues a job and returns a future that resolves on the calling loop.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            self._queue.put_nowait(
+                _DiffusionJob(prompt=prompt, image=image, n=n, future=future, loop=loop)
+            )
+        except queue.Full:
+            raise DiffusionQueueFullError(
+                f"Image generation queue is full ({self._queue.maxsize} jobs waiting)"
+            )
+        return future
+
+    def queued_jobs(self) -> int:
+        return self._queue.qsize()
+
+    def stop(self) -> None:
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            # The thread is a daemon, it goes away together with the process
+            pass
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.future.cancelled():
+                continue
+            try:
+                images = self._pipeline.generate_images(job.prompt, job.image, job.n)
+                _resolve(job, _set_result, images)
+            except Exception as e:
+                _resolve(job, _set_exception, e)
+
+
+def _resolve(job: _DiffusionJob, callback, value: Any) -> None:
+    try:
+        job.loop.call_soon_threadsafe(callback, job.future, value)
+    except RuntimeError:
+        # The event loop is already closed, nobody is waiting for the result
+        logger.debug("Dropping image generation result, event loop is closed")
+
+
+def _set_result(future: asyncio.Future, images: List[str]) -> None:
+    if not future.done():
+        future.set_result(images)
+
+
+def _set_exception(future: asyncio.Future, exc: Exception) -> None:
+    if not future.done():
+        future.set_exception(exc)
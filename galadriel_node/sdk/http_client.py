@@ -0,0 +1,127 @@
+"""
+One pooled HTTP session for the calls to the Galadriel API, the LLM checks and the
+passthrough inference streams, so they reuse keep-alive connections and cached DNS
+lookups instead of a new TCP and TLS handshake per call.
+
+A session is bound to its event loop. The CLI runs every command in its own loop,
+so the session is created again when the loop changed.
+"""
+
+import asyncio
+import copy
+import random
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+import aiohttp
+
+KEEPALIVE_TIMEOUT = 60  # seconds
+DNS_CACHE_TTL = 300  # seconds
+TIMEOUT = aiohttp.ClientTimeout(total=60, sock_connect=10)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5  # seconds, doubled on every retry and jittered
+# Requests that never reached the server are safe to send again
+CONNECT_ERRORS: Tuple[Type[Exception], ...] = (aiohttp.ClientConnectorError,)
+# GET requests are also retried when the connection broke or timed out mid-request
+GET_ERRORS: Tuple[Type[Exception], ...] = (
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+T = TypeVar("T")
+
+# pylint: disable=invalid-name
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+# Memoized GET responses by URL, forgotten with the session
+_responses: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+
+# pylint: disable=W0603
+def get_session() -> aiohttp.ClientSession:
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session_loop = loop
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                # Inference streams hold their connection for the whole response
+                limit=0,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            ),
+            timeout=TIMEOUT,
+        )
+        _responses.clear()
+    return _session
+
+
+# pylint: disable=W0603
+async def close() -> None:
+    global _session
+    session, _session = _session, None
+    _responses.clear()
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def closing(coroutine: Awaitable[T]) -> T:
+    """
+    Runs the coroutine and closes the session before its event loop goes away.
+    """
+    try:
+        return await coroutine
+    finally:
+        await close()
+
+
+async def with_retry(
+    call: Callable[[], Awaitable[T]],
+    retry_on: Tuple[Type[Exception], ...] = CONNECT_ERRORS,
+    attempts: int = RETRY_ATTEMPTS,
+) -> T:
+    """
+    Calls again after a jittered exponential backoff when the call fails with one of
+    the `retry_on` errors.
+    """
+    for attempt in range(attempts - 1):
+        try:
+            return await call()
+        except retry_on:
+            await asyncio.sleep(random.uniform(0, RETRY_BASE_DELAY * 2**attempt))
+    return await call()
+
+
+async def memoized(key: Tuple[str, str], fetch: Callable[[], Awaitable[T]]) -> T:
+    """
+    Returns the result of an earlier fetch with the same key, concurrent callers
+    share a single fetch. Failed fetches are not remembered. Every caller gets its
+    own copy, so changing the result does not change it for the others.
+    """
+    get_session()
+    future = _responses.get(key)
+    if future is None:
+        future = asyncio.ensure_future(fetch())
+        _responses[key] = future
+        future.add_done_callback(lambda done: _forget_failed(key, done))
+    return copy.deepcopy(await asyncio.shield(future))
+
+
+def forget_responses() -> None:
+    """
+    Drops the memoized responses, later fetches go to the server again.
+    """
+    _responses.clear()
+
+
+def _forget_failed(key: Tuple[str, str], future: "asyncio.Future[Any]") -> None:
+    if (future.cancelled() or future.exception() is not None) and _responses.get(
+        key
+    ) is future:
+        del _responses[key]
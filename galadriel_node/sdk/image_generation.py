@@ -1,17 +1,15 @@
 import asyncio
-import json
 from typing import Any, Optional
 
-from fastapi.encoders import jsonable_encoder
-from websockets import WebSocketClientProtocol
-
+from galadriel_node.config import config
+from galadriel_node.sdk import codec
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.protocol.entities import (
     ImageGenerationWebsocketRequest,
     ImageGenerationWebsocketResponse,
 )
-from galadriel_node.sdk.diffusers import Diffusers
-from galadriel_node.sdk.util.locked_counter import LockedCounter
+from galadriel_node.sdk.diffusion_worker import DiffusionWorker
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
 
 logger = get_node_logger()
 
@@ -36,27 +34,30 @@ def validate_image_generation_request(
 class ImageGeneration:
 
     def __init__(self, model: str):
-        self.counter = LockedCounter()
         self.lock = asyncio.Lock()
+        # torch and diffusers take seconds to import, only diffusion nodes need them
+        # pylint: disable=import-outside-toplevel
+        from galadriel_node.sdk.diffusers import Diffusers
+
         self.pipeline = Diffusers(model)
+        self.worker = DiffusionWorker(
+            self.pipeline, config.GALADRIEL_DIFFUSION_QUEUE_DEPTH
+        )
         logger.info("ImageGeneration engine initialized")
 
     async def process_request(
         self,
         request: ImageGenerationWebsocketRequest,
-        websocket: WebSocketClientProtocol,
-        send_lock: asyncio.Lock,
+        writer: WebsocketWriter,
     ) -> None:
         logger.info(
             f"Received image generation request. Request Id: {request.request_id}"
         )
         try:
-            await self.counter.increment()
             response = await self.generate_images(request)
-            response_data = jsonable_encoder(response)
-            encoded_response_data = json.dumps(response_data)
-            async with send_lock:
-                await websocket.send(encoded_response_data)
+            response_data = response.model_dump(mode="json")
+            encoded_response_data = codec.dumps(response_data)
+            await writer.send(encoded_response_data, wait=True)
             logger.info(
                 f"Sent image generation response for request {request.request_id}"
             )
@@ -64,13 +65,11 @@ class ImageGeneration:
             logger.error(
                 f"Failed to send response for request {request.request_id}: {e}"
             )
-        finally:
-            await self.counter.decrement()
         return
 
     async def generate_images(self, request):
         try:
-            images = self.pipeline.generate_images(
+            images = await self.worker.submit(
                 request.prompt,
                 request.image,
                 request.n,
@@ -87,6 +86,3 @@ class ImageGeneration:
                 images=[],
                 error=str(e),
             )
-
-    async def no_pending_requests(self) -> bool:
-        return await self.counter.is_zero()
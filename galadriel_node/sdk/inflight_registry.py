@@ -0,0 +1,135 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from typing import Coroutine
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+logger = get_node_logger()
+
+
+class RequestState(Enum):
+    RUNNING = "running"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+@dataclass
+class InflightRequest:
+    request_id: str
+    task: asyncio.Task
+    state: RequestState = RequestState.RUNNING
+    started_at: float = field(default_factory=time.monotonic)
+    first_chunk_at: Optional[float] = None
+    chunks: int = 0
+    bytes_sent: int = 0
+    cancel_reason: Optional[str] = None
+
+
+class InflightRegistry:
+    """
+    Tracks the inference requests of a connection by request id.
+
+    Cancelling a request cancels its task, which closes the HTTP stream to the LLM
+    backend, so vLLM aborts the sequence and frees its KV cache instead of decoding
+    tokens nobody reads.
+    """
+
+    def __init__(self):
+        self._requests: Dict[str, InflightRequest] = {}
+        self._tasks: Dict[asyncio.Task, InflightRequest] = {}
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+
+    def start(self, request_id: str, coroutine: Coroutine) -> InflightRequest:
+        if request_id in self._requests:
+            logger.warning(f"Request {request_id} is already in flight, replacing it")
+            self.cancel(request_id, "duplicate request id")
+        request = InflightRequest(
+            request_id=request_id, task=asyncio.create_task(coroutine)
+        )
+        self.adopt(request)
+        return request
+
+    def adopt(self, request: InflightRequest) -> None:
+        """
+        Tracks a request that is already running, e.g. one resumed from a lost connection.
+        """
+        self._requests[request.request_id] = request
+        self._tasks[request.task] = request
+        request.task.add_done_callback(self._finish)
+
+    def detach(self, request_id: str) -> Optional[InflightRequest]:
+        """
+        Stops tracking a request without cancelling it.
+        """
+        request = self._requests.pop(request_id, None)
+        if request is not None:
+            del self._tasks[request.task]
+            request.task.remove_done_callback(self._finish)
+        return request
+
+    def get(self, request_id: str) -> Optional[InflightRequest]:
+        return self._requests.get(request_id)
+
+    def requests(self) -> List[InflightRequest]:
+        return list(self._requests.values())
+
+    def record_chunk(self, request_id: str, size: int) -> None:
+        request = self._requests.get(request_id)
+        if request is None:
+            return
+        if request.first_chunk_at is None:
+            request.first_chunk_at = time.monotonic()
+        request.chunks += 1
+        request.bytes_sent += size
+
+    def cancel(self, request_id: str, reason: str) -> bool:
+        request = self._requests.get(request_id)
+        if request is None or request.task.done():
+            return False
+        logger.info(f"Cancelling request {request_id}: {reason}")
+        request.state = RequestState.CANCELLED
+        request.cancel_reason = reason
+        request.task.cancel()
+        return True
+
+    def cancel_all(self, reason: str) -> int:
+        return sum(
+            self.cancel(request_id, reason) for request_id in list(self._requests)
+        )
+
+    async def drain(self) -> None:
+        """
+        Waits until every request in flight has finished or was cancelled,
+        including the requests started while waiting.
+        """
+        while self._requests:
+            tasks = [request.task for request in self._requests.values()]
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Let the done callbacks remove the finished requests
+            await asyncio.sleep(0)
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def _finish(self, task: asyncio.Task) -> None:
+        request = self._tasks.pop(task)
+        if self._requests.get(request.request_id) is request:
+            del self._requests[request.request_id]
+        if task.cancelled():
+            request.state = RequestState.CANCELLED
+            self.cancelled += 1
+        elif task.exception() is not None:
+            request.state = RequestState.FAILED
+            self.failed += 1
+        else:
+            request.state = RequestState.DONE
+            self.completed += 1
@@ -1,34 +1,65 @@
 import asyncio
+from collections import deque
+from typing import Deque
+from typing import List
 from typing import Optional
 
-from ping3 import ping
-
 from galadriel_node.config import config
+from galadriel_node.sdk.latency_prober import LatencyProber
 from galadriel_node.sdk.logging_utils import get_node_logger
 
 logger = get_node_logger()
 
+# Ping times kept until the next pong takes them, the oldest are dropped
+MAX_PING_TIMES = 60
+
 
 class ApiPingJob:
-    def __init__(self, domain: str) -> None:
+    def __init__(self, domain: str, targets: Optional[List[str]] = None) -> None:
         self.domain = domain
-        self.ping_time: list[Optional[int]] = []
+        self.targets = targets or []
+        self.ping_time: Deque[Optional[int]] = deque(maxlen=MAX_PING_TIMES)
+        self.prober = self._create_prober()
         self._lock = asyncio.Lock()
 
+    def set_domain(self, domain: str) -> None:
+        """
+        Pings another domain from the next probe on, e.g. after the node moved to
+        another RPC endpoint.
+        """
+        if domain == self.domain:
+            return
+        self.domain = domain
+        self.prober = self._create_prober()
+
+    def _create_prober(self) -> LatencyProber:
+        return LatencyProber(
+            [self.domain]
+            + [target for target in self.targets if target != self.domain],
+            icmp=config.GALADRIEL_API_PING_ICMP,
+        )
+
     async def run(self):
         while True:
             try:
                 await asyncio.sleep(config.GALADRIEL_API_PING_INTERVAL)
-                ping_time = self._check_api_ping_time()
+                ping_time = await self._check_api_ping_time()
                 await self._append_ping_time(ping_time)
             except Exception as _:
                 await self._append_ping_time(None)
                 logger.error("Error occurs in API ping job.", exc_info=True)
 
-    def _check_api_ping_time(self) -> Optional[int]:
-        ping_time = ping(self.domain, unit="ms")
+    async def _check_api_ping_time(self) -> Optional[int]:
         logger.debug(f"Ping to domain: {self.domain}")
-        if not ping_time:
+        probes = await self.prober.probe_all()
+        for summary in self.prober.summaries():
+            logger.debug(
+                f"Latency to {summary.target}: p50={summary.p50}ms "
+                f"p90={summary.p90}ms p99={summary.p99}ms "
+                f"failures={summary.failures}/{summary.samples}"
+            )
+        ping_time = probes[0].rtt
+        if ping_time is None:
             logger.info("Failed to ping the Galadriel API.")
             return None
         logger.debug(f"API ping time: {ping_time}ms")
@@ -40,6 +71,6 @@ class ApiPingJob:
 
     async def get_and_clear_ping_time(self) -> list[Optional[int]]:
         async with self._lock:
-            ping_time = self.ping_time
-            self.ping_time = []
+            ping_time = list(self.ping_time)
+            self.ping_time.clear()
         return ping_time
@@ -0,0 +1,167 @@
+"""
+Measures the round trip time to a host without blocking the event loop and without
+raw socket privileges: the TCP connect takes one round trip, the TLS handshake on
+top of it takes one more (TLS 1.3) or two (TLS 1.2).
+"""
+
+import asyncio
+import math
+import socket
+import ssl
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from ping3 import ping
+
+DEFAULT_PORT = 443
+PROBE_TIMEOUT = 5.0  # seconds
+SAMPLE_WINDOW = 100  # Samples kept per target for the percentiles
+
+
+@dataclass
+class LatencyProbe:
+    target: str
+    # In milliseconds, None when the probe failed
+    tcp_connect: Optional[float]
+    tls_handshake: Optional[float] = None
+    icmp: Optional[float] = None
+
+    @property
+    def rtt(self) -> Optional[float]:
+        """
+        The round trip time reported for the target, ICMP when it was measured.
+        """
+        return self.icmp if self.icmp is not None else self.tcp_connect
+
+
+@dataclass
+class LatencySummary:
+    target: str
+    samples: int
+    failures: int
+    # Percentiles of the round trip time in milliseconds
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+
+
+def parse_target(target: str) -> Tuple[str, int]:
+    """
+    Targets are "host" or "host:port", the port defaults to 443.
+    """
+    host, _, port = target.strip().rpartition(":")
+    if not host or not port.isdigit():
+        return target.strip(), DEFAULT_PORT
+    return host.strip("[]"), int(port)
+
+
+def percentile(values: List[float], share: float) -> Optional[float]:
+    """
+    Nearest-rank percentile, `share` is between 0 and 1.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(share * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+async def probe(
+    target: str,
+    tls: bool = True,
+    icmp: bool = False,
+    timeout: float = PROBE_TIMEOUT,
+) -> LatencyProbe:
+    host, port = parse_target(target)
+    result = LatencyProbe(target=target, tcp_connect=None)
+    try:
+        await asyncio.wait_for(_probe_connection(result, host, port, tls), timeout)
+    except (OSError, ssl.SSLError, asyncio.TimeoutError):
+        pass
+    if icmp:
+        # ping3 blocks for up to its timeout, so it runs off the event loop
+        icmp_rtt = await asyncio.to_thread(ping, host, timeout=timeout, unit="ms")
+        result.icmp = icmp_rtt or None
+    return result
+
+
+async def _probe_connection(
+    result: LatencyProbe, host: str, port: int, tls: bool
+) -> None:
+    loop = asyncio.get_running_loop()
+    # Resolved first so the DNS lookup is not counted as network latency
+    addresses = await loop.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP
+    )
+    family, _, _, _, address = addresses[0]
+    started_at = time.perf_counter()
+    transport, protocol = await loop.create_connection(
+        asyncio.Protocol, address[0], address[1], family=family
+    )
+    result.tcp_connect = (time.perf_counter() - started_at) * 1000
+    try:
+        if tls:
+            started_at = time.perf_counter()
+            tls_transport = await loop.start_tls(
+                transport, protocol, ssl.create_default_context(), server_hostname=host
+            )
+            result.tls_handshake = (time.perf_counter() - started_at) * 1000
+            if tls_transport:
+                tls_transport.close()
+    finally:
+        transport.close()
+
+
+class LatencyProber:
+    """
+    Probes several targets concurrently and keeps their latest samples in a ring
+    buffer per target, for percentile summaries.
+    """
+
+    def __init__(
+        self,
+        targets: List[str],
+        tls: bool = True,
+        icmp: bool = False,
+        timeout: float = PROBE_TIMEOUT,
+        window: int = SAMPLE_WINDOW,
+    ):
+        self.targets = targets
+        self.tls = tls
+        self.icmp = icmp
+        self.timeout = timeout
+        self._samples: Dict[str, Deque[Optional[float]]] = {
+            target: deque(maxlen=window) for target in targets
+        }
+
+    async def probe_all(self) -> List[LatencyProbe]:
+        results = await asyncio.gather(
+            *[
+                probe(target, self.tls, self.icmp, self.timeout)
+                for target in self.targets
+            ]
+        )
+        for result in results:
+            self._samples[result.target].append(result.rtt)
+        return list(results)
+
+    def summary(self, target: str) -> LatencySummary:
+        samples = self._samples[target]
+        values = [sample for sample in samples if sample is not None]
+        return LatencySummary(
+            target=target,
+            samples=len(samples),
+            failures=len(samples) - len(values),
+            p50=percentile(values, 0.5),
+            p90=percentile(values, 0.9),
+            p99=percentile(values, 0.99),
+        )
+
+    def summaries(self) -> List[LatencySummary]:
+        return [self.summary(target) for target in self.targets]
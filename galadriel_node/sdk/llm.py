@@ -1,8 +1,10 @@
 from typing import AsyncGenerator
 from urllib.parse import urljoin
 
+import aiohttp
 import openai
 
+from galadriel_node.sdk import http_client
 from galadriel_node.sdk.entities import LLMEngine
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.protocol.entities import InferenceError
@@ -13,14 +15,23 @@ from galadriel_node.sdk.protocol.entities import InferenceErrorStatusCodes
 
 logger = get_node_logger()
 
+SSE_DATA_PREFIX = b"data:"
+SSE_DONE = "[DONE]"
+# Streams run as long as the model generates, only connecting is bounded
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10)
+# A single SSE event has to fit into the read buffer
+STREAM_READ_BUFSIZE = 2**20
+
 
 class Llm:
-    def __init__(self, inference_base_url: str):
+    def __init__(self, inference_base_url: str, sse_passthrough: bool = False):
         base_url: str = urljoin(inference_base_url, "/v1")
         self._client = openai.AsyncOpenAI(
             base_url=base_url, api_key="sk-no-key-required"
         )
         self.engine = LLMEngine.VLLM
+        self._completions_url = urljoin(inference_base_url, "/v1/chat/completions")
+        self._sse_passthrough = sse_passthrough
 
     async def detect_llm_engine(self) -> None:
         try:
@@ -43,6 +54,10 @@ class Llm:
     ) -> AsyncGenerator[InferenceResponse, None]:
         if not is_benchmark:
             logger.info(f"Running inference, id={request.id}")
+        if self._sse_passthrough and not is_benchmark:
+            async for chunk in self._run_passthrough_inference(request):
+                yield chunk
+            return
         async for chunk in self._run_streaming_inference(request):
             yield chunk
 
@@ -55,12 +70,68 @@ class Llm:
             completion = await self._client.chat.completions.create(
                 **request.chat_request
             )
-            async for chunk in completion:
-                yield InferenceResponse(
-                    request_id=request.id,
-                    status=InferenceStatusCodes.RUNNING,
-                    chunk=chunk,
-                )
+            try:
+                async for chunk in completion:
+                    yield InferenceResponse(
+                        request_id=request.id,
+                        status=InferenceStatusCodes.RUNNING,
+                        chunk=chunk,
+                    )
+            finally:
+                # Closing the stream on cancellation makes the backend abort the sequence
+                if isinstance(completion, openai.AsyncStream):
+                    await completion.close()
+            yield InferenceResponse(
+                request_id=request.id,
+                status=InferenceStatusCodes.DONE,
+                chunk=None,
+                error=None,
+            )
+        except Exception as exc:
+            yield await self._handle_error(request.id, exc)
+
+    async def _run_passthrough_inference(
+        self, request: InferenceRequest
+    ) -> AsyncGenerator[InferenceResponse, None]:
+        """
+        Streams the backend's SSE events without parsing them into ChatCompletionChunk
+        objects.
+        """
+        request.chat_request["stream"] = True
+        request.chat_request["stream_options"] = {"include_usage": True}
+        try:
+            async with http_client.get_session().post(
+                self._completions_url,
+                json=request.chat_request,
+                timeout=STREAM_TIMEOUT,
+                read_bufsize=STREAM_READ_BUFSIZE,
+            ) as response:
+                if response.status >= 400:
+                    body = await response.text()
+                    yield _passthrough_error(
+                        request.id,
+                        response.status,
+                        f"Error code: {response.status} - {body}",
+                    )
+                    return
+                async for line in response.content:
+                    if not line.startswith(SSE_DATA_PREFIX):
+                        continue
+                    raw_chunk = line[len(SSE_DATA_PREFIX) :].strip().decode("utf-8")
+                    if raw_chunk == SSE_DONE:
+                        break
+                    if raw_chunk.startswith('{"error"'):
+                        yield _passthrough_error(
+                            request.id,
+                            InferenceErrorStatusCodes.UNKNOWN_ERROR.value,
+                            raw_chunk,
+                        )
+                        return
+                    yield InferenceResponse(
+                        request_id=request.id,
+                        status=InferenceStatusCodes.RUNNING,
+                        raw_chunk=raw_chunk,
+                    )
             yield InferenceResponse(
                 request_id=request.id,
                 status=InferenceStatusCodes.DONE,
@@ -87,3 +158,20 @@ class Llm:
 
 def _llm_message_prefix(exc: Exception) -> str:
     return f"LLM Engine error: {str(exc)}"
+
+
+def _passthrough_error(
+    request_id: str, status_code: int, message: str
+) -> InferenceResponse:
+    try:
+        error_status_code = InferenceErrorStatusCodes(status_code)
+    except ValueError:
+        error_status_code = InferenceErrorStatusCodes.UNKNOWN_ERROR
+    return InferenceResponse(
+        request_id=request_id,
+        status=InferenceStatusCodes.ERROR,
+        error=InferenceError(
+            status_code=error_status_code,
+            message=f"LLM Engine error: {message}",
+        ),
+    )
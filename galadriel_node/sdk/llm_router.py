@@ -0,0 +1,125 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncGenerator
+from typing import List
+from typing import Optional
+
+from galadriel_node.config import config
+from galadriel_node.sdk.entities import LLMEngine
+from galadriel_node.sdk.llm import Llm
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.node.checks import llm_http_check
+from galadriel_node.sdk.protocol.entities import InferenceError
+from galadriel_node.sdk.protocol.entities import InferenceErrorStatusCodes
+from galadriel_node.sdk.protocol.entities import InferenceRequest
+from galadriel_node.sdk.protocol.entities import InferenceResponse
+from galadriel_node.sdk.protocol.entities import InferenceStatusCodes
+from galadriel_node.sdk.time_tracker import is_response_with_tokens
+
+logger = get_node_logger()
+
+
+@dataclass
+class LlmBackend:
+    base_url: str
+    llm: Llm
+    in_flight: int = 0
+    healthy: bool = True
+
+
+class LlmRouter:
+    """
+    Spreads inference requests over a pool of LLM backends serving the same model.
+
+    Every request goes to the healthy backend with the least requests in flight.
+    Backends failing the HTTP health probe are ejected until the probe passes again.
+    """
+
+    def __init__(self, base_urls: List[str], sse_passthrough: bool = False):
+        if not base_urls:
+            raise ValueError("LlmRouter needs at least one backend")
+        self.backends = [
+            LlmBackend(base_url=base_url, llm=Llm(base_url, sse_passthrough))
+            for base_url in base_urls
+        ]
+        self.engine = LLMEngine.VLLM
+        # Tokens streamed by all backends, for the throughput in the capacity report
+        self.streamed_tokens = 0
+
+    async def detect_llm_engine(self) -> None:
+        # All backends serve the same model, the first healthy one decides
+        backend = next((b for b in self.backends if b.healthy), self.backends[0])
+        await backend.llm.detect_llm_engine()
+        self.engine = backend.llm.engine
+        for b in self.backends:
+            b.llm.engine = self.engine
+
+    async def execute(
+        self,
+        request: InferenceRequest,
+        is_benchmark: bool = False,
+    ) -> AsyncGenerator[InferenceResponse, None]:
+        backend = self._pick_backend()
+        if backend is None:
+            logger.error(f"No healthy LLM backend for request {request.id}")
+            yield _no_backend_error(request.id)
+            return
+        backend.in_flight += 1
+        try:
+            async for chunk in backend.llm.execute(request, is_benchmark):
+                if is_response_with_tokens(chunk):
+                    self.streamed_tokens += 1
+                yield chunk
+        finally:
+            backend.in_flight -= 1
+
+    def set_healthy(self, base_url: str, healthy: bool) -> None:
+        for backend in self.backends:
+            if backend.base_url != base_url or backend.healthy == healthy:
+                continue
+            backend.healthy = healthy
+            if healthy:
+                logger.info(f"LLM backend {base_url} recovered, readmitting it")
+            else:
+                logger.error(f"LLM backend {base_url} is unhealthy, ejecting it")
+
+    def healthy_backends(self) -> List[LlmBackend]:
+        return [backend for backend in self.backends if backend.healthy]
+
+    def in_flight(self) -> int:
+        return sum(backend.in_flight for backend in self.backends)
+
+    async def run_health_checks(
+        self, interval: float = config.GALADRIEL_LLM_HEALTH_CHECK_INTERVAL
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.gather(*[self._probe(backend) for backend in self.backends])
+
+    def _pick_backend(self) -> Optional[LlmBackend]:
+        healthy = self.healthy_backends()
+        if not healthy:
+            return None
+        return min(healthy, key=lambda backend: backend.in_flight)
+
+    async def _probe(self, backend: LlmBackend) -> None:
+        try:
+            response = await llm_http_check.execute(
+                backend.base_url,
+                total_timeout=config.GALADRIEL_LLM_HEALTH_CHECK_TIMEOUT,
+            )
+            healthy = response.ok
+        except Exception:
+            healthy = False
+        self.set_healthy(backend.base_url, healthy)
+
+
+def _no_backend_error(request_id: str) -> InferenceResponse:
+    return InferenceResponse(
+        request_id=request_id,
+        status=InferenceStatusCodes.ERROR,
+        error=InferenceError(
+            status_code=InferenceErrorStatusCodes.UNKNOWN_ERROR,
+            message="LLM Engine error: no healthy LLM backend available",
+        ),
+    )
@@ -16,10 +16,12 @@ logger = get_node_logger()
 
 
 async def execute(
-    llm_base_url: str, model_id: str, concurrency: int, requests: int
+    llm_base_urls: List[str], model_id: str, concurrency: int, requests: int
 ) -> None:
     tasks = []
-    for _ in range(concurrency):
+    for i in range(concurrency):
+        # Workers are spread round-robin over the backends
+        llm_base_url = llm_base_urls[i % len(llm_base_urls)]
         task = asyncio.create_task(_loop_inferences(llm_base_url, model_id, requests))
         tasks.append(task)
 
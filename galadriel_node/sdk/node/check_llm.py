@@ -1,7 +1,3 @@
-from http import HTTPStatus
-
-import openai
-
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.node.checks import llm_http_check
 from galadriel_node.sdk.node.checks import llm_sanity_check
@@ -31,15 +27,14 @@ async def execute(llm_base_url: str, model_id: str) -> bool:
 
     try:
         response = await llm_sanity_check.execute(llm_base_url, model_id)
-        if response.status_code == HTTPStatus.OK:
+        if response.ok:
             logger.info(
                 f"[bold green]\N{CHECK MARK} LLM server at {llm_base_url} successfully generated tokens.[/bold green]"
             )
             return True
-    except openai.APIStatusError as e:
         logger.info(
             f"[bold red]\N{CROSS MARK} LLM server at {llm_base_url} "
-            f"failed to generate tokens. APIStatusError: \n{e}[/bold red]"
+            f"failed to generate tokens. Status code: {response.status}[/bold red]"
         )
         return False
     except Exception as e:
@@ -48,4 +43,3 @@ async def execute(llm_base_url: str, model_id: str) -> bool:
             f"failed to generate tokens. Exception occurred: {e}[/bold red]"
         )
         return False
-    return False
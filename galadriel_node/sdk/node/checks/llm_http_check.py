@@ -1,7 +1,12 @@
 import aiohttp
 
+from galadriel_node.sdk import http_client
+
 
 async def execute(llm_base_url: str, total_timeout: float = 60.0):
     timeout = aiohttp.ClientTimeout(total=total_timeout)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        return await session.get(llm_base_url + "/v1/models/")
+    session = http_client.get_session()
+    async with session.get(llm_base_url + "/v1/models/", timeout=timeout) as response:
+        # Read the body, so the connection goes back to the pool
+        await response.read()
+        return response
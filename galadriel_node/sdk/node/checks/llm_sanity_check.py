@@ -1,22 +1,30 @@
 from urllib.parse import urljoin
 
-import openai
+import aiohttp
+
+from galadriel_node.sdk import http_client
 
 
 async def execute(
     llm_base_url: str,
     model_id: str,
 ):
-    base_url: str = urljoin(llm_base_url, "/v1")
-    client = openai.AsyncOpenAI(base_url=base_url, api_key="sk-no-key-required")
-    return await client.chat.with_raw_response.completions.create(
-        model=model_id,
-        messages=[
-            {
-                "role": "user",
-                "content": "Say this is a test",
-            },
-        ],
-        max_tokens=5,
-        timeout=5,
-    )
+    timeout = aiohttp.ClientTimeout(total=5)
+    session = http_client.get_session()
+    async with session.post(
+        urljoin(llm_base_url, "/v1/chat/completions"),
+        json={
+            "model": model_id,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": "Say this is a test",
+                },
+            ],
+            "max_tokens": 5,
+        },
+        timeout=timeout,
+    ) as response:
+        # Read the body, so the connection goes back to the pool
+        await response.read()
+        return response
@@ -0,0 +1,209 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from urllib.parse import urlparse
+
+import websockets
+
+from galadriel_node.sdk import latency_prober
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+PROBE_TIMEOUT = 3.0  # seconds
+# The median of the last probes decides, a single slow probe does not move the node
+PROBE_WINDOW = 3
+
+logger = get_node_logger()
+
+
+@dataclass
+class EndpointProbe:
+    uri: str
+    # In milliseconds, None when the endpoint did not answer
+    connect_rtt: Optional[float]
+    # Until the server answered the websocket upgrade, including the connect
+    handshake: Optional[float]
+
+
+@dataclass
+class EndpointSelectionStats:
+    current: str
+    probes: int = 0
+    switches: int = 0
+    # Median handshake time per endpoint in milliseconds, None when it is down
+    latencies: Dict[str, Optional[float]] = field(default_factory=dict)
+
+
+async def probe_endpoint(uri: str, timeout: float = PROBE_TIMEOUT) -> EndpointProbe:
+    """
+    Measures the TCP connect round trip and the websocket handshake to the endpoint.
+    The handshake is sent without credentials, so the server rejects it and the probe
+    never registers as a node connection. The rejection still takes the full
+    handshake.
+    """
+    parsed = urlparse(uri)
+    port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+    connect = await latency_prober.probe(
+        f"{parsed.hostname}:{port}", tls=False, timeout=timeout
+    )
+    handshake: Optional[float] = None
+    started_at = time.perf_counter()
+    try:
+        websocket = await asyncio.wait_for(websockets.connect(uri), timeout)
+        handshake = (time.perf_counter() - started_at) * 1000
+        await websocket.close()
+    except websockets.InvalidStatusCode:
+        handshake = (time.perf_counter() - started_at) * 1000
+    except Exception as e:
+        logger.debug(f"Failed to probe {uri}: {e}")
+    return EndpointProbe(uri=uri, connect_rtt=connect.tcp_connect, handshake=handshake)
+
+
+class EndpointSelector:
+    """
+    Picks the Galadriel server the node connects to when several RPC urls are
+    configured. The endpoints are probed again every `probe_interval` seconds, and the
+    node moves when another endpoint's handshake is faster by `switch_margin`, so
+    endpoints with about the same latency do not make it flap.
+    """
+
+    def __init__(
+        self,
+        uris: List[str],
+        switch_margin: float,
+        probe_interval: float,
+        timeout: float = PROBE_TIMEOUT,
+    ):
+        self.uris = uris
+        self.switch_margin = switch_margin
+        self.probe_interval = probe_interval
+        self.timeout = timeout
+        self.current = uris[0]
+        self.stats = EndpointSelectionStats(current=self.current)
+        self._samples: Dict[str, Deque[Optional[float]]] = {
+            uri: deque(maxlen=PROBE_WINDOW) for uri in uris
+        }
+        self._switch = asyncio.Event()
+
+    def latency(self, uri: str) -> Optional[float]:
+        """
+        Returns the median handshake time of the endpoint, None when its last probe
+        failed or it was not probed yet.
+        """
+        samples = self._samples[uri]
+        if not samples or samples[-1] is None:
+            return None
+        return latency_prober.percentile(
+            [sample for sample in samples if sample is not None], 0.5
+        )
+
+    async def probe(self) -> List[EndpointProbe]:
+        probes = await asyncio.gather(
+            *[probe_endpoint(uri, self.timeout) for uri in self.uris]
+        )
+        for result in probes:
+            self._samples[result.uri].append(result.handshake)
+        self.stats.probes += 1
+        self.stats.latencies = {uri: self.latency(uri) for uri in self.uris}
+        return list(probes)
+
+    async def select(self) -> str:
+        """
+        Probes the endpoints and picks the fastest, there is no connection to keep yet.
+        """
+        if len(self.uris) > 1:
+            await self.probe()
+            fastest = self._fastest()
+            if fastest is not None:
+                self.current = self.stats.current = fastest
+            logger.info(
+                f"Connecting to RPC endpoint {self.current} "
+                f"(handshake times: {_format_latencies(self.stats.latencies)})"
+            )
+        return self.current
+
+    def failed(self, uri: str) -> None:
+        """
+        The connection to the endpoint failed, the next connection goes to the fastest
+        of the others.
+        """
+        if len(self.uris) < 2:
+            return
+        self._samples[uri].append(None)
+        self.stats.latencies[uri] = None
+        if uri != self.current:
+            return
+        others = [other for other in self.uris if other != uri]
+        fastest = self._fastest(others) or others[0]
+        self._move(fastest, f"the connection to {uri} failed")
+
+    async def run(self) -> None:
+        if len(self.uris) < 2:
+            return
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.probe()
+                better = self._better_endpoint()
+                if better is not None:
+                    self._move(better, "it is faster than the current endpoint")
+                    self._switch.set()
+            except Exception:
+                logger.error("Failed to probe the RPC endpoints", exc_info=True)
+
+    async def wait_for_switch(self, uri: str) -> bool:
+        """
+        Returns once the node connected to `uri` should move its connection to the
+        new current endpoint.
+        """
+        while True:
+            await self._switch.wait()
+            self._switch.clear()
+            if self.current != uri:
+                return True
+
+    def _better_endpoint(self) -> Optional[str]:
+        fastest = self._fastest()
+        if fastest is None or fastest == self.current:
+            return None
+        current = self.latency(self.current)
+        fastest_latency = self.latency(fastest)
+        if (
+            current is not None
+            and fastest_latency is not None
+            and fastest_latency > current * (1 - self.switch_margin)
+        ):
+            return None
+        return fastest
+
+    def _fastest(self, uris: Optional[List[str]] = None) -> Optional[str]:
+        latencies = {
+            uri: latency
+            for uri in uris or self.uris
+            if (latency := self.latency(uri)) is not None
+        }
+        if not latencies:
+            return None
+        return min(latencies, key=lambda uri: latencies[uri])
+
+    def _move(self, uri: str, reason: str) -> None:
+        previous, self.current = self.current, uri
+        self.stats.current = uri
+        self.stats.switches += 1
+        logger.info(
+            f"Moving from RPC endpoint {previous} to {uri}, {reason} "
+            f"(handshake times: {_format_latencies(self.stats.latencies)}, "
+            f"switches: {self.stats.switches})"
+        )
+
+
+def _format_latencies(latencies: Dict[str, Optional[float]]) -> str:
+    return ", ".join(
+        f"{uri}: {'down' if latency is None else f'{latency:.0f}ms'}"
+        for uri, latency in latencies.items()
+    )
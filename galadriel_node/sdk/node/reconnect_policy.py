@@ -0,0 +1,154 @@
+import random
+import time
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+BACKOFF_MIN = 24  # Minimum backoff time in seconds
+BACKOFF_INCREMENT = 6  # Incremental backoff time in seconds
+BACKOFF_MAX = 300  # Maximum backoff time in seconds
+JITTER_BASE = 1  # Base of the jittered backoff after a failure in seconds
+STABLE_UPTIME = 30  # A connection that lived this long resets the backoff, in seconds
+
+logger = get_node_logger()
+
+
+class DisconnectKind(Enum):
+    # The server closed the connection normally or asked for a reconnect
+    CLEAN = "clean"
+    # The server refused the node for now, e.g. with TRY_AGAIN_LATER
+    THROTTLED = "throttled"
+    # Connecting failed or the connection broke
+    FAILED = "failed"
+
+
+# pylint: disable=too-few-public-methods
+class ReconnectPolicy(ABC):
+    """
+    Decides how long the node waits before connecting again.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def next_delay(self, kind: DisconnectKind, uptime: float) -> float:
+        """
+        :param uptime: how long the lost connection was up, in seconds
+        """
+
+
+class ExponentialReconnectPolicy(ReconnectPolicy):
+    """
+    Waits at least BACKOFF_MIN seconds before every retry and backs off exponentially
+    while the server keeps refusing the node or connecting keeps failing. A connection
+    that was up for STABLE_UPTIME resets the backoff however it ended, unless the
+    server throttled the node.
+    """
+
+    name = "exponential"
+
+    def __init__(self):
+        self._retries = 0
+        self._backoff_time: float = BACKOFF_MIN
+
+    def next_delay(self, kind: DisconnectKind, uptime: float) -> float:
+        self._retries += 1
+        if kind == DisconnectKind.CLEAN or (
+            kind == DisconnectKind.FAILED and uptime >= STABLE_UPTIME
+        ):
+            self._retries = 0
+            self._backoff_time = BACKOFF_MIN
+        delay = self._backoff_time
+        # Exponential backoff with offset
+        self._backoff_time = min(
+            BACKOFF_MIN + (BACKOFF_INCREMENT * (2 ** (self._retries - 1))), BACKOFF_MAX
+        )
+        return delay
+
+
+class JitteredReconnectPolicy(ReconnectPolicy):
+    """
+    Connects again right away after a clean close and uses decorrelated jitter
+    backoff after failures, so nodes dropped together do not reconnect in lockstep.
+
+    A clean close of a connection that did not reach STABLE_UPTIME is only retried
+    immediately once, a server closing every connection right away is backed off.
+    """
+
+    name = "jitter"
+
+    def __init__(
+        self,
+        base: float = JITTER_BASE,
+        throttled_base: float = BACKOFF_MIN,
+        cap: float = BACKOFF_MAX,
+    ):
+        self.base = base
+        self.throttled_base = throttled_base
+        self.cap = cap
+        self._delay = base
+        self._unstable = False
+
+    def next_delay(self, kind: DisconnectKind, uptime: float) -> float:
+        if uptime >= STABLE_UPTIME:
+            self._delay = self.base
+            self._unstable = False
+        if kind == DisconnectKind.CLEAN and not self._unstable:
+            self._unstable = uptime < STABLE_UPTIME
+            return 0.0
+        base = self.throttled_base if kind == DisconnectKind.THROTTLED else self.base
+        self._delay = min(self.cap, random.uniform(base, max(base, self._delay * 3)))
+        return self._delay
+
+
+def get_reconnect_policy(name: str) -> ReconnectPolicy:
+    if name == ExponentialReconnectPolicy.name:
+        return ExponentialReconnectPolicy()
+    if name == JitteredReconnectPolicy.name:
+        return JitteredReconnectPolicy()
+    raise SdkError(
+        f'Unknown reconnect policy "{name}", '
+        f'use "{JitteredReconnectPolicy.name}" or "{ExponentialReconnectPolicy.name}"'
+    )
+
+
+@dataclass
+class ReconnectStats:
+    """
+    Time the node spent without a connection, from losing one to the next handshake.
+    """
+
+    policy: str
+    reconnects: int = 0
+    last_gap: float = 0.0
+    max_gap: float = 0.0
+    total_gap: float = 0.0
+    disconnected_at: Optional[float] = None
+
+    @property
+    def mean_gap(self) -> float:
+        return self.total_gap / self.reconnects if self.reconnects else 0.0
+
+    def disconnected(self) -> None:
+        if self.disconnected_at is None:
+            self.disconnected_at = time.monotonic()
+
+    def connected(self) -> None:
+        if self.disconnected_at is None:
+            return
+        gap = time.monotonic() - self.disconnected_at
+        self.disconnected_at = None
+        self.reconnects += 1
+        self.last_gap = gap
+        self.max_gap = max(self.max_gap, gap)
+        self.total_gap += gap
+        logger.info(
+            f"Reconnected after {gap:.2f}s (policy: {self.policy}, "
+            f"reconnects: {self.reconnects}, mean gap: {self.mean_gap:.2f}s, "
+            f"max gap: {self.max_gap:.2f}s)"
+        )
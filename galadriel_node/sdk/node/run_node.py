@@ -1,51 +1,112 @@
 import asyncio
-import json
 import logging
 import signal
+import time
+from contextlib import aclosing
 from dataclasses import dataclass
+from dataclasses import field
+from functools import partial
+from typing import Any
+from typing import List
 from typing import Optional
 from urllib.parse import urlparse
 
-import rich
 import websockets
 from websockets.frames import CloseCode
 
 from galadriel_node.config import config
+from galadriel_node.config import parse_llm_base_urls
+from galadriel_node.config import parse_rpc_urls
 from galadriel_node.llm_backends import vllm
+from galadriel_node.llm_backends import vllm_detached
+from galadriel_node.llm_backends.launch_profiles import DEFAULT_MAX_NUM_SEQS
+from galadriel_node.sdk import codec
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.adaptive_concurrency import AdaptiveLimit
+from galadriel_node.sdk.adaptive_concurrency import StreamLatency
+from galadriel_node.sdk.admission import AdmissionController
+from galadriel_node.sdk.admission import AdmissionTicket
+from galadriel_node.sdk.capacity import CapacityMonitor
+from galadriel_node.sdk.chunk_coalescer import COALESCING_HEADER
+from galadriel_node.sdk.chunk_coalescer import ChunkCoalescer
+from galadriel_node.sdk.chunk_coalescer import CoalescingStats
 from galadriel_node.sdk.entities import SdkError
 from galadriel_node.sdk.image_generation import ImageGeneration
 from galadriel_node.sdk.image_generation import validate_image_generation_request
+from galadriel_node.sdk.inflight_registry import InflightRegistry
 from galadriel_node.sdk.jobs.api_ping_job import ApiPingJob
 from galadriel_node.sdk.jobs.reconnect_request_job import wait_for_reconnect
-from galadriel_node.sdk.llm import Llm
+from galadriel_node.sdk.llm_router import LlmRouter
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.node import check_llm
-from galadriel_node.sdk.node.checks import llm_http_check
+from galadriel_node.sdk.node.endpoint_selector import EndpointSelector
+from galadriel_node.sdk.node.reconnect_policy import DisconnectKind
+from galadriel_node.sdk.node.reconnect_policy import ReconnectStats
+from galadriel_node.sdk.node.reconnect_policy import get_reconnect_policy
+from galadriel_node.sdk.node.standby_connection import STANDBY_HEADER
+from galadriel_node.sdk.node.standby_connection import STANDBY_PROTOCOL_NAME
+from galadriel_node.sdk.node.standby_connection import STANDBY_PROTOCOL_VERSION
+from galadriel_node.sdk.node.standby_connection import StandbyConnection
+from galadriel_node.sdk.node.startup import StartupTimeline
+from galadriel_node.sdk.node.startup import run_concurrently
+from galadriel_node.sdk.node.vllm_supervisor import VllmSupervisor
+from galadriel_node.sdk.node.vllm_supervisor import wait_for_vllm
 from galadriel_node.sdk.protocol import protocol_settings
+from galadriel_node.sdk.protocol.entities import InferenceError
+from galadriel_node.sdk.protocol.entities import InferenceErrorStatusCodes
 from galadriel_node.sdk.protocol.entities import InferenceRequest
+from galadriel_node.sdk.protocol.entities import InferenceResponse
+from galadriel_node.sdk.protocol.entities import InferenceStatusCodes
 from galadriel_node.sdk.protocol.health_check_protocol import HealthCheckProtocol
+from galadriel_node.sdk.protocol.inference_cancel_protocol import (
+    InferenceCancelProtocol,
+)
 from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
+from galadriel_node.sdk.protocol.protocol_handler import MessageKind
 from galadriel_node.sdk.protocol.protocol_handler import ProtocolHandler
+from galadriel_node.sdk.protocol.stream_ack_protocol import StreamAckProtocol
+from galadriel_node.sdk.stream_resumption import RESUMPTION_HEADER
+from galadriel_node.sdk.stream_resumption import ResumableStream
+from galadriel_node.sdk.stream_resumption import STREAM_RESUMPTION_PROTOCOL_VERSION
+from galadriel_node.sdk.stream_resumption import StreamResumer
 from galadriel_node.sdk.system.report_hardware import report_hardware
 from galadriel_node.sdk.system.report_performance import report_performance
+from galadriel_node.sdk.system.utilization_sampler import UtilizationSampler
 from galadriel_node.sdk.upgrade import version_aware_get
-from galadriel_node.sdk.util.locked_counter import LockedCounter
-
-BACKOFF_MIN = 24  # Minimum backoff time in seconds
-BACKOFF_INCREMENT = 6  # Incremental backoff time in seconds
-BACKOFF_MAX = 300  # Maximum backoff time in seconds
+from galadriel_node.sdk.websocket_writer import MessagePriority
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
 
 
 @dataclass
 class ConnectionResult:
     retry: bool
-    reset_backoff: bool = True
+    disconnect: DisconnectKind = DisconnectKind.CLEAN
+    # Connect again without waiting, the previous connection is still draining
+    immediate: bool = False
+
+
+@dataclass
+class NodeSession:
+    """
+    State that outlives a single connection to the Galadriel server.
+    """
+
+    reconnect_stats: ReconnectStats
+    stream_resumer: Optional[StreamResumer] = None
+    standby: Optional[StandbyConnection] = None
+    capacity: Optional[CapacityMonitor] = None
+    utilization: Optional[UtilizationSampler] = None
+    endpoints: Optional[EndpointSelector] = None
+    # Background jobs of the session, cancelled when the node stops
+    tasks: List[asyncio.Task] = field(default_factory=list)
 
 
 logger = get_node_logger()
 
 # pylint: disable=invalid-name
-llm: Optional[Llm] = None
+llm: Optional[LlmRouter] = None
+# pylint: disable=invalid-name
+admission: Optional[AdmissionController] = None
 # pylint: disable=invalid-name
 image_generation_engine: Optional[ImageGeneration] = None
 
@@ -59,214 +120,667 @@ async def execute(
     node_id: Optional[str],
     llm_base_url: Optional[str],
 ):
-    global llm
-    global image_generation_engine
-
     if not api_key:
         raise SdkError("GALADRIEL_API_KEY env variable not set")
     if not node_id:
         raise SdkError("GALADRIEL_NODE_ID env variable not set")
 
-    # Check version compatibility with the backend. This way it doesn't have to be checked inside report* commands
-    await version_aware_get(
-        api_url, "node/info", api_key, query_params={"node_id": node_id}
-    )
+    # Independent startup phases run concurrently, the timeline shows where time goes
+    timeline = StartupTimeline()
     try:
-        if config.GALADRIEL_MODEL_TYPE == "DIFFUSION":
-            # Initialize image generation engine with the specified model
-            image_generation_engine = ImageGeneration(config.GALADRIEL_MODEL_ID)
-            await report_hardware(api_url, api_key, node_id)
-        else:
-            if llm_base_url:
-                result = await check_llm.execute(
-                    llm_base_url, config.GALADRIEL_MODEL_ID
-                )
-                if not result:
-                    raise SdkError(
-                        'LLM check failed. Please make sure "GALADRIEL_LLM_BASE_URL" is correct.'
-                    )
-            else:
-                llm_pid = await _run_llm(config.GALADRIEL_MODEL_ID)
-                loop = asyncio.get_running_loop()
-                for sig in (signal.SIGINT, signal.SIGTERM):
-                    loop.add_signal_handler(
-                        sig, lambda: _handle_termination(loop, llm_pid)
-                    )
-                llm_base_url = vllm.LLM_BASE_URL
-            # Initialize llm with llm_base_url
-            llm = Llm(llm_base_url)
-            await llm.detect_llm_engine()
-            await report_hardware(api_url, api_key, node_id)
-            await report_performance(
-                api_url, api_key, node_id, llm_base_url, config.GALADRIEL_MODEL_ID
-            )
+        try:
+            await _start(timeline, api_url, api_key, node_id, llm_base_url)
+        finally:
+            # Also shown when startup failed, to see which phase did
+            timeline.log()
+        # Startup responses are not reused later on
+        http_client.forget_responses()
         await _retry_connection(rpc_url, api_key, node_id)
     except asyncio.CancelledError:
         logger.error("Stopping the node.")
 
 
+async def _start(
+    timeline: StartupTimeline,
+    api_url: str,
+    api_key: str,
+    node_id: str,
+    llm_base_url: Optional[str],
+) -> None:
+    # Check version compatibility with the backend. This way it doesn't have to be checked inside report* commands
+    version_check = timeline.phase(
+        "version check",
+        version_aware_get(
+            api_url,
+            "node/info",
+            api_key,
+            query_params={"node_id": node_id},
+            memoize=True,
+        ),
+    )
+    hardware_report = timeline.phase(
+        "hardware report", report_hardware(api_url, api_key, node_id)
+    )
+    if config.GALADRIEL_MODEL_TYPE == "DIFFUSION":
+        await run_concurrently(
+            timeline.phase("image model load", _load_image_generation()),
+            version_check,
+            hardware_report,
+        )
+    else:
+        await run_concurrently(
+            _start_llm(timeline, llm_base_url, api_url, api_key, node_id),
+            version_check,
+            hardware_report,
+        )
+
+
+async def _load_image_generation() -> None:
+    global image_generation_engine
+    # Loading the pipeline blocks for a while, so it runs in a thread
+    image_generation_engine = await asyncio.to_thread(
+        ImageGeneration, config.GALADRIEL_MODEL_ID
+    )
+
+
+async def _start_llm(
+    timeline: StartupTimeline,
+    llm_base_url: Optional[str],
+    api_url: str,
+    api_key: str,
+    node_id: str,
+) -> None:
+    """
+    Brings up the LLM backends, then benchmarks them.
+    """
+    global llm, admission
+    llm_base_urls = parse_llm_base_urls(llm_base_url)
+    llm_processes: List[vllm.VllmProcess] = []
+    if llm_base_urls:
+        results = await timeline.phase(
+            "llm check",
+            asyncio.gather(
+                *[
+                    check_llm.execute(url, config.GALADRIEL_MODEL_ID)
+                    for url in llm_base_urls
+                ]
+            ),
+        )
+        if not any(results):
+            raise SdkError(
+                'LLM check failed. Please make sure "GALADRIEL_LLM_BASE_URL" is correct.'
+            )
+    else:
+        llm_processes = await timeline.phase(
+            "vLLM start", _start_local_llm(config.GALADRIEL_MODEL_ID)
+        )
+        llm_base_urls = [process.base_url for process in llm_processes]
+        results = [True] * len(llm_base_urls)
+    # Initialize the llm backend pool, backends failing the check start ejected
+    llm = LlmRouter(llm_base_urls, config.GALADRIEL_LLM_SSE_PASSTHROUGH)
+    for url, result in zip(llm_base_urls, results):
+        llm.set_healthy(url, result)
+    admission = _create_admission(llm_processes)
+    if llm_processes:
+        # Locally started servers are restarted by the supervisor when they fail
+        supervisor = VllmSupervisor(llm_processes, config.GALADRIEL_MODEL_ID, llm)
+        asyncio.create_task(supervisor.run())
+    elif len(llm_base_urls) > 1:
+        asyncio.create_task(llm.run_health_checks())
+    await timeline.phase("engine detection", llm.detect_llm_engine())
+    await timeline.phase(
+        "performance report",
+        report_performance(
+            api_url,
+            api_key,
+            node_id,
+            # Ejected backends would only fail the benchmark
+            [backend.base_url for backend in llm.healthy_backends()],
+            config.GALADRIEL_MODEL_ID,
+        ),
+    )
+
+
+def _create_admission(
+    llm_processes: List[vllm.VllmProcess],
+) -> Optional[AdmissionController]:
+    """
+    Sizes admission control to the backends' concurrency limit, the configured one or
+    the max_num_seqs of the locally started vLLM servers.
+    """
+    limit = config.GALADRIEL_MAX_CONCURRENT_REQUESTS
+    if limit <= 0 and llm_processes:
+        max_num_seqs = [vllm.get_max_num_seqs(process) for process in llm_processes]
+        if None not in max_num_seqs:
+            limit = sum(seqs for seqs in max_num_seqs if seqs is not None)
+    if config.GALADRIEL_ADAPTIVE_CONCURRENCY:
+        # The backend's limit is the ceiling, vLLM's default when it is unknown
+        adaptive_limit = AdaptiveLimit(
+            max_limit=limit if limit > 0 else DEFAULT_MAX_NUM_SEQS,
+            time_to_first_token_slo=config.GALADRIEL_TIME_TO_FIRST_TOKEN_SLO,
+            inter_token_latency_slo=config.GALADRIEL_INTER_TOKEN_LATENCY_SLO,
+        )
+        logger.info(
+            f"Adaptive concurrency: up to {adaptive_limit.max_limit} requests, "
+            f"SLO TTFT {adaptive_limit.time_to_first_token_slo}s, "
+            f"ITL {adaptive_limit.inter_token_latency_slo}s"
+        )
+        return AdmissionController(
+            adaptive_limit.max_limit,
+            config.GALADRIEL_ADMISSION_QUEUE_DEPTH,
+            adaptive_limit,
+        )
+    if limit <= 0:
+        logger.info(
+            "LLM backend concurrency limit is unknown, admission control is disabled. "
+            "Set GALADRIEL_MAX_CONCURRENT_REQUESTS to enable it."
+        )
+        return None
+    logger.info(
+        f"Admission control: {limit} concurrent requests, "
+        f"{config.GALADRIEL_ADMISSION_QUEUE_DEPTH} waiting"
+    )
+    return AdmissionController(limit, config.GALADRIEL_ADMISSION_QUEUE_DEPTH)
+
+
 async def _retry_connection(rpc_url: str, api_key: str, node_id: str):
     """
-    Attempts to reconnect to the Galadriel server with exponential backoff.
+    Keeps the node connected to the Galadriel server, the reconnect policy decides
+    how long to wait after a connection is lost.
     """
-    uri = f"{rpc_url}/ws"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Model": config.GALADRIEL_MODEL_ID,
         "Model-Type": config.GALADRIEL_MODEL_TYPE,
         "Node-Id": node_id,
     }
-    retries = 0
-    backoff_time = BACKOFF_MIN
-
-    # Start the API ping job
-    api_ping_job = ApiPingJob(config.GALADRIEL_API_DOMAIN or _get_domain_from_url(uri))
-    asyncio.create_task(api_ping_job.run())
+    if config.GALADRIEL_CHUNK_COALESCING_WINDOW_MS > 0:
+        headers[COALESCING_HEADER] = str(config.GALADRIEL_CHUNK_COALESCING_WINDOW_MS)
+    policy = get_reconnect_policy(config.GALADRIEL_RECONNECT_POLICY)
+    endpoints = EndpointSelector(
+        [f"{url}/ws" for url in parse_rpc_urls(rpc_url)],
+        config.GALADRIEL_RPC_SWITCH_MARGIN,
+        config.GALADRIEL_RPC_PROBE_INTERVAL,
+    )
+    session = _create_session(endpoints, headers, policy.name)
 
-    while True:
-        try:
-            result = await _connect_and_process(uri, headers, node_id, api_ping_job)
-            if result.retry:
-                retries += 1
-                if result.reset_backoff:
-                    retries = 0
-                    backoff_time = BACKOFF_MIN
-                logger.info(f"Retry #{retries} in {backoff_time} seconds...")
-            else:
+    try:
+        uri = await endpoints.select()
+        session.tasks.append(asyncio.create_task(endpoints.run()))
+        # Start the API ping job, it pings the selected endpoint
+        api_ping_job = ApiPingJob(
+            config.GALADRIEL_API_DOMAIN or _get_domain_from_url(uri),
+            config.GALADRIEL_API_PING_TARGETS,
+        )
+        session.tasks.append(asyncio.create_task(api_ping_job.run()))
+        while True:
+            if endpoints.current != uri:
+                uri = endpoints.current
+                await _follow_endpoint(uri, session, api_ping_job)
+            connected_at = time.monotonic()
+            result = await _run_connection(uri, headers, node_id, api_ping_job, session)
+            if not result.retry:
                 break
-        except websockets.ConnectionClosedError as e:
-            retries += 1
-            logger.error(f"WebSocket connection closed: {e}. Retrying...")
-        except websockets.InvalidStatusCode as e:
-            retries += 1
-            logger.error(f"Invalid status code: {e}. Retrying...")
-        except Exception as _:
-            retries += 1
-            logger.error(
-                f"Websocket connection failed. Retry #{retries} in {backoff_time} seconds..."
+            session.reconnect_stats.disconnected()
+            if result.disconnect == DisconnectKind.FAILED and not result.immediate:
+                endpoints.failed(uri)
+            if result.immediate or _can_take_over(session, result.disconnect):
+                continue
+            backoff_time = policy.next_delay(
+                result.disconnect, time.monotonic() - connected_at
             )
-            logger.error("Connection error", exc_info=True)
+            if backoff_time > 0:
+                logger.info(f"Retrying in {backoff_time:.1f} seconds...")
+                await asyncio.sleep(backoff_time)
+    finally:
+        for task in session.tasks:
+            task.cancel()
+        await asyncio.gather(*session.tasks, return_exceptions=True)
+        if session.utilization is not None:
+            session.utilization.stop()
+        if session.standby is not None:
+            await session.standby.close()
 
-        # Exponential backoff with offset
-        await asyncio.sleep(backoff_time)
-        backoff_time = min(
-            BACKOFF_MIN + (BACKOFF_INCREMENT * (2 ** (retries - 1))), BACKOFF_MAX
+
+async def _follow_endpoint(
+    uri: str, session: NodeSession, api_ping_job: ApiPingJob
+) -> None:
+    """
+    Moves what is bound to the endpoint over after the node switched endpoints.
+    """
+    if not config.GALADRIEL_API_DOMAIN:
+        api_ping_job.set_domain(_get_domain_from_url(uri))
+    # The standby connection is open to the previous endpoint
+    if session.standby is not None:
+        await session.standby.close()
+
+
+async def _run_connection(
+    uri: str,
+    headers: dict,
+    node_id: str,
+    api_ping_job: ApiPingJob,
+    session: NodeSession,
+) -> ConnectionResult:
+    """
+    Serves one connection, a failed connection is retried.
+    """
+    try:
+        return await _connect_and_process(uri, headers, node_id, api_ping_job, session)
+    except websockets.ConnectionClosedError as e:
+        logger.error(f"WebSocket connection closed: {e}. Retrying...")
+    except websockets.InvalidStatusCode as e:
+        logger.error(f"Invalid status code: {e}. Retrying...")
+    except Exception as _:
+        logger.error("Websocket connection failed.")
+        logger.error("Connection error", exc_info=True)
+    return ConnectionResult(retry=True, disconnect=DisconnectKind.FAILED)
+
+
+def _create_session(
+    endpoints: EndpointSelector, headers: dict, policy_name: str
+) -> NodeSession:
+    session = NodeSession(
+        reconnect_stats=ReconnectStats(policy=policy_name), endpoints=endpoints
+    )
+    # Streams outlive a single connection, so the resume buffers belong to the node
+    if config.GALADRIEL_STREAM_RESUMPTION:
+        headers[RESUMPTION_HEADER] = STREAM_RESUMPTION_PROTOCOL_VERSION
+        session.stream_resumer = StreamResumer()
+        session.tasks.append(asyncio.create_task(session.stream_resumer.run()))
+    if llm is not None:
+        # Reported to the server in pong responses
+        session.capacity = CapacityMonitor(llm, admission)
+        session.tasks.append(asyncio.create_task(session.capacity.run()))
+    if config.GALADRIEL_ENVIRONMENT != "local":
+        # Reported to the server in health check responses
+        session.utilization = UtilizationSampler(
+            config.GALADRIEL_UTILIZATION_SAMPLE_INTERVAL,
+            config.GALADRIEL_UTILIZATION_WINDOW,
         )
+        session.utilization.start()
+    if config.GALADRIEL_RECONNECT_STANDBY:
+        standby_headers = {**headers, STANDBY_HEADER: "true"}
+        session.standby = StandbyConnection(
+            lambda: _open_websocket(endpoints.current, standby_headers)
+        )
+    return session
+
+
+def _can_take_over(session: NodeSession, kind: DisconnectKind) -> bool:
+    """
+    An open standby connection takes over at once, unless the server asked the node
+    to back off.
+    """
+    return (
+        kind != DisconnectKind.THROTTLED
+        and session.standby is not None
+        and session.standby.is_ready()
+    )
+
+
+async def _connect(uri: str, headers: dict, node_id: str, session: NodeSession) -> Any:
+    """
+    Takes over the standby connection if there is one, otherwise connects.
+    """
+    websocket = None
+    if session.standby is not None:
+        websocket = await session.standby.take()
+    if websocket is not None:
+        logger.info("Took over the standby connection.")
+        await websocket.send(
+            codec.dumps(
+                {
+                    "protocol": STANDBY_PROTOCOL_NAME,
+                    "data": {
+                        "protocol_version": STANDBY_PROTOCOL_VERSION,
+                        "node_id": node_id,
+                        "promote": True,
+                    },
+                }
+            )
+        )
+    else:
+        websocket = await _open_websocket(uri, headers)
+    session.reconnect_stats.connected()
+    if session.standby is not None:
+        session.standby.prepare()
+    return websocket
+
+
+async def _open_websocket(uri: str, headers: dict) -> Any:
+    return await websockets.connect(
+        uri, extra_headers=headers, write_limit=config.GALADRIEL_WEBSOCKET_WRITE_LIMIT
+    )
 
 
-# pylint: disable=R0912, R0914
 async def _connect_and_process(
-    uri: str, headers: dict, node_id: str, api_ping_job: ApiPingJob
+    uri: str,
+    headers: dict,
+    node_id: str,
+    api_ping_job: ApiPingJob,
+    session: Optional[NodeSession] = None,
 ) -> ConnectionResult:
     """
     Establishes the WebSocket connection and processes incoming requests concurrently.
+
+    When the server asks for a reconnect the connection is handed over instead of
+    closed: it keeps draining its requests in the background while the caller
+    connects again right away.
     """
-    async with websockets.connect(uri, extra_headers=headers) as websocket:
-        # Initialize the protocol handler and register the protocols
-        protocol_handler = ProtocolHandler(node_id, websocket)
-        ping_pong_protocol = PingPongProtocol(api_ping_job)
+    session = session or NodeSession(reconnect_stats=ReconnectStats(policy=""))
+    websocket = await _connect(uri, headers, node_id, session)
+    # All outgoing messages of this connection go through a single writer
+    writer = WebsocketWriter(websocket)
+    writer.start()
+    # Initialize the protocol handler and register the protocols
+    protocol_handler = ProtocolHandler(node_id, writer)
+    ping_pong_protocol = PingPongProtocol(api_ping_job, session.capacity)
+    protocol_handler.register(
+        protocol_settings.PING_PONG_PROTOCOL_NAME, ping_pong_protocol
+    )
+    protocol_handler.register(
+        HealthCheckProtocol.PROTOCOL_NAME, HealthCheckProtocol(session.utilization)
+    )
+    # Inference requests of this connection, cancelled when it goes away
+    registry = InflightRegistry()
+    protocol_handler.register(
+        InferenceCancelProtocol.PROTOCOL_NAME, InferenceCancelProtocol(registry)
+    )
+    stream_resumer = session.stream_resumer
+    if not _is_resumption_accepted(websocket, stream_resumer):
+        stream_resumer = None
+    if stream_resumer is not None:
         protocol_handler.register(
-            protocol_settings.PING_PONG_PROTOCOL_NAME, ping_pong_protocol
+            StreamAckProtocol.PROTOCOL_NAME, StreamAckProtocol(stream_resumer)
         )
-        health_check_protocol = HealthCheckProtocol()
-        protocol_handler.register(
-            HealthCheckProtocol.PROTOCOL_NAME, health_check_protocol
+    connection = NodeConnection(
+        websocket=websocket,
+        writer=writer,
+        protocol_handler=protocol_handler,
+        ping_pong_protocol=ping_pong_protocol,
+        registry=registry,
+        coalescing_stats=_get_coalescing_stats(websocket),
+        stream_resumer=stream_resumer,
+    )
+    _register_request_handlers(connection)
+    handed_over = False
+    try:
+        if stream_resumer is not None:
+            await stream_resumer.connected(node_id, registry, writer)
+        result = await _handle_websocket_messages(connection, uri, session.endpoints)
+        if result.immediate:
+            handed_over = True
+            asyncio.create_task(_drain_connection(connection))
+        return result
+    finally:
+        if not handed_over:
+            await _close_connection(connection)
+
+
+@dataclass
+class NodeConnection:
+    websocket: Any
+    writer: WebsocketWriter
+    protocol_handler: ProtocolHandler
+    ping_pong_protocol: PingPongProtocol
+    registry: InflightRegistry
+    coalescing_stats: Optional[CoalescingStats] = None
+    stream_resumer: Optional[StreamResumer] = None
+    # Reads the connection for as long as it is open, also while it is draining
+    reader: Optional[asyncio.Task] = None
+
+
+async def _drain_connection(connection: NodeConnection) -> None:
+    """
+    Lets the requests of a replaced connection finish, then closes it. The connection
+    is still read meanwhile, so control messages are answered and requests the server
+    had already routed to it are served.
+    """
+    closed_watcher = asyncio.create_task(_release_when_closed(connection))
+    try:
+        await asyncio.wait_for(
+            connection.registry.drain(),
+            timeout=config.GALADRIEL_RECONNECT_DRAIN_TIMEOUT,
+        )
+        logger.info("Old connection drained, closing it.")
+    except asyncio.TimeoutError:
+        logger.info("Old connection did not drain in time, closing it.")
+    finally:
+        closed_watcher.cancel()
+        if connection.reader is not None:
+            connection.reader.cancel()
+        await _close_connection(connection)
+
+
+async def _release_when_closed(connection: NodeConnection) -> None:
+    if connection.reader is None:
+        return
+    await asyncio.gather(connection.reader, return_exceptions=True)
+    if not connection.websocket.open:
+        # Nothing can be sent anymore, so there is nothing left to drain
+        await _release_requests(connection)
+
+
+async def _release_requests(connection: NodeConnection) -> int:
+    """
+    Suspends the resumable requests of a lost connection and cancels the others.
+    """
+    if connection.stream_resumer is not None:
+        # Sends blocked on the lost connection fail, so the streams start buffering
+        await connection.writer.stop()
+        await connection.stream_resumer.disconnected(
+            connection.registry, connection.writer
         )
-        return await _handle_websocket_messages(
-            websocket, protocol_handler, ping_pong_protocol
+    return connection.registry.cancel_all("connection closed")
+
+
+async def _close_connection(connection: NodeConnection) -> None:
+    cancelled = await _release_requests(connection)
+    if cancelled:
+        logger.info(f"Cancelled {cancelled} requests of the closed connection")
+    await connection.registry.drain()
+    await connection.writer.stop()
+    await connection.websocket.close()
+    if connection.coalescing_stats is not None:
+        logger.info(
+            f"Chunk coalescing: {connection.coalescing_stats.chunks} chunks "
+            f"sent in {connection.coalescing_stats.frames} frames"
         )
 
 
+def _is_resumption_accepted(websocket, stream_resumer: Optional[StreamResumer]) -> bool:
+    """
+    Streams are only resumable when the server echoed the resumption header back.
+    """
+    if stream_resumer is None:
+        return False
+    response_headers = getattr(websocket, "response_headers", None)
+    if not response_headers or response_headers.get(RESUMPTION_HEADER) is None:
+        logger.info("Server does not support stream resumption")
+        return False
+    return True
+
+
+def _get_coalescing_stats(websocket) -> Optional[CoalescingStats]:
+    """
+    Coalescing is only used when the node asked for it and the server echoed the header back.
+    """
+    if config.GALADRIEL_CHUNK_COALESCING_WINDOW_MS <= 0:
+        return None
+    response_headers = getattr(websocket, "response_headers", None)
+    if not response_headers or response_headers.get(COALESCING_HEADER) is None:
+        logger.info("Server does not support chunk coalescing, sending every chunk")
+        return None
+    logger.info(
+        f"Chunk coalescing enabled, window: {config.GALADRIEL_CHUNK_COALESCING_WINDOW_MS}ms"
+    )
+    return CoalescingStats()
+
+
 async def _handle_websocket_messages(
-    websocket, protocol_handler, ping_pong_protocol
+    connection: NodeConnection,
+    uri: str = "",
+    endpoints: Optional[EndpointSelector] = None,
 ) -> ConnectionResult:
     """
-    Loops indefinitely, waiting for websocket messages
+    Reads the connection until it fails, or the server asks for a reconnect, or a
+    faster endpoint was found. The reader and the watchers live as long as the
+    connection, so no task is created per message. On a reconnect the reader keeps
+    running for the drain.
     :returns ConnectionResult, if connection needs to be reset/stopped
     """
-    reconnect_request_job = None
-    websocket_recv_job = None
+    logger.info("Waiting for incoming messages...")
+    connection.reader = asyncio.create_task(_read_messages(connection))
+    watchers = [asyncio.create_task(wait_for_reconnect(connection.ping_pong_protocol))]
+    if endpoints is not None:
+        watchers.append(asyncio.create_task(endpoints.wait_for_switch(uri)))
+    handed_over = False
+    try:
+        done, _ = await asyncio.wait(
+            [connection.reader, *watchers],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if connection.reader in done:
+            return connection.reader.result()
+        if watchers[0] in done:
+            logger.info("Reconnect requested.")
+            await connection.ping_pong_protocol.set_reconnect_requested(False)
+        logger.info(
+            "Connecting again while the "
+            f"{len(connection.registry)} requests in flight finish..."
+        )
+        handed_over = True
+        return ConnectionResult(retry=True, immediate=True)
+    finally:
+        for watcher in watchers:
+            watcher.cancel()
+        if not handed_over:
+            connection.reader.cancel()
+
 
-    send_lock = asyncio.Lock()
-    inference_status_counter = LockedCounter()
+async def _read_messages(connection: NodeConnection) -> ConnectionResult:
     while True:
         try:
-            logger.info("Waiting for incoming messages...")
-
-            # Create tasks for receiving messages and waiting for reconnect requests
-            reconnect_request_job = asyncio.create_task(
-                wait_for_reconnect(
-                    inference_status_counter,
-                    image_generation_engine,
-                    ping_pong_protocol,
-                )
-            )
-            websocket_recv_job = asyncio.create_task(websocket.recv())
-
-            # Wait for incoming messages or reconnect request
-            done, pending = await asyncio.wait(
-                [websocket_recv_job, reconnect_request_job],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
-
-            if reconnect_request_job in done:
-                logger.info("Reconnect requested. Closing the connection...")
-                await ping_pong_protocol.set_reconnect_requested(False)
-                return ConnectionResult(retry=True, reset_backoff=True)
-
-            if websocket_recv_job in done:
-                # Receive and parse incoming messages
-                data = await websocket_recv_job
-                parsed_data = json.loads(data)
-
-                # Check if the message is an inference request
-                inference_request = InferenceRequest.get_inference_request(parsed_data)
-                if inference_request is not None and llm is not None:
-                    asyncio.create_task(
-                        _process_request(
-                            inference_request,
-                            websocket,
-                            send_lock,
-                            inference_status_counter,
-                        )
-                    )
-                elif image_generation_engine is not None:
-                    image_request = validate_image_generation_request(data=parsed_data)
-                    if image_request is not None:
-                        asyncio.create_task(
-                            image_generation_engine.process_request(
-                                image_request, websocket, send_lock
-                            )
-                        )
-                    else:
-                        await protocol_handler.handle(parsed_data, send_lock)
-                else:
-                    await protocol_handler.handle(parsed_data, send_lock)
-        except json.JSONDecodeError:
+            data = await connection.websocket.recv()
+            parsed_data = codec.loads(data)
+            await connection.protocol_handler.dispatch(parsed_data)
+        except codec.DecodeError:
             logger.info("Error while parsing json message")
             return ConnectionResult(
-                retry=True, reset_backoff=True
+                retry=True, disconnect=DisconnectKind.FAILED
             )  # for now, just retry
         except websockets.ConnectionClosed as e:
             logger.info(f"Received error: {e}")
             match e.code:
-                case CloseCode.POLICY_VIOLATION:
-                    return ConnectionResult(retry=True, reset_backoff=False)
-                case CloseCode.TRY_AGAIN_LATER:
-                    return ConnectionResult(retry=True, reset_backoff=False)
+                case CloseCode.POLICY_VIOLATION | CloseCode.TRY_AGAIN_LATER:
+                    return ConnectionResult(
+                        retry=True, disconnect=DisconnectKind.THROTTLED
+                    )
             logger.info(f"Connection closed: {e}")
-            return ConnectionResult(retry=True, reset_backoff=True)
+            clean = isinstance(e, websockets.ConnectionClosedOK)
+            return ConnectionResult(
+                retry=True,
+                disconnect=DisconnectKind.CLEAN if clean else DisconnectKind.FAILED,
+            )
         except Exception as _:
             logger.error("Error occurred while processing message.", exc_info=True)
-            return ConnectionResult(retry=True, reset_backoff=True)
-        finally:
-            if reconnect_request_job:
-                reconnect_request_job.cancel()
-            if websocket_recv_job:
-                websocket_recv_job.cancel()
+            return ConnectionResult(retry=True, disconnect=DisconnectKind.FAILED)
+
+
+def _register_request_handlers(connection: NodeConnection) -> None:
+    """
+    Inference and image generation requests are served by the engine the node runs.
+    """
+    if llm is not None:
+        connection.protocol_handler.register_handler(
+            MessageKind.INFERENCE, partial(_start_inference, connection)
+        )
+    if image_generation_engine is not None:
+        connection.protocol_handler.register_handler(
+            MessageKind.IMAGE_GENERATION, partial(_start_image_generation, connection)
+        )
+
+
+async def _start_inference(connection: NodeConnection, parsed_data: Any) -> None:
+    inference_request = InferenceRequest.get_inference_request(parsed_data)
+    if inference_request is None:
+        logger.error("Received an invalid inference request")
+        return
+    ticket = None
+    if admission is not None:
+        ticket = admission.admit()
+        if ticket is None:
+            await _reject_request(connection.writer, inference_request.id)
+            return
+    request = connection.registry.start(
+        inference_request.id,
+        _process_request(
+            inference_request,
+            connection.writer,
+            connection.registry,
+            connection.coalescing_stats,
+            connection.stream_resumer,
+            ticket,
+        ),
+    )
+    if ticket is not None:
+        # Also releases the ticket of a request cancelled before it started
+        release = ticket.release
+        request.task.add_done_callback(lambda _: release())
+
+
+async def _reject_request(writer: WebsocketWriter, request_id: str) -> None:
+    """
+    Tells the server right away that the node is at capacity, so it can route the
+    request to another node.
+    """
+    logger.info(f"Rejecting request {request_id}, the node is at capacity")
+    response = InferenceResponse(
+        request_id=request_id,
+        status=InferenceStatusCodes.ERROR,
+        error=InferenceError(
+            status_code=InferenceErrorStatusCodes.RATE_LIMIT,
+            message="Node is at capacity",
+        ),
+    )
+    await writer.send(response.to_json(), MessagePriority.CONTROL)
+
+
+async def _start_image_generation(connection: NodeConnection, parsed_data: Any) -> None:
+    image_request = validate_image_generation_request(data=parsed_data)
+    if image_request is None or image_generation_engine is None:
+        logger.error("Received an invalid image generation request")
+        return
+    connection.registry.start(
+        image_request.request_id,
+        image_generation_engine.process_request(image_request, connection.writer),
+    )
+
+
+async def _start_local_llm(model_id: str) -> List[vllm.VllmProcess]:
+    """
+    Starts vLLM on this machine and returns the started servers.
+    """
+    processes: List[vllm.VllmProcess] = []
+    if config.GALADRIEL_VLLM_DETACHED:
+        processes = await _run_llm_detached(model_id)
+    elif config.GALADRIEL_VLLM_DATA_PARALLEL:
+        processes = await _run_llm_data_parallel(model_id)
+    else:
+        llm_pid = await _run_llm(model_id)
+        if llm_pid is not None:
+            processes = [
+                vllm.VllmProcess(
+                    pid=llm_pid, port=vllm.VLLM_PORT, log_file=vllm.LOG_FILE
+                )
+            ]
+    # Detached servers outlive the node, they are left running on termination
+    owned_processes = [] if config.GALADRIEL_VLLM_DETACHED else processes
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: _handle_termination(loop, owned_processes))
+    return processes
 
 
 async def _run_llm(model_id: str) -> Optional[int]:
@@ -278,42 +792,82 @@ async def _run_llm(model_id: str) -> Optional[int]:
                 'Failed to start vLLM. Please check "vllm.log" for more information.'
             )
         logger.info("vLLM started successfully.")
-        logger.info("Waiting for vLLM to be ready.")
-        while True:
-            if not vllm.is_process_running(pid):
-                raise SdkError(
-                    f"vLLM process (PID: {pid}) died unexpectedly. Please check 'vllm.log'."
-                )
-            rich.print(".", flush=True, end="")
-            try:
-                response = await llm_http_check.execute(
-                    vllm.LLM_BASE_URL, total_timeout=1.0
-                )
-                if response.ok:
-                    logging.info("\nvLLM is ready.")
-                    break
-            except Exception:
-                continue
-            finally:
-                await asyncio.sleep(1.0)
-        result = await check_llm.execute(vllm.LLM_BASE_URL, model_id)
-        if not result:
-            raise SdkError(
-                'LLM check failed. Please check "vllm.log" for more details.'
-            )
+        await wait_for_vllm(
+            vllm.VllmProcess(pid=pid, port=vllm.VLLM_PORT, log_file=vllm.LOG_FILE),
+            model_id,
+        )
         return pid
     raise SdkError(
         "vLLM is not installed, please set GALADRIEL_LLM_BASE_URL in ~/.galadrielenv"
     )
 
 
-def _handle_termination(loop, llm_pid):
+async def _run_llm_data_parallel(model_id: str) -> List[vllm.VllmProcess]:
+    """
+    Starts one vLLM per GPU and waits for all of them in parallel.
+    """
+    if not vllm.is_installed():
+        raise SdkError(
+            "vLLM is not installed, please set GALADRIEL_LLM_BASE_URL in ~/.galadrielenv"
+        )
+    logger.info("Starting one vLLM per GPU...")
+    processes = vllm.start_data_parallel(model_id)
+    if not processes:
+        raise SdkError(
+            'Failed to start vLLM. Please check "vllm-*.log" for more information.'
+        )
+    logger.info(f"Started {len(processes)} vLLM processes successfully.")
+    try:
+        await asyncio.gather(
+            *[wait_for_vllm(process, model_id) for process in processes]
+        )
+    except BaseException:
+        for process in processes:
+            vllm.stop(process.pid)
+        raise
+    return processes
+
+
+async def _run_llm_detached(model_id: str) -> List[vllm.VllmProcess]:
+    """
+    Reattaches to a compatible vLLM left running by a previous node run,
+    or starts a new one that keeps running after the node stops.
+    """
+    if not vllm.is_installed():
+        raise SdkError(
+            "vLLM is not installed, please set GALADRIEL_LLM_BASE_URL in ~/.galadrielenv"
+        )
+    processes, reattached = vllm_detached.start(
+        model_id, config.GALADRIEL_VLLM_DATA_PARALLEL, config.GALADRIEL_VLLM_STATE_FILE
+    )
+    if not processes:
+        raise SdkError(
+            'Failed to start vLLM. Please check "vllm*.log" for more information.'
+        )
+    if reattached:
+        pids = ", ".join(str(process.pid) for process in processes)
+        logger.info(f"Reattached to running vLLM (PID: {pids}).")
+    else:
+        logger.info(f"Started {len(processes)} detached vLLM processes successfully.")
+    try:
+        await asyncio.gather(
+            *[wait_for_vllm(process, model_id) for process in processes]
+        )
+    except BaseException:
+        for process in processes:
+            vllm.stop(process.pid)
+        raise
+    return processes
+
+
+def _handle_termination(loop, llm_processes: List[vllm.VllmProcess]):
     for task in asyncio.all_tasks(loop):
         task.cancel()
 
-    if llm_pid is not None:
-        vllm.stop(llm_pid)
-        logger.info(f"vLLM process with PID {llm_pid} has been stopped.")
+    # The supervisor may have restarted a process, so its current PID is read here
+    for process in llm_processes:
+        vllm.stop(process.pid)
+        logger.info(f"vLLM process with PID {process.pid} has been stopped.")
 
 
 def _get_domain_from_url(url: str) -> str:
@@ -323,9 +877,11 @@ def _get_domain_from_url(url: str) -> str:
 
 async def _process_request(
     request: InferenceRequest,
-    websocket,
-    send_lock: asyncio.Lock,
-    inference_status_counter: LockedCounter,
+    writer: WebsocketWriter,
+    registry: Optional[InflightRegistry] = None,
+    coalescing_stats: Optional[CoalescingStats] = None,
+    stream_resumer: Optional[StreamResumer] = None,
+    ticket: Optional[AdmissionTicket] = None,
 ) -> None:
     """
     Handles a single inference request and sends the response back in chunks.
@@ -333,17 +889,71 @@ async def _process_request(
     if llm is None:
         logger.error("LLM is not initialized.")
         return
+    latency = await ticket.wait() if ticket is not None else StreamLatency()
+    stream = None
+    if stream_resumer is not None:
+        # Resumable streams buffer every chunk, they are not coalesced
+        stream = stream_resumer.open(request.id, writer)
+    coalescer = None
+    if coalescing_stats is not None and stream is None:
+        coalescer = ChunkCoalescer(
+            writer,
+            config.GALADRIEL_CHUNK_COALESCING_WINDOW_MS / 1000,
+            config.GALADRIEL_CHUNK_COALESCING_MAX_BYTES,
+            coalescing_stats,
+        )
     try:
-        await inference_status_counter.increment()
         logging.debug(f"REQUEST {request.id} START")
-        async for chunk in llm.execute(request):
-            logging.debug(f"Sending chunk: {chunk}")
-            async with send_lock:
-                await websocket.send(chunk.to_json())
-            logging.debug(f"REQUEST {request.id} END")
+        # The stream is closed right away when the request is cancelled mid-send,
+        # so the backend aborts the sequence
+        async with aclosing(llm.execute(request)) as chunks:
+            async for chunk in chunks:
+                logging.debug(f"Sending chunk: {chunk}")
+                latency.chunk_received(chunk)
+                message = await _send_chunk(chunk, writer, coalescer, stream)
+                if registry is not None:
+                    registry.record_chunk(request.id, len(message))
+        if coalescer is not None:
+            await coalescer.close()
+        if ticket is not None:
+            ticket.record(latency)
+        logging.debug(f"REQUEST {request.id} END")
+    except asyncio.CancelledError:
+        logging.debug(f"REQUEST {request.id} CANCELLED")
+        if coalescer is not None:
+            coalescer.discard()
+        if stream_resumer is not None:
+            stream_resumer.discard(request.id)
+        raise
     except Exception as _:
         logging.error(
             "Error occurred while processing inference request", exc_info=True
         )
     finally:
-        await inference_status_counter.decrement()
+        if stream_resumer is not None:
+            stream_resumer.finish(request.id)
+
+
+async def _send_chunk(
+    chunk: InferenceResponse,
+    writer: WebsocketWriter,
+    coalescer: Optional[ChunkCoalescer],
+    stream: Optional[ResumableStream],
+) -> str:
+    """
+    Sends a single chunk and returns it encoded.
+    """
+    if stream is not None:
+        return await stream.send(chunk)
+    message = chunk.to_json()
+    # A lost final chunk leaves the request hanging on the server, so its write is
+    # awaited and a failure is raised to the request
+    is_final = chunk.status != InferenceStatusCodes.RUNNING
+    if coalescer is None:
+        await writer.send(message, wait=is_final)
+        return message
+    await coalescer.add(message)
+    if is_final:
+        # The final chunk must not wait for the window
+        await coalescer.flush(wait=True)
+    return message
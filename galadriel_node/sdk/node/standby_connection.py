@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Optional
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+# Sent by the node on the standby connection, the server does not route requests to
+# it until the node sends the standby promote message
+STANDBY_HEADER = "Standby"
+STANDBY_PROTOCOL_NAME = "standby"
+STANDBY_PROTOCOL_VERSION = "1.0"
+
+logger = get_node_logger()
+
+
+class StandbyConnection:
+    """
+    Keeps a second websocket connection open next to the active one, so a lost
+    connection is replaced without waiting for a new handshake.
+    """
+
+    def __init__(self, connect: Callable[[], Coroutine[Any, Any, Any]]):
+        self._connect = connect
+        self._task: Optional[asyncio.Task] = None
+
+    def prepare(self) -> None:
+        """
+        Starts opening the standby connection in the background.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._connect())
+
+    def is_ready(self) -> bool:
+        task = self._task
+        if task is None or not task.done() or task.cancelled():
+            return False
+        return task.exception() is None and task.result().open
+
+    async def take(self) -> Optional[Any]:
+        """
+        Returns the standby websocket once it is open, or None if it failed or was
+        closed meanwhile. The next standby has to be prepared again.
+        """
+        task, self._task = self._task, None
+        if task is None:
+            return None
+        try:
+            websocket = await task
+        except Exception as e:
+            logger.info(f"Standby connection failed: {e}")
+            return None
+        if not websocket.open:
+            return None
+        return websocket
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        results = await asyncio.gather(task, return_exceptions=True)
+        if not isinstance(results[0], BaseException):
+            await results[0].close()
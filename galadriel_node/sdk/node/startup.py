@@ -0,0 +1,83 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+TIMELINE_WIDTH = 30  # Width of the timeline bars in characters
+
+T = TypeVar("T")
+
+logger = get_node_logger()
+
+
+@dataclass
+class StartupPhase:
+    name: str
+    start: float  # Seconds since the startup began
+    end: Optional[float] = None
+    failed: bool = False
+
+    @property
+    def duration(self) -> float:
+        return (self.end or self.start) - self.start
+
+
+class StartupTimeline:
+    """
+    Records when each startup phase began and ended, so the node can show where the
+    time to the first served request goes.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.phases: List[StartupPhase] = []
+
+    async def phase(self, name: str, awaitable: Awaitable[T]) -> T:
+        phase = StartupPhase(name=name, start=self._elapsed())
+        self.phases.append(phase)
+        try:
+            return await awaitable
+        except BaseException:
+            phase.failed = True
+            raise
+        finally:
+            phase.end = self._elapsed()
+
+    def render(self) -> str:
+        total = max((phase.end or 0.0 for phase in self.phases), default=0.0)
+        scale = TIMELINE_WIDTH / total if total else 0.0
+        name_width = max((len(phase.name) for phase in self.phases), default=0)
+        lines = [f"Startup timeline ({total:.1f}s):"]
+        for phase in self.phases:
+            offset = int(phase.start * scale)
+            length = max(1, int(phase.duration * scale))
+            timeline_bar = (" " * offset + "█" * length).ljust(TIMELINE_WIDTH)
+            status = " failed" if phase.failed else ""
+            lines.append(
+                f"  {phase.name.ljust(name_width)} {phase.start:6.1f}s "
+                f"|{timeline_bar}| {phase.duration:.1f}s{status}"
+            )
+        return "\n".join(lines)
+
+    def log(self) -> None:
+        logger.info(self.render())
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+async def run_concurrently(*awaitables: Awaitable) -> None:
+    """
+    Runs independent startup phases at the same time and waits for all of them, so a
+    failure does not abandon another phase halfway, e.g. vLLM loading the model.
+    The failure of the earliest phase in argument order is raised.
+    """
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
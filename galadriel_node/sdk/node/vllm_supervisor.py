@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import List
+from typing import Optional
+
+from galadriel_node.config import config
+from galadriel_node.llm_backends import vllm
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.llm_router import LlmRouter
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.node import check_llm
+from galadriel_node.sdk.node.checks import llm_http_check
+
+RESTART_BACKOFF_MIN = 5  # Minimum time between restart attempts in seconds
+RESTART_BACKOFF_MAX = 300  # Maximum time between restart attempts in seconds
+WAIT_POLL_INTERVAL = 1.0  # Time between readiness probes in seconds
+WAIT_LOG_INTERVAL = 30  # Time between "still waiting" logs in seconds
+
+logger = get_node_logger()
+
+
+# pylint: disable=too-few-public-methods
+class VllmSupervisor:
+    """
+    Watches locally started vLLM servers and restarts them when the process dies or
+    stops answering on /v1/models.
+
+    While a server is restarting it is ejected from the LlmRouter, so new requests
+    get a fast error instead of waiting on a dead backend. It is readmitted once
+    check_llm passes again. The Galadriel websocket connection is left alone.
+    """
+
+    def __init__(
+        self,
+        processes: List[vllm.VllmProcess],
+        model_id: str,
+        router: LlmRouter,
+        check_interval: float = config.GALADRIEL_VLLM_SUPERVISOR_INTERVAL,
+        max_failed_probes: int = config.GALADRIEL_VLLM_SUPERVISOR_MAX_FAILED_PROBES,
+        restart_timeout: float = config.GALADRIEL_VLLM_RESTART_TIMEOUT,
+    ):
+        self.processes = processes
+        self.model_id = model_id
+        self.router = router
+        self.check_interval = check_interval
+        self.max_failed_probes = max_failed_probes
+        self.restart_timeout = restart_timeout
+        self.restarts = 0
+
+    async def run(self) -> None:
+        await asyncio.gather(*[self._supervise(process) for process in self.processes])
+
+    async def _supervise(self, process: vllm.VllmProcess) -> None:
+        failed_probes = 0
+        while True:
+            await asyncio.sleep(self.check_interval)
+            if not vllm.is_process_running(process.pid):
+                logger.error(
+                    f"vLLM process (PID: {process.pid}) died, restarting it. "
+                    f"Please check '{process.log_file}'."
+                )
+            elif await self._probe(process):
+                failed_probes = 0
+                continue
+            else:
+                failed_probes += 1
+                if failed_probes < self.max_failed_probes:
+                    continue
+                logger.error(
+                    f"vLLM at {process.base_url} failed {failed_probes} health probes, "
+                    "restarting it."
+                )
+            failed_probes = 0
+            self.router.set_healthy(process.base_url, False)
+            await self._restart(process)
+            self.restarts += 1
+            self.router.set_healthy(process.base_url, True)
+
+    async def _probe(self, process: vllm.VllmProcess) -> bool:
+        try:
+            response = await llm_http_check.execute(
+                process.base_url,
+                total_timeout=config.GALADRIEL_LLM_HEALTH_CHECK_TIMEOUT,
+            )
+            return response.ok
+        except Exception:
+            return False
+
+    async def _restart(self, process: vllm.VllmProcess) -> None:
+        backoff_time = RESTART_BACKOFF_MIN
+        while True:
+            vllm.stop(process.pid)
+            pid = vllm.respawn(process, self.model_id)
+            if pid is not None:
+                process.pid = pid
+                try:
+                    await wait_for_vllm(
+                        process, self.model_id, timeout=self.restart_timeout
+                    )
+                    logger.info(f"vLLM at {process.base_url} restarted (PID: {pid}).")
+                    return
+                except SdkError as e:
+                    logger.error(str(e))
+            logger.info(f"Retrying to restart vLLM in {backoff_time} seconds...")
+            await asyncio.sleep(backoff_time)
+            backoff_time = min(backoff_time * 2, RESTART_BACKOFF_MAX)
+
+
+async def wait_for_vllm(
+    process: vllm.VllmProcess, model_id: str, timeout: Optional[float] = None
+) -> None:
+    """
+    Waits until the vLLM server answers and passes the LLM check. Raises an SdkError
+    once `timeout` seconds have passed, without a timeout it waits as long as the
+    process runs, e.g. while the model is downloaded on the first start.
+    """
+    logger.info(f"Waiting for vLLM at {process.base_url} to be ready.")
+    started_at = last_logged_at = time.monotonic()
+    while True:
+        if not vllm.is_process_running(process.pid):
+            raise SdkError(
+                f"vLLM process (PID: {process.pid}) died unexpectedly. "
+                f"Please check '{process.log_file}'."
+            )
+        now = time.monotonic()
+        if timeout is not None and now - started_at > timeout:
+            raise SdkError(
+                f"vLLM at {process.base_url} (PID: {process.pid}) was not ready "
+                f"after {timeout:.0f} seconds. Please check '{process.log_file}'."
+            )
+        if now - last_logged_at >= WAIT_LOG_INTERVAL:
+            last_logged_at = now
+            logger.info(
+                f"Still waiting for vLLM at {process.base_url} "
+                f"({now - started_at:.0f}s)."
+            )
+        try:
+            response = await llm_http_check.execute(process.base_url, total_timeout=1.0)
+            if response.ok:
+                logger.info(f"vLLM at {process.base_url} is ready.")
+                break
+        except Exception:
+            continue
+        finally:
+            await asyncio.sleep(WAIT_POLL_INTERVAL)
+    result = await check_llm.execute(process.base_url, model_id)
+    if not result:
+        raise SdkError(
+            f'LLM check failed. Please check "{process.log_file}" for more details.'
+        )
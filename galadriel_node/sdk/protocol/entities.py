@@ -1,4 +1,3 @@
-import json
 from enum import Enum
 from typing import List, Dict, Optional
 from dataclasses import dataclass
@@ -9,6 +8,8 @@ from pydantic import Field
 from dataclasses_json import dataclass_json
 from openai.types.chat import ChatCompletionChunk
 
+from galadriel_node.sdk import codec
+
 
 # TODO: Move these common protocol stuff into a shared library
 class PingPongMessageType(Enum):
@@ -33,6 +34,21 @@ class PingRequest(BaseModel):
     )
 
 
+class NodeCapacity(BaseModel):
+    in_flight: int = Field(description="Inference streams running on the LLM backends")
+    queued: int = Field(description="Inference requests waiting for admission")
+    tokens_per_second: float = Field(
+        description="Tokens streamed per second over the last seconds"
+    )
+    kv_cache_usage: Optional[float] = Field(
+        default=None,
+        description="Highest KV cache usage of the LLM backends, between 0 and 1",
+    )
+    admission_limit: Optional[int] = Field(
+        default=None, description="Inference streams admitted at once"
+    )
+
+
 class PongResponse(BaseModel):
     protocol_version: str = Field(
         description="Protocol version of the ping-pong protocol"
@@ -43,6 +59,9 @@ class PongResponse(BaseModel):
     api_ping_time: List[Optional[int]] = Field(
         description="Ping time to Galadriel API in milliseconds"
     )
+    capacity: Optional[NodeCapacity] = Field(
+        default=None, description="Load of the node, since protocol version 1.1"
+    )
 
 
 class NodeReconnectRequest(BaseModel):
@@ -97,6 +116,23 @@ class HealthCheckResponse(BaseModel):
     gpus: List[HealthCheckGPUUtilization] = Field(description="GPU utilization")
 
 
+class InferenceCancelRequest(BaseModel):
+    protocol_version: str = Field(
+        description="Protocol version of the inference-cancel protocol"
+    )
+    node_id: str = Field(description="Node ID")
+    request_id: str = Field(description="ID of the inference request to cancel")
+
+
+class StreamAckRequest(BaseModel):
+    protocol_version: str = Field(
+        description="Protocol version of the stream-ack protocol"
+    )
+    node_id: str = Field(description="Node ID")
+    request_id: str = Field(description="ID of the streamed inference request")
+    seq: int = Field(description="Highest chunk sequence number received in order")
+
+
 class InferenceStatusCodes(Enum):
     RUNNING = 1
     DONE = 2
@@ -158,16 +194,31 @@ class InferenceResponse:
     status: Optional[InferenceStatusCodes] = None
     chunk: Optional[ChatCompletionChunk] = None
     error: Optional[InferenceError] = None
+    # Chunk JSON exactly as received from the LLM backend, used instead of `chunk`
+    # in SSE passthrough mode
+    raw_chunk: Optional[str] = None
+    # Position of the chunk in its stream, only set when stream resumption is enabled
+    seq: Optional[int] = None
 
     def to_json(self):
-        return json.dumps(
-            {
-                "request_id": self.request_id,
-                "error": self.error.to_dict() if self.error else None,
-                "chunk": self.chunk.to_dict() if self.chunk else None,
-                "status": self.status.value if self.status else None,
-            }
-        )
+        if self.raw_chunk is not None:
+            # Splice the raw chunk into the envelope instead of decoding it
+            seq = f', "seq": {self.seq}' if self.seq is not None else ""
+            return (
+                f'{{"request_id": {codec.dumps(self.request_id)}, '
+                f'"error": {codec.dumps(self.error.to_dict() if self.error else None)}, '
+                f'"chunk": {self.raw_chunk}, '
+                f'"status": {codec.dumps(self.status.value if self.status else None)}{seq}}}'
+            )
+        message = {
+            "request_id": self.request_id,
+            "error": self.error.to_dict() if self.error else None,
+            "chunk": self.chunk.to_dict() if self.chunk else None,
+            "status": self.status.value if self.status else None,
+        }
+        if self.seq is not None:
+            message["seq"] = self.seq
+        return codec.dumps(message)
 
 
 class ImageGenerationWebsocketRequest(BaseModel):
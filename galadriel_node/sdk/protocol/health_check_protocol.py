@@ -1,10 +1,10 @@
-import json
+import asyncio
 from typing import Any
 from typing import List
-
-from fastapi.encoders import jsonable_encoder
+from typing import Optional
 
 from galadriel_node.config import config
+from galadriel_node.sdk import codec
 from galadriel_node.sdk.protocol.entities import (
     HealthCheckRequest,
     HealthCheckResponse,
@@ -14,6 +14,7 @@ from galadriel_node.sdk.protocol.entities import (
 from galadriel_node.sdk.system import report_utilization
 from galadriel_node.sdk.system.entities import NodeUtilization
 from galadriel_node.sdk.system.report_hardware import logger
+from galadriel_node.sdk.system.utilization_sampler import UtilizationSampler
 
 
 # pylint: disable=too-few-public-methods,
@@ -21,7 +22,8 @@ class HealthCheckProtocol:
     PROTOCOL_NAME = "health-check"
     PROTOCOL_VERSION = "1.0"
 
-    def __init__(self):
+    def __init__(self, sampler: Optional[UtilizationSampler] = None):
+        self.sampler = sampler
         logger.info(f"{self.PROTOCOL_NAME}: Protocol initialized")
 
     async def handle(self, data: Any, my_node_id: str) -> str | None:
@@ -44,6 +46,8 @@ class HealthCheckProtocol:
                 disk_percent=50,
                 gpus=[],
             )
+        elif self.sampler is not None:
+            utilization = await _get_sampled_utilization(self.sampler)
         else:
             utilization = await report_utilization.execute()
         gpus = _convert_gpu_stats(utilization)
@@ -57,8 +61,8 @@ class HealthCheckProtocol:
             gpus=gpus,
         )
 
-        data = jsonable_encoder(health_check_response)
-        response_message = json.dumps({"protocol": self.PROTOCOL_NAME, "data": data})
+        data = health_check_response.model_dump(mode="json")
+        response_message = codec.dumps({"protocol": self.PROTOCOL_NAME, "data": data})
         logger.debug(
             f"{self.PROTOCOL_NAME}: Sent health check response, nonce: {health_check_response.nonce}"
         )
@@ -92,6 +96,14 @@ def _protocol_validations(
     return True
 
 
+async def _get_sampled_utilization(sampler: UtilizationSampler) -> NodeUtilization:
+    utilization = sampler.average()
+    if utilization is None:
+        # Only a health check before the sampler's first sample waits for one
+        utilization = await asyncio.to_thread(sampler.sample)
+    return utilization
+
+
 def _convert_gpu_stats(utilization: NodeUtilization) -> List[HealthCheckGPUUtilization]:
     return [
         HealthCheckGPUUtilization(
@@ -0,0 +1,45 @@
+from typing import Any
+
+from galadriel_node.sdk.inflight_registry import InflightRegistry
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.protocol.entities import InferenceCancelRequest
+
+logger = get_node_logger()
+
+
+# pylint: disable=too-few-public-methods,
+class InferenceCancelProtocol:
+    """
+    Lets the server cancel an inference request whose client went away.
+    """
+
+    PROTOCOL_NAME = "inference-cancel"
+    PROTOCOL_VERSION = "1.0"
+
+    def __init__(self, registry: InflightRegistry):
+        self.registry = registry
+        logger.info(f"{self.PROTOCOL_NAME}: Protocol initialized")
+
+    async def handle(self, data: Any, my_node_id: str) -> str | None:
+        try:
+            request = InferenceCancelRequest(**data)
+        except Exception:
+            logger.error(f"{self.PROTOCOL_NAME}: Invalid data received: {data}")
+            return None
+        if request.node_id != my_node_id:
+            logger.debug(
+                f"{self.PROTOCOL_NAME}: "
+                f"Ignoring cancel request received for unexpected node {request.node_id}"
+            )
+            return None
+        if request.protocol_version != self.PROTOCOL_VERSION:
+            logger.debug(
+                f"{self.PROTOCOL_NAME}: "
+                f"Received cancel request with invalid protocol version {request.protocol_version}"
+            )
+            return None
+        if not self.registry.cancel(request.request_id, "cancelled by the server"):
+            logger.debug(
+                f"{self.PROTOCOL_NAME}: Request {request.request_id} is not in flight"
+            )
+        return None
@@ -1,9 +1,8 @@
 import asyncio
-import json
 from typing import Any, Optional
 
-from fastapi.encoders import jsonable_encoder
-
+from galadriel_node.sdk import codec
+from galadriel_node.sdk.capacity import CapacityMonitor
 from galadriel_node.sdk.jobs.api_ping_job import ApiPingJob
 from galadriel_node.sdk.logging_utils import get_node_logger
 from galadriel_node.sdk.protocol import protocol_settings
@@ -20,31 +19,27 @@ logger = get_node_logger()
 # pylint: disable=too-few-public-methods,
 class PingPongProtocol:
 
-    def __init__(self, api_ping_job: ApiPingJob):
+    def __init__(
+        self,
+        api_ping_job: ApiPingJob,
+        capacity: Optional[CapacityMonitor] = None,
+    ):
         self.rtt = 0
         self.ping_streak = 0
         self.miss_streak = 0
         self.api_ping_job = api_ping_job
-        self.reconnect_requested = False
-        self._lock = asyncio.Lock()
+        # Awaited by the connection, so a reconnect request is handled right away
+        self._reconnect_requested = asyncio.Event()
+        self.capacity = capacity
         logger.info(
             f"{protocol_settings.PING_PONG_PROTOCOL_NAME}: Protocol initialized"
         )
 
     # Handle the responses from the client
     async def handle(self, data: Any, my_node_id: str) -> str | None:
-        node_reconnect_request = _validate_reconnect_request(data)
-        if (
-            node_reconnect_request
-            and node_reconnect_request.message_type
-            == PingPongMessageType.RECONNECT_REQUEST
-            and node_reconnect_request.reconnect_request
-        ):
-            logger.info(
-                f"{protocol_settings.PING_PONG_PROTOCOL_NAME}: Received reconnect request. "
-                "There is a more performing server found. Trying to connect to this server."
-            )
-            await self.set_reconnect_requested(node_reconnect_request.reconnect_request)
+        # The message type tells the messages apart, so each one is validated once
+        if data.get("message_type") == PingPongMessageType.RECONNECT_REQUEST.value:
+            await self._handle_reconnect_request(data)
             return None
 
         # TODO: we should replace these mess with direct pydantic model objects once the
@@ -73,18 +68,28 @@ class PingPongProtocol:
 
         api_ping_time = await self.api_ping_job.get_and_clear_ping_time()
 
-        # Construct the pong response
+        # Construct the pong response, in the version of the ping
         pong_response = PongResponse(
-            protocol_version=protocol_settings.PING_PONG_PROTOCOL_VERSION,
+            protocol_version=ping_request.protocol_version,
             message_type=PingPongMessageType.PONG,
             node_id=ping_request.node_id,  # use the received node_id
             nonce=ping_request.nonce,  # use the received nonce
             api_ping_time=api_ping_time,
         )
+        if (
+            self.capacity is not None
+            and ping_request.protocol_version
+            == protocol_settings.PING_PONG_PROTOCOL_VERSION
+        ):
+            # The snapshot is refreshed in the background, reading it does not wait
+            pong_response.capacity = self.capacity.snapshot
 
         # Send it to the server
-        data = jsonable_encoder(pong_response)
-        pong_message = json.dumps(
+        data = pong_response.model_dump(
+            mode="json",
+            exclude={"capacity"} if pong_response.capacity is None else None,
+        )
+        pong_message = codec.dumps(
             {"protocol": protocol_settings.PING_PONG_PROTOCOL_NAME, "data": data}
         )
         logger.info(
@@ -96,13 +101,33 @@ class PingPongProtocol:
         )
         return pong_message
 
+    async def _handle_reconnect_request(self, data: Any) -> None:
+        node_reconnect_request = _validate_reconnect_request(data)
+        if (
+            node_reconnect_request is None
+            or not node_reconnect_request.reconnect_request
+        ):
+            logger.info(
+                f"{protocol_settings.PING_PONG_PROTOCOL_NAME}: Invalid data received: {data}"
+            )
+            return
+        logger.info(
+            f"{protocol_settings.PING_PONG_PROTOCOL_NAME}: Received reconnect request. "
+            "There is a more performing server found. Trying to connect to this server."
+        )
+        await self.set_reconnect_requested(node_reconnect_request.reconnect_request)
+
     async def set_reconnect_requested(self, reconnect_requested: bool):
-        async with self._lock:
-            self.reconnect_requested = reconnect_requested
+        if reconnect_requested:
+            self._reconnect_requested.set()
+        else:
+            self._reconnect_requested.clear()
+
+    async def wait_for_reconnect_request(self) -> None:
+        await self._reconnect_requested.wait()
 
     async def get_reconnect_requested(self) -> bool:
-        async with self._lock:
-            return self.reconnect_requested
+        return self._reconnect_requested.is_set()
 
 
 def _protocol_validations(my_node_id: str, ping_request: PingRequest) -> bool:
@@ -124,7 +149,10 @@ def _protocol_validations(my_node_id: str, ping_request: PingRequest) -> bool:
         return False
 
     # 3 - check the version compatibility
-    if ping_request.protocol_version != protocol_settings.PING_PONG_PROTOCOL_VERSION:
+    if (
+        ping_request.protocol_version
+        not in protocol_settings.PING_PONG_SUPPORTED_VERSIONS
+    ):
         logger.info(
             f"{protocol_settings.PING_PONG_PROTOCOL_NAME}: "
             f"Received ping with invalid protocol version from node {ping_request.node_id}"
@@ -149,7 +177,7 @@ def _extract_and_validate_ping_request(data: Any) -> PingRequest | None:
     message_type = data.get("message_type")
     try:
         ping_request.message_type = PingPongMessageType(message_type)
-    except KeyError:
+    except ValueError:
         return None
     ping_request.node_id = data.get("node_id")
     ping_request.nonce = data.get("nonce")
@@ -1,19 +1,67 @@
-import asyncio
 import time
+from enum import Enum
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
 
 from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.websocket_writer import MessagePriority
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
 
 logger = get_node_logger()
 
 
+class MessageKind(Enum):
+    PROTOCOL = "protocol"
+    INFERENCE = "inference"
+    IMAGE_GENERATION = "image_generation"
+    UNKNOWN = "unknown"
+
+
+MessageHandler = Callable[[Any], Awaitable[None]]
+
+
+def classify(parsed_data: Any) -> MessageKind:
+    """
+    Tells the inbound messages apart by their discriminating keys in one pass.
+    """
+    if not isinstance(parsed_data, dict):
+        return MessageKind.UNKNOWN
+    if "protocol" in parsed_data:
+        return MessageKind.PROTOCOL
+    if "chat_request" in parsed_data:
+        return MessageKind.INFERENCE
+    if "prompt" in parsed_data:
+        return MessageKind.IMAGE_GENERATION
+    return MessageKind.UNKNOWN
+
+
 # Handler for all the protocols
 class ProtocolHandler:
-    def __init__(self, node_id: str, websocket: Any):
+    def __init__(self, node_id: str, writer: WebsocketWriter):
         self.node_id = node_id
-        self.websocket = websocket
+        self.writer = writer
         self.protocols: Dict[str, Any] = {}
+        self.handlers: Dict[MessageKind, MessageHandler] = {}
+
+    def register_handler(self, kind: MessageKind, handler: MessageHandler):
+        """
+        Registers the handler of the messages that are not part of a protocol,
+        e.g. inference requests.
+        """
+        self.handlers[kind] = handler
+
+    async def dispatch(self, parsed_data: Any):
+        kind = classify(parsed_data)
+        if kind == MessageKind.PROTOCOL:
+            await self.handle(parsed_data)
+            return
+        handler = self.handlers.get(kind)
+        if handler is None:
+            logger.error(f"protocol_handler: No handler for {kind.value} message")
+            return
+        await handler(parsed_data)
 
     def register(self, protocol_name: str, protocol: Any):
         self.protocols[protocol_name] = protocol
@@ -25,7 +73,7 @@ class ProtocolHandler:
     def get(self, protocol_name: str) -> Any:
         return self.protocols.get(protocol_name)
 
-    async def handle(self, parsed_data: Any, send_lock: asyncio.Lock):
+    async def handle(self, parsed_data: Any):
         # see how much time we take to process this request
         start_time = time.time() * 1000
         protocol_name = parsed_data.get("protocol")
@@ -47,8 +95,7 @@ class ProtocolHandler:
         try:
             response = await protocol.handle(protocol_data, self.node_id)
             if response is not None:
-                async with send_lock:
-                    await self.websocket.send(response)
+                await self.writer.send(response, MessagePriority.CONTROL)
         finally:
             time_taken = (time.time() * 1000) - start_time
             logger.info(
@@ -1,4 +1,7 @@
 # TODO: Move these common protocol stuff into a shared library
 PING_PONG_PROTOCOL_NAME = "ping-pong"  # Name of the protocol
-PING_PONG_PROTOCOL_VERSION = "1.0"  # Version of the protocol
+# Latest version of the protocol, 1.1 adds the node's capacity to the pong
+PING_PONG_PROTOCOL_VERSION = "1.1"
+# Pings of these versions are answered in the same version
+PING_PONG_SUPPORTED_VERSIONS = ("1.0", PING_PONG_PROTOCOL_VERSION)
 PING_TIMEOUT_IN_SECONDS = 10  # Respond before this time
@@ -0,0 +1,41 @@
+from typing import Any
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.protocol.entities import StreamAckRequest
+from galadriel_node.sdk.stream_resumption import STREAM_RESUMPTION_PROTOCOL_VERSION
+from galadriel_node.sdk.stream_resumption import StreamResumer
+
+logger = get_node_logger()
+
+
+# pylint: disable=too-few-public-methods,
+class StreamAckProtocol:
+    """
+    Receives the server's acks of streamed chunks, so they are dropped from the
+    resume buffer.
+    """
+
+    PROTOCOL_NAME = "stream-ack"
+    PROTOCOL_VERSION = STREAM_RESUMPTION_PROTOCOL_VERSION
+
+    def __init__(self, stream_resumer: StreamResumer):
+        self.stream_resumer = stream_resumer
+        logger.info(f"{self.PROTOCOL_NAME}: Protocol initialized")
+
+    async def handle(self, data: Any, my_node_id: str) -> str | None:
+        try:
+            request = StreamAckRequest(**data)
+        except Exception:
+            logger.error(f"{self.PROTOCOL_NAME}: Invalid data received: {data}")
+            return None
+        if (
+            request.node_id != my_node_id
+            or request.protocol_version != self.PROTOCOL_VERSION
+        ):
+            logger.debug(f"{self.PROTOCOL_NAME}: Ignoring unexpected ack {data}")
+            return None
+        if not self.stream_resumer.ack(request.request_id, request.seq):
+            logger.debug(
+                f"{self.PROTOCOL_NAME}: Request {request.request_id} is not buffered"
+            )
+        return None
@@ -0,0 +1,338 @@
+"""
+Stream resumption keeps inference streams alive across short websocket disconnects.
+
+Every chunk of a resumable stream carries a sequence number and stays buffered until
+the server acks it with the stream-ack protocol. When the connection is lost the
+requests keep running and buffer their chunks. The next connection advertises the
+resumable request ids in a stream-resume message and replays the unacked chunks, the
+server drops the ones it already has by their sequence number.
+
+The buffers are bounded in bytes and in age. A stream that lost unacked chunks to the
+bounds, or that stays disconnected for longer than max_age, can not be resumed.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+from typing import Dict
+from typing import Optional
+
+from galadriel_node.config import config
+from galadriel_node.sdk import codec
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.inflight_registry import InflightRegistry
+from galadriel_node.sdk.inflight_registry import InflightRequest
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.protocol.entities import InferenceResponse
+from galadriel_node.sdk.websocket_writer import MessagePriority
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
+
+# Sent by the node and echoed back by the server if it acks and resumes streams
+RESUMPTION_HEADER = "Stream-Resumption"
+STREAM_RESUME_PROTOCOL_NAME = "stream-resume"
+STREAM_RESUMPTION_PROTOCOL_VERSION = "1.0"
+SWEEP_INTERVAL = 1.0  # How often expired streams are dropped in seconds
+
+logger = get_node_logger()
+
+
+@dataclass
+class BufferedChunk:
+    seq: int
+    message: str
+    buffered_at: float
+
+
+class ResumableStream:
+    """
+    The outbound buffer of a single inference request.
+    """
+
+    def __init__(
+        self,
+        request_id: str,
+        writer: Optional[WebsocketWriter],
+        max_bytes: int,
+        max_age: float,
+    ):
+        self.request_id = request_id
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.finished = False
+        # Set once an unacked chunk was dropped, the stream can not be resumed anymore
+        self.truncated = False
+        self.detached_at: Optional[float] = None
+        self._writer = writer
+        self._chunks: Deque[BufferedChunk] = deque()
+        self._bytes = 0
+        self._next_seq = 0
+        # Keeps live chunks from overtaking the replayed ones
+        self._lock = asyncio.Lock()
+
+    @property
+    def writer(self) -> Optional[WebsocketWriter]:
+        return self._writer
+
+    @property
+    def first_seq(self) -> int:
+        return self._chunks[0].seq if self._chunks else self._next_seq
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    @property
+    def buffered_bytes(self) -> int:
+        return self._bytes
+
+    async def send(self, chunk: InferenceResponse) -> str:
+        """
+        Numbers and buffers the chunk, then writes it to the current connection if
+        there is one. Raises SdkError when the buffer of a disconnected stream is full.
+        """
+        async with self._lock:
+            chunk.seq = self._next_seq
+            self._next_seq += 1
+            message = chunk.to_json()
+            now = time.monotonic()
+            self._chunks.append(
+                BufferedChunk(seq=chunk.seq, message=message, buffered_at=now)
+            )
+            self._bytes += len(message)
+            if self._writer is None:
+                if self._bytes > self.max_bytes:
+                    self._truncate()
+                    raise SdkError(
+                        f"Resume buffer of request {self.request_id} is full"
+                    )
+                return message
+            self.trim(now)
+            await self._write(message)
+            return message
+
+    def ack(self, seq: int) -> None:
+        while self._chunks and self._chunks[0].seq <= seq:
+            self._bytes -= len(self._chunks.popleft().message)
+
+    def trim(self, now: float) -> None:
+        """
+        Drops the oldest unacked chunks over the bounds.
+        """
+        while self._chunks and (
+            self._bytes > self.max_bytes
+            or now - self._chunks[0].buffered_at > self.max_age
+        ):
+            self._bytes -= len(self._chunks.popleft().message)
+            self._truncate()
+
+    def detach(self) -> None:
+        if self.detached_at is None:
+            self.detached_at = time.monotonic()
+        self._writer = None
+
+    async def resume(self, writer: WebsocketWriter) -> None:
+        async with self._lock:
+            self._writer = writer
+            self.detached_at = None
+            for chunk in list(self._chunks):
+                if not await self._write(chunk.message):
+                    break
+
+    def _truncate(self) -> None:
+        if not self.truncated:
+            logger.info(
+                f"Request {self.request_id} lost unacked chunks, "
+                "it can not be resumed anymore"
+            )
+        self.truncated = True
+
+    def is_done(self) -> bool:
+        return self.finished and not self._chunks
+
+    def is_expired(self, now: float) -> bool:
+        return self.detached_at is not None and now - self.detached_at > self.max_age
+
+    async def _write(self, message: str) -> bool:
+        if self._writer is None:
+            return False
+        try:
+            await self._writer.send(message)
+            return True
+        except Exception as e:
+            logger.info(f"Buffering request {self.request_id} after send failure: {e}")
+            self.detach()
+            return False
+
+
+class StreamResumer:
+    """
+    Owns the resumable streams of the node and moves them from a lost connection to
+    the next one.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = config.GALADRIEL_STREAM_RESUMPTION_MAX_BYTES,
+        max_age: float = config.GALADRIEL_STREAM_RESUMPTION_MAX_AGE,
+    ):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.resumed = 0
+        self.expired = 0
+        self._streams: Dict[str, ResumableStream] = {}
+        # Running requests of lost connections, waiting for the next connection
+        self._suspended: Dict[str, InflightRequest] = {}
+        self._node_id: Optional[str] = None
+        self._registry: Optional[InflightRegistry] = None
+        self._writer: Optional[WebsocketWriter] = None
+
+    def open(self, request_id: str, writer: WebsocketWriter) -> ResumableStream:
+        stream = ResumableStream(request_id, writer, self.max_bytes, self.max_age)
+        self._streams[request_id] = stream
+        return stream
+
+    def get(self, request_id: str) -> Optional[ResumableStream]:
+        return self._streams.get(request_id)
+
+    def finish(self, request_id: str) -> None:
+        """
+        Marks the stream as complete, it is kept until the server acks its last chunk.
+        """
+        stream = self._streams.get(request_id)
+        if stream is None:
+            return
+        if stream.truncated and stream.writer is None:
+            # It never sent its final chunk, a resume would advertise it as complete
+            self.discard(request_id)
+            return
+        stream.finished = True
+        self._drop_if_done(stream)
+
+    def discard(self, request_id: str) -> None:
+        self._streams.pop(request_id, None)
+        self._suspended.pop(request_id, None)
+
+    def ack(self, request_id: str, seq: int) -> bool:
+        stream = self._streams.get(request_id)
+        if stream is None:
+            return False
+        stream.ack(seq)
+        self._drop_if_done(stream)
+        return True
+
+    async def connected(
+        self, node_id: str, registry: InflightRegistry, writer: WebsocketWriter
+    ) -> None:
+        self._node_id = node_id
+        self._registry = registry
+        self._writer = writer
+        await self._resume()
+
+    async def disconnected(
+        self, registry: InflightRegistry, writer: WebsocketWriter
+    ) -> None:
+        """
+        Suspends the resumable requests of a lost connection, so they are not cancelled
+        with the rest. They move on right away if a newer connection is already up.
+        """
+        for stream in list(self._streams.values()):
+            if stream.writer is not writer and stream.detached_at is None:
+                continue
+            if stream.truncated:
+                # Left in the registry, it is cancelled with the other requests
+                logger.info(f"Request {stream.request_id} can not be resumed")
+                self.discard(stream.request_id)
+                continue
+            request = registry.detach(stream.request_id)
+            stream.detach()
+            if request is not None:
+                self._suspended[stream.request_id] = request
+        if self._writer is writer:
+            self._registry = None
+            self._writer = None
+        else:
+            await self._resume()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            self.sweep()
+
+    def sweep(self) -> None:
+        """
+        Cancels the requests that stayed disconnected for too long and trims the
+        buffers of the connected ones.
+        """
+        now = time.monotonic()
+        for stream in list(self._streams.values()):
+            if stream.is_expired(now):
+                request = self._suspended.get(stream.request_id)
+                self.discard(stream.request_id)
+                self.expired += 1
+                logger.info(
+                    f"Request {stream.request_id} was not resumed in time, dropping it"
+                )
+                if request is not None:
+                    request.task.cancel()
+            elif stream.writer is not None:
+                stream.trim(now)
+                self._drop_if_done(stream)
+
+    async def _resume(self) -> None:
+        if self._registry is None or self._writer is None:
+            return
+        streams = []
+        for stream in list(self._streams.values()):
+            if stream.detached_at is None:
+                continue
+            if stream.truncated:
+                self._drop_truncated(stream)
+            else:
+                streams.append(stream)
+        for request in self._suspended.values():
+            self._registry.adopt(request)
+        self._suspended.clear()
+        if not streams:
+            return
+        await self._writer.send(
+            codec.dumps(
+                {
+                    "protocol": STREAM_RESUME_PROTOCOL_NAME,
+                    "data": {
+                        "protocol_version": STREAM_RESUMPTION_PROTOCOL_VERSION,
+                        "node_id": self._node_id,
+                        "requests": [
+                            {
+                                "request_id": stream.request_id,
+                                "first_seq": stream.first_seq,
+                                "next_seq": stream.next_seq,
+                                "finished": stream.finished,
+                            }
+                            for stream in streams
+                        ],
+                    },
+                }
+            ),
+            MessagePriority.CONTROL,
+        )
+        for stream in streams:
+            await stream.resume(self._writer)
+        self.resumed += len(streams)
+        logger.info(f"Resumed {len(streams)} streams on the new connection")
+
+    def _drop_truncated(self, stream: ResumableStream) -> None:
+        """
+        A stream that lost unacked chunks while disconnected is not advertised, its
+        request is cancelled.
+        """
+        logger.info(f"Request {stream.request_id} can not be resumed")
+        request = self._suspended.get(stream.request_id)
+        self.discard(stream.request_id)
+        if request is not None:
+            request.task.cancel()
+
+    def _drop_if_done(self, stream: ResumableStream) -> None:
+        if stream.is_done() and self._streams.get(stream.request_id) is stream:
+            del self._streams[stream.request_id]
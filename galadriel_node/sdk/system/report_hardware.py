@@ -1,17 +1,16 @@
+import asyncio
 import importlib
 import platform
 from http import HTTPStatus
 from typing import Tuple
 from urllib.parse import urljoin
 
-import aiohttp
 import cpuinfo
 import psutil
-import speedtest
-from gpustat import GPUStatCollection
 
 from galadriel_node.config import config
 from galadriel_node.sdk import api
+from galadriel_node.sdk import http_client
 from galadriel_node.sdk.entities import AuthenticationError
 from galadriel_node.sdk.entities import SdkError
 from galadriel_node.sdk.logging_utils import get_node_logger
@@ -51,14 +50,17 @@ async def report_hardware(api_url: str, api_key: str, node_id: str) -> None:
             version=version,
         )
     else:
-        gpu_info = get_gpu_info()
-        cpu_model, cpu_count = _get_cpu_info()
+        # The hardware probes block, they run in threads so other startup phases go on
+        gpu_info = await asyncio.to_thread(get_gpu_info)
+        cpu_model, cpu_count = await asyncio.to_thread(_get_cpu_info)
         if cpu_count < MIN_CPU_CORES:
             raise SdkError(f"Not enough CPU cores, minimum {MIN_CPU_CORES} required")
         total_mem_mb = _get_ram()
         if total_mem_mb < MIN_RAM_MB:
             raise SdkError(f"Not enough RAM, minimum {MIN_RAM_MB}MB required")
-        download_speed_mbs, upload_speed_mbs = _get_network_speed()
+        download_speed_mbs, upload_speed_mbs = await asyncio.to_thread(
+            _get_network_speed
+        )
         if (
             download_speed_mbs < MIN_DOWNLOAD_SPEED
             or upload_speed_mbs < MIN_UPLOAD_SPEED
@@ -83,6 +85,9 @@ async def report_hardware(api_url: str, api_key: str, node_id: str) -> None:
 
 
 def get_gpu_info() -> GPUInfo:
+    # pylint: disable=import-outside-toplevel
+    from gpustat import GPUStatCollection
+
     try:
         query = GPUStatCollection.new_query()
     except Exception:
@@ -123,6 +128,10 @@ def _get_ram() -> int:
 
 
 def _get_network_speed() -> Tuple[float, float]:
+    # Only needed for the hardware report
+    # pylint: disable=import-outside-toplevel
+    import speedtest
+
     st = speedtest.Speedtest()
     print("Testing download speed..", flush=True)
     download_speed_mbs = round(st.download() / 1_000_000, 2)
@@ -136,8 +145,9 @@ def _get_version() -> str:
 
 
 async def _get_info_already_exists(api_url: str, api_key: str, node_id: str) -> bool:
+    # Also fetched by the version check at startup
     response_status, response_json = await api.get(
-        api_url, "node/info", api_key, query_params={"node_id": node_id}
+        api_url, "node/info", api_key, query_params={"node_id": node_id}, memoize=True
     )
     if response_status != HTTPStatus.OK:
         return False
@@ -161,28 +171,35 @@ async def _get_info_already_exists(api_url: str, api_key: str, node_id: str) ->
 async def _post_info(
     node_info: NodeInfo, api_url: str, api_key: str, node_id: str
 ) -> None:
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            urljoin(api_url + "/", "node/info"),
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "node_id": node_id,
-                "gpu_model": node_info.gpu_model,
-                "vram": node_info.vram,
-                "gpu_count": node_info.gpu_count,
-                "cpu_model": node_info.cpu_model,
-                "cpu_count": node_info.cpu_count,
-                "ram": node_info.ram,
-                "network_download_speed": node_info.network_download_speed,
-                "network_upload_speed": node_info.network_upload_speed,
-                "operating_system": node_info.operating_system,
-                "version": node_info.version,
-            },
-        ) as response:
-            await response.json()
-            if response.status == HTTPStatus.OK:
-                print("Successfully sent hardware info", flush=True)
-            elif response.status == HTTPStatus.UNAUTHORIZED:
-                raise AuthenticationError("Unauthorized to send hardware info")
-            else:
-                raise SdkError("Failed to save hardware info")
+    await http_client.with_retry(
+        lambda: _send_info(node_info, api_url, api_key, node_id)
+    )
+
+
+async def _send_info(
+    node_info: NodeInfo, api_url: str, api_key: str, node_id: str
+) -> None:
+    async with http_client.get_session().post(
+        urljoin(api_url + "/", "node/info"),
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={
+            "node_id": node_id,
+            "gpu_model": node_info.gpu_model,
+            "vram": node_info.vram,
+            "gpu_count": node_info.gpu_count,
+            "cpu_model": node_info.cpu_model,
+            "cpu_count": node_info.cpu_count,
+            "ram": node_info.ram,
+            "network_download_speed": node_info.network_download_speed,
+            "network_upload_speed": node_info.network_upload_speed,
+            "operating_system": node_info.operating_system,
+            "version": node_info.version,
+        },
+    ) as response:
+        await response.json()
+        if response.status == HTTPStatus.OK:
+            print("Successfully sent hardware info", flush=True)
+        elif response.status == HTTPStatus.UNAUTHORIZED:
+            raise AuthenticationError("Unauthorized to send hardware info")
+        else:
+            raise SdkError("Failed to save hardware info")
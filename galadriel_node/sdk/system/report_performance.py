@@ -9,11 +9,11 @@ from typing import List
 from typing import Optional
 from urllib.parse import urljoin
 
-import aiohttp
 from openai.types.chat import ChatCompletionChunk
 
 from galadriel_node.config import config
 from galadriel_node.sdk import api
+from galadriel_node.sdk import http_client
 from galadriel_node.sdk.entities import AuthenticationError
 from galadriel_node.sdk.entities import SdkError
 from galadriel_node.sdk.llm import Llm
@@ -37,7 +37,7 @@ async def report_performance(
     api_url: str,
     api_key: str,
     node_id: str,
-    llm_base_url: str,
+    llm_base_urls: List[str],
     model_name: str,
 ) -> None:
     existing_tokens_per_second = await _get_benchmark(
@@ -52,7 +52,7 @@ async def report_performance(
             return None
         logger.info("Node benchmarking results are too low, retrying")
 
-    tokens_per_sec = await _get_benchmark_tokens_per_sec(llm_base_url)
+    tokens_per_sec = await _get_benchmark_tokens_per_sec(llm_base_urls)
     await _post_benchmark(model_name, tokens_per_sec, api_url, api_key, node_id)
 
 
@@ -61,30 +61,41 @@ async def _get_benchmark(
 ) -> Optional[float]:
     query_params = {"model": model_name, "node_id": node_id}
     response_status, response_json = await api.get(
-        api_url, "node/benchmark", api_key, query_params
+        api_url, "node/benchmark", api_key, query_params, memoize=True
     )
     if response_status != 200:
         return None
     return response_json.get("tokens_per_second")
 
 
-async def _get_benchmark_tokens_per_sec(llm_base_url: str) -> float:
+async def _get_benchmark_tokens_per_sec(llm_base_urls: List[str]) -> float:
+    """
+    Benchmarks all the backends at once, NUM_THREADS per backend, so the pool
+    is reported as a single aggregate capacity.
+    """
     logger.info("Starting LLM benchmarking...")
     logger.info("    Loading prompts dataset")
     dataset: List[Dict] = _load_dataset()
 
-    logger.info(f"    Using {NUM_THREADS} threads")
+    num_threads = NUM_THREADS * len(llm_base_urls)
+    logger.info(f"    Using {num_threads} threads for {len(llm_base_urls)} backend(s)")
     logger.info(
         f"    Running inference requests, this will take around {BENCHMARK_TIME_SECONDS} seconds..."
     )
-    llm = Llm(llm_base_url)
-    datasets = _split_dataset(dataset, NUM_THREADS)
+    llms = [Llm(llm_base_url) for llm_base_url in llm_base_urls]
+    datasets = _split_dataset(dataset, num_threads)
     loop = asyncio.get_running_loop()
-    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
         benchmark_start = time.time()
         tasks = [
-            loop.run_in_executor(executor, _run_llm, benchmark_start, datasets[i], llm)
-            for i in range(NUM_THREADS)
+            loop.run_in_executor(
+                executor,
+                _run_llm,
+                benchmark_start,
+                datasets[i],
+                llms[i % len(llms)],
+            )
+            for i in range(num_threads)
         ]
         results = await asyncio.gather(*tasks)
         benchmark_end = time.time()
@@ -170,24 +181,35 @@ async def _post_benchmark(
     api_key: str,
     node_id: str,
 ) -> None:
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            urljoin(api_url + "/", "node/benchmark"),
-            headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "node_id": node_id,
-                "model_name": model_name,
-                "tokens_per_second": tokens_per_sec,
-            },
-        ) as response:
-            await response.json()
-            if response.status == HTTPStatus.OK:
-                logger.info("Successfully sent benchmark results")
-            elif response.status == HTTPStatus.UNAUTHORIZED:
-                raise AuthenticationError("Unauthorized to save benchmark results")
-            else:
-                raise SdkError("Failed to save benchmark results")
+    await http_client.with_retry(
+        lambda: _send_benchmark(model_name, tokens_per_sec, api_url, api_key, node_id)
+    )
+
+
+async def _send_benchmark(
+    model_name: str,
+    tokens_per_sec: float,
+    api_url: str,
+    api_key: str,
+    node_id: str,
+) -> None:
+    async with http_client.get_session().post(
+        urljoin(api_url + "/", "node/benchmark"),
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={
+            "node_id": node_id,
+            "model_name": model_name,
+            "tokens_per_second": tokens_per_sec,
+        },
+    ) as response:
+        await response.json()
+        if response.status == HTTPStatus.OK:
+            logger.info("Successfully sent benchmark results")
+        elif response.status == HTTPStatus.UNAUTHORIZED:
+            raise AuthenticationError("Unauthorized to save benchmark results")
+        else:
+            raise SdkError("Failed to save benchmark results")
 
 
 if __name__ == "__main__":
-    asyncio.run(_get_benchmark_tokens_per_sec("http://localhost:11434"))
+    asyncio.run(_get_benchmark_tokens_per_sec(["http://localhost:11434"]))
@@ -2,12 +2,14 @@ import os
 
 import psutil
 
-from gpustat import GPUStatCollection
 from galadriel_node.sdk.system.entities import GPUUtilization
 from galadriel_node.sdk.system.entities import NodeUtilization
 
 
 async def execute() -> NodeUtilization:
+    # pylint: disable=import-outside-toplevel
+    from gpustat import GPUStatCollection
+
     cpu_usage = psutil.cpu_percent()
     mem = psutil.virtual_memory()
     current_dir = os.path.dirname(os.path.abspath(__file__))
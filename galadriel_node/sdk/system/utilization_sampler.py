@@ -0,0 +1,140 @@
+import os
+import threading
+from collections import deque
+from typing import Any
+from typing import Deque
+from typing import List
+from typing import Optional
+
+import psutil
+import pynvml
+
+from galadriel_node.sdk.logging_utils import get_node_logger
+from galadriel_node.sdk.system.entities import GPUUtilization
+from galadriel_node.sdk.system.entities import NodeUtilization
+
+logger = get_node_logger()
+
+
+class UtilizationSampler:
+    """
+    Samples the node's utilization on a background thread, so health checks never
+    wait on NVML or psutil on the event loop.
+
+    NVML is initialized once and its device handles are reused for every sample.
+    The last `window` samples are kept in a ring buffer and their average is
+    computed on the sampler thread, reading it is O(1).
+    """
+
+    def __init__(self, interval: float, window: int):
+        self.interval = interval
+        self._samples: Deque[NodeUtilization] = deque(maxlen=max(window, 1))
+        self._average: Optional[NodeUtilization] = None
+        self._disk_path = os.path.dirname(os.path.abspath(__file__))
+        self._gpu_handles: Optional[List[Any]] = None
+        self._nvml_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="utilization-sampler", daemon=True
+        )
+        # The first cpu_percent() call has nothing to compare against and returns 0
+        psutil.cpu_percent()
+
+    def start(self) -> None:
+        if not self._thread.is_alive():
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def latest(self) -> Optional[NodeUtilization]:
+        try:
+            return self._samples[-1]
+        except IndexError:
+            return None
+
+    def average(self) -> Optional[NodeUtilization]:
+        """
+        Returns the average over the ring buffer, or None before the first sample.
+        """
+        return self._average
+
+    def sample(self) -> NodeUtilization:
+        mem = psutil.virtual_memory()
+        return NodeUtilization(
+            cpu_percent=round(psutil.cpu_percent()),
+            ram_percent=round(mem.percent),
+            disk_percent=round(psutil.disk_usage(self._disk_path).percent),
+            gpus=[_sample_gpu(handle) for handle in self._get_gpu_handles()],
+        )
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._samples.append(self.sample())
+                self._average = _average(list(self._samples))
+            except Exception:
+                logger.error("Failed to sample utilization", exc_info=True)
+            self._stop.wait(self.interval)
+        if self._gpu_handles:
+            try:
+                pynvml.nvmlShutdown()
+            except pynvml.NVMLError:
+                pass
+
+    def _get_gpu_handles(self) -> List[Any]:
+        # The first health check may sample before the sampler thread did
+        with self._nvml_lock:
+            if self._gpu_handles is None:
+                try:
+                    pynvml.nvmlInit()
+                    self._gpu_handles = [
+                        pynvml.nvmlDeviceGetHandleByIndex(index)
+                        for index in range(pynvml.nvmlDeviceGetCount())
+                    ]
+                except pynvml.NVMLError as e:
+                    logger.info(f"NVML is not available, not sampling GPUs: {e}")
+                    self._gpu_handles = []
+            return self._gpu_handles
+
+
+def _sample_gpu(handle: Any) -> GPUUtilization:
+    memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+    try:
+        # Both in milliwatts
+        power_percent = round(
+            pynvml.nvmlDeviceGetPowerUsage(handle)
+            / pynvml.nvmlDeviceGetEnforcedPowerLimit(handle)
+            * 100
+        )
+    except (pynvml.NVMLError, ZeroDivisionError):
+        power_percent = 0
+    return GPUUtilization(
+        gpu_percent=pynvml.nvmlDeviceGetUtilizationRates(handle).gpu,
+        vram_percent=round(memory.used / memory.total * 100),
+        power_percent=power_percent,
+    )
+
+
+def _average(samples: List[NodeUtilization]) -> NodeUtilization:
+    count = len(samples)
+    gpu_count = min(len(sample.gpus) for sample in samples)
+    return NodeUtilization(
+        cpu_percent=round(sum(sample.cpu_percent for sample in samples) / count),
+        ram_percent=round(sum(sample.ram_percent for sample in samples) / count),
+        disk_percent=samples[-1].disk_percent,
+        gpus=[
+            GPUUtilization(
+                gpu_percent=round(
+                    sum(sample.gpus[index].gpu_percent for sample in samples) / count
+                ),
+                vram_percent=round(
+                    sum(sample.gpus[index].vram_percent for sample in samples) / count
+                ),
+                power_percent=round(
+                    sum(sample.gpus[index].power_percent for sample in samples) / count
+                ),
+            )
+            for index in range(gpu_count)
+        ],
+    )
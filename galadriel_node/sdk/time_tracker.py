@@ -1,9 +1,19 @@
+import re
 import time
 from typing import Optional
 
 from openai.types import CompletionUsage
 from openai.types.chat import ChatCompletionChunk
 
+from galadriel_node.sdk.protocol.entities import InferenceResponse
+from galadriel_node.sdk.protocol.entities import InferenceStatusCodes
+
+# A delta field with a value, the role-only first chunk has an empty content and the
+# usage chunk has no choices
+RAW_TOKEN_PATTERN = re.compile(
+    r'"(?:content|tool_calls|function_call)"\s*:\s*(?!null\b|""|\[\])'
+)
+
 
 class TimeTracker:
 
@@ -18,7 +28,7 @@ class TimeTracker:
         self.start_time = time.time()
 
     def chunk_received(self, chunk: Optional[ChatCompletionChunk]):
-        if _is_chunk_with_tokens(chunk):
+        if is_chunk_with_tokens(chunk):
             if self.first_token_time:
                 self.next_token_time = time.time()
             else:
@@ -62,7 +72,7 @@ class TimeTracker:
         return 0
 
 
-def _is_chunk_with_tokens(chunk: Optional[ChatCompletionChunk]):
+def is_chunk_with_tokens(chunk: Optional[ChatCompletionChunk]):
     return (
         chunk
         and chunk.choices
@@ -73,3 +83,14 @@ def _is_chunk_with_tokens(chunk: Optional[ChatCompletionChunk]):
             or chunk.choices[0].delta.tool_calls
         )
     )
+
+
+def is_response_with_tokens(response: InferenceResponse) -> bool:
+    """
+    Passthrough chunks are not parsed, their JSON is searched for a non-empty delta.
+    """
+    if response.status != InferenceStatusCodes.RUNNING:
+        return False
+    if response.raw_chunk is not None:
+        return RAW_TOKEN_PATTERN.search(response.raw_chunk) is not None
+    return bool(is_chunk_with_tokens(response.chunk))
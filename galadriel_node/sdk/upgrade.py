@@ -6,8 +6,12 @@ from galadriel_node.sdk.logging_utils import get_node_logger
 logger = get_node_logger()
 
 
-async def version_aware_get(api_url, endpoint, api_key, query_params=None):
-    status, response = await api.get(api_url, endpoint, api_key, query_params)
+async def version_aware_get(
+    api_url, endpoint, api_key, query_params=None, memoize=False
+):
+    status, response = await api.get(
+        api_url, endpoint, api_key, query_params, memoize=memoize
+    )
 
     if status == HTTPStatus.UPGRADE_REQUIRED:
         logger.error(
@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+from enum import IntEnum
+from typing import Any
+from typing import Optional
+
+from galadriel_node.config import config
+from galadriel_node.sdk.logging_utils import get_node_logger
+
+logger = get_node_logger()
+
+
+class MessagePriority(IntEnum):
+    # Lower value is sent first
+    CONTROL = 0
+    INFERENCE = 1
+
+
+class WebsocketWriter:
+    """
+    The single writer of a websocket connection.
+
+    Producers enqueue messages with a priority and one coroutine drains the queue,
+    so control frames (pong, health-check) overtake queued inference chunks.
+    Inference producers wait once `max_pending_inference_messages` frames are queued,
+    and the writer itself waits whenever the socket's write buffer is above the
+    connection's `write_limit`, which propagates backpressure to the token streams.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        max_pending_inference_messages: int = config.GALADRIEL_MAX_PENDING_INFERENCE_MESSAGES,
+    ):
+        self._websocket = websocket
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._inference_slots = asyncio.Semaphore(max_pending_inference_messages)
+        self._error: Optional[Exception] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._error is None:
+            self._error = ConnectionError("websocket writer stopped")
+        # Messages still queued are never written, callers waiting on them fail
+        while not self._queue.empty():
+            _, _, _, delivery = self._queue.get_nowait()
+            self._queue.task_done()
+            _settle(delivery, self._error)
+        # Wake up a producer waiting for a slot, it releases the next one
+        self._inference_slots.release()
+
+    async def send(
+        self,
+        message: Any,
+        priority: MessagePriority = MessagePriority.INFERENCE,
+        wait: bool = False,
+    ) -> None:
+        """
+        Enqueues a message. Raises the error of the underlying websocket if an
+        earlier write has failed.
+
+        With `wait` it returns only once the message was written and raises if
+        writing it failed, for final frames the caller must not lose silently.
+        """
+        self._raise_if_failed()
+        if priority == MessagePriority.INFERENCE:
+            await self._inference_slots.acquire()
+            if self._error is not None:
+                self._inference_slots.release()
+                self._raise_if_failed()
+        delivery = asyncio.get_running_loop().create_future() if wait else None
+        self._queue.put_nowait((priority, next(self._sequence), message, delivery))
+        if delivery is not None:
+            await delivery
+
+    async def join(self) -> None:
+        """
+        Waits until every queued message has been written.
+        """
+        await self._queue.join()
+
+    def pending_messages(self) -> int:
+        return self._queue.qsize()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        while True:
+            priority, _, message, delivery = await self._queue.get()
+            try:
+                if self._error is None:
+                    await self._websocket.send(message)
+                _settle(delivery, self._error)
+            except asyncio.CancelledError:
+                _settle(delivery, ConnectionError("websocket writer stopped"))
+                raise
+            except Exception as e:
+                # Keep draining the queue so waiting producers are released
+                self._error = e
+                logger.info(f"websocket_writer: Failed to send message: {e}")
+                _settle(delivery, e)
+            finally:
+                if priority == MessagePriority.INFERENCE:
+                    self._inference_slots.release()
+                self._queue.task_done()
+
+
+def _settle(delivery: Optional[asyncio.Future], error: Optional[Exception]) -> None:
+    # The caller may have been cancelled while waiting for the delivery
+    if delivery is None or delivery.done():
+        return
+    if error is None:
+        delivery.set_result(None)
+    else:
+        delivery.set_exception(error)
@@ -1,5 +1,15 @@
 from galadriel_node.config import config
+from galadriel_node.config import parse_llm_base_urls
 
 
 def test_config():
     assert config.GALADRIEL_RPC_URL is not None
+
+
+def test_parse_llm_base_urls():
+    assert parse_llm_base_urls(None) == []
+    assert parse_llm_base_urls("http://a:1") == ["http://a:1"]
+    assert parse_llm_base_urls("http://a:1, http://b:2,") == [
+        "http://a:1",
+        "http://b:2",
+    ]
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import time
+
+# Generous for slow CI machines, importing torch alone takes longer
+HELP_TIME_BUDGET = 3.0  # seconds
+
+HEAVY_MODULES = ["torch", "diffusers", "openai", "speedtest", "gpustat"]
+
+
+def test_help_starts_within_the_time_budget():
+    started_at = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "galadriel_node.cli.app", "--help"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - started_at
+
+    assert result.returncode == 0, result.stderr
+    assert "node" in result.stdout
+    assert elapsed < HELP_TIME_BUDGET
+
+
+def test_cli_does_not_import_heavy_dependencies():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, galadriel_node.cli.app; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, patch, call
 
 import pytest
@@ -9,6 +10,7 @@ from galadriel_node.sdk.node import (
 from galadriel_node.config import config
 from galadriel_node.llm_backends.vllm import LLM_BASE_URL
 from galadriel_node.sdk.diffusers import Diffusers
+from galadriel_node.sdk.node import reconnect_policy
 from galadriel_node.sdk.node.run_node import ConnectionResult
 
 
@@ -30,7 +32,9 @@ async def test_retry_connection_with_exceptions():
 
         with patch(
             "galadriel_node.cli.node.asyncio.sleep", new_callable=AsyncMock
-        ) as mock_sleep:
+        ) as mock_sleep, patch.object(
+            config, "GALADRIEL_RECONNECT_POLICY", "exponential"
+        ):
             await run_node._retry_connection(
                 "mock_rpc_url",
                 "mock_api_key",
@@ -39,13 +43,13 @@ async def test_retry_connection_with_exceptions():
 
             assert mock_connect_and_process.call_count == 6
 
-            expected_backoff_times = [run_node.BACKOFF_MIN]
-            backoff_time = run_node.BACKOFF_MIN
+            expected_backoff_times = [reconnect_policy.BACKOFF_MIN]
+            backoff_time = reconnect_policy.BACKOFF_MIN
             for attempt in range(1, 5):
                 backoff_time = min(
-                    run_node.BACKOFF_MIN
-                    + (run_node.BACKOFF_INCREMENT * (2 ** (attempt - 1))),
-                    run_node.BACKOFF_MAX,
+                    reconnect_policy.BACKOFF_MIN
+                    + (reconnect_policy.BACKOFF_INCREMENT * (2 ** (attempt - 1))),
+                    reconnect_policy.BACKOFF_MAX,
                 )
                 expected_backoff_times.append(backoff_time)
 
@@ -161,6 +165,33 @@ async def test_run_node_with_llm_base_url():
         mock_run_llm.assert_not_called()
 
 
+async def test_run_node_benchmarks_only_healthy_llm_backends():
+    with patch(
+        "galadriel_node.sdk.node.check_llm.execute", new_callable=AsyncMock
+    ) as mock_check_llm, patch(
+        "galadriel_node.sdk.node.run_node.report_hardware", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.sdk.node.run_node.report_performance", new_callable=AsyncMock
+    ) as mock_report_performance, patch(
+        "galadriel_node.sdk.node.run_node._retry_connection", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.sdk.node.run_node.version_aware_get", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.config.config.GALADRIEL_MODEL_TYPE", new="LLM"
+    ):
+        mock_check_llm.side_effect = [True, False]
+
+        await run_node.execute(
+            "mock_api_url",
+            "mock_rpc_url",
+            "mock_api_key",
+            "mock_node_id",
+            "http://healthy,http://unhealthy",
+        )
+
+        assert mock_report_performance.call_args.args[3] == ["http://healthy"]
+
+
 async def test_run_node_without_llm_base_url():
     api_url = "mock_api_url"
     rpc_url = "mock_rpc_url"
@@ -193,6 +224,35 @@ async def test_run_node_without_llm_base_url():
         assert mock_retry_connection.called
 
 
+async def test_run_node_reports_hardware_while_vllm_starts():
+    hardware_reported = asyncio.Event()
+
+    async def run_llm(model_id):
+        # Deadlocks if the hardware report waits for vLLM to be ready
+        await asyncio.wait_for(hardware_reported.wait(), timeout=5)
+        return 12345
+
+    async def report_hardware(*args):
+        hardware_reported.set()
+
+    with patch("galadriel_node.sdk.node.run_node._run_llm", side_effect=run_llm), patch(
+        "galadriel_node.sdk.node.run_node.report_hardware", side_effect=report_hardware
+    ), patch(
+        "galadriel_node.sdk.node.run_node.report_performance", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.sdk.node.run_node._retry_connection", new_callable=AsyncMock
+    ) as mock_retry_connection, patch(
+        "galadriel_node.sdk.node.run_node.version_aware_get", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.config.config.GALADRIEL_MODEL_TYPE", new="LLM"
+    ):
+        await run_node.execute(
+            "mock_api_url", "mock_rpc_url", "mock_api_key", "mock_node_id", None
+        )
+
+        assert mock_retry_connection.called
+
+
 async def test_run_node_with_llm_base_url_check_fails():
     api_url = "mock_api_url"
     rpc_url = "mock_rpc_url"
@@ -206,13 +266,17 @@ async def test_run_node_with_llm_base_url_check_fails():
         "galadriel_node.sdk.node.run_node.version_aware_get", new_callable=AsyncMock
     ), patch(
         "galadriel_node.config.config.GALADRIEL_MODEL_TYPE", new="LLM"
-    ):
+    ), patch.object(
+        run_node.StartupTimeline, "log"
+    ) as mock_timeline_log:
         mock_check_llm.return_value = False
 
         with pytest.raises(SdkError, match="LLM check failed"):
             await run_node.execute(api_url, rpc_url, api_key, node_id, llm_base_url)
 
         mock_check_llm.assert_called_once_with(llm_base_url, config.GALADRIEL_MODEL_ID)
+        # The timeline shows which phase failed
+        mock_timeline_log.assert_called_once()
 
 
 async def test_run_node_with_image_generation_model():
@@ -1,5 +1,7 @@
 from unittest.mock import AsyncMock
 
+from galadriel_node.sdk.jobs import api_ping_job as api_ping_job_module
+
 from galadriel_node.sdk.jobs.api_ping_job import ApiPingJob
 
 
@@ -9,7 +11,7 @@ async def test_api_ping_job():
     api_ping_job._check_api_ping_time = AsyncMock()
 
     assert api_ping_job.domain == domain
-    assert api_ping_job.ping_time == []
+    assert list(api_ping_job.ping_time) == []
     assert api_ping_job._lock
 
     await api_ping_job._append_ping_time(None)
@@ -17,3 +19,24 @@ async def test_api_ping_job():
 
     assert await api_ping_job.get_and_clear_ping_time() == [None, 100]
     assert await api_ping_job.get_and_clear_ping_time() == []
+
+
+async def test_ping_time_is_bounded():
+    api_ping_job = ApiPingJob("api.galadriel.com")
+
+    for ping_time in range(api_ping_job_module.MAX_PING_TIMES + 10):
+        await api_ping_job._append_ping_time(ping_time)
+
+    ping_times = await api_ping_job.get_and_clear_ping_time()
+    assert len(ping_times) == api_ping_job_module.MAX_PING_TIMES
+    # The oldest ping times are dropped
+    assert ping_times[-1] == api_ping_job_module.MAX_PING_TIMES + 9
+
+
+def test_set_domain_pings_the_new_domain():
+    api_ping_job = ApiPingJob("old.example.com:443", ["other.example.com"])
+
+    api_ping_job.set_domain("new.example.com:443")
+
+    assert api_ping_job.domain == "new.example.com:443"
+    assert api_ping_job.prober.targets == ["new.example.com:443", "other.example.com"]
@@ -1,25 +1,20 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+from unittest.mock import MagicMock
 
 import pytest
 
 from galadriel_node.sdk.jobs.reconnect_request_job import wait_for_reconnect
+from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
 
 
 @pytest.mark.asyncio
 async def test_wait_for_reconnect():
-    inference_status_counter = AsyncMock()
-    ping_pong_protocol = AsyncMock()
-    ping_pong_protocol.get_reconnect_requested.return_value = AsyncMock(
-        return_value=True
-    )
-    inference_status_counter.is_zero.return_value = AsyncMock(return_value=True)
-    image_generation_engine = None
+    ping_pong_protocol = PingPongProtocol(MagicMock())
 
-    with patch(
-        "galadriel_node.sdk.jobs.reconnect_request_job.asyncio.sleep",
-        new_callable=AsyncMock,
-    ):
-        res = await wait_for_reconnect(
-            inference_status_counter, image_generation_engine, ping_pong_protocol
-        )
+    job = asyncio.create_task(wait_for_reconnect(ping_pong_protocol))
+    await asyncio.sleep(0)
+    assert not job.done()
+
+    await ping_pong_protocol.set_reconnect_requested(True)
+    res = await asyncio.wait_for(job, timeout=1)
     assert res == True
@@ -0,0 +1,122 @@
+import pytest
+
+from galadriel_node.llm_backends.launch_profiles import LaunchProfile
+from galadriel_node.llm_backends.launch_profiles import parse_model_spec
+from galadriel_node.llm_backends.launch_profiles import parse_overrides
+from galadriel_node.llm_backends.launch_profiles import resolve_launch_profile
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.system.entities import GPUInfo
+
+LLAMA_8B_FP8 = "neuralmagic/Meta-Llama-3.1-8B-Instruct-FP8"
+LLAMA_8B_AWQ = "hugging-quants/Meta-Llama-3.1-8B-Instruct-AWQ-INT4"
+LLAMA_8B_FP16 = "meta-llama/Llama-3.1-8B-Instruct"
+LLAMA_70B = "neuralmagic/Meta-Llama-3.1-70B-Instruct-quantized.w4a16"
+LLAMA_405B = "neuralmagic/Meta-Llama-3.1-405B-Instruct-quantized.w4a16"
+
+
+def _gpus(vram: int, gpu_count: int) -> GPUInfo:
+    return GPUInfo(gpu_model="NVIDIA", vram=vram, gpu_count=gpu_count, power_limit=0)
+
+
+@pytest.mark.parametrize(
+    "model_id,parameters_billions,bytes_per_parameter",
+    [
+        (LLAMA_8B_FP8, 8, 1.0),
+        (LLAMA_8B_AWQ, 8, 0.5),
+        (LLAMA_8B_FP16, 8, 2.0),
+        (LLAMA_70B, 70, 0.5),
+        (LLAMA_405B, 405, 0.5),
+        ("Qwen/Qwen2.5-7B-Instruct", 7, 2.0),
+    ],
+)
+def test_parse_model_spec(model_id, parameters_billions, bytes_per_parameter):
+    spec = parse_model_spec(model_id)
+
+    assert spec.parameters_billions == parameters_billions
+    assert spec.bytes_per_parameter == bytes_per_parameter
+
+
+def test_parse_model_spec_unknown_size():
+    assert parse_model_spec("mock_model") is None
+
+
+# model, vram, gpu count, data parallel, tp, pp, dp, max_num_seqs, kv cache dtype
+PROFILES = [
+    (LLAMA_8B_FP8, 24564, 1, False, 1, 1, 1, 256, None),
+    (LLAMA_8B_FP8, 16000, 1, False, 1, 1, 1, 128, "fp8"),
+    (LLAMA_8B_FP16, 24564, 1, False, 1, 1, 1, 256, None),
+    # Models fitting on one GPU do not pay for tensor parallelism
+    (LLAMA_8B_AWQ, 24564, 2, False, 1, 1, 1, 256, None),
+    (LLAMA_8B_AWQ, 24564, 2, True, 1, 1, 2, 256, None),
+    (LLAMA_70B, 24564, 2, False, 2, 1, 1, 128, "fp8"),
+    (LLAMA_70B, 24564, 4, False, 2, 1, 1, 128, "fp8"),
+    (LLAMA_70B, 24564, 4, True, 2, 1, 2, 128, "fp8"),
+    (LLAMA_70B, 81920, 1, False, 1, 1, 1, 256, None),
+    (LLAMA_405B, 81920, 8, False, 4, 1, 1, 256, None),
+    (LLAMA_405B, 24564, 16, False, 8, 2, 1, 256, None),
+    ("mock_model", 24564, 3, False, 1, 1, 1, 256, None),
+]
+
+
+@pytest.mark.parametrize(
+    "model_id,vram,gpu_count,data_parallel,tp,pp,dp,max_num_seqs,kv_cache_dtype",
+    PROFILES,
+)
+def test_resolve_launch_profile(
+    model_id, vram, gpu_count, data_parallel, tp, pp, dp, max_num_seqs, kv_cache_dtype
+):
+    profile = resolve_launch_profile(
+        model_id, _gpus(vram, gpu_count), data_parallel=data_parallel
+    )
+
+    assert profile.tensor_parallel_size == tp
+    assert profile.pipeline_parallel_size == pp
+    assert profile.data_parallel_size == dp
+    assert profile.max_num_seqs == max_num_seqs
+    assert profile.kv_cache_dtype == kv_cache_dtype
+
+
+def test_resolve_launch_profile_model_does_not_fit():
+    with pytest.raises(SdkError, match="does not fit"):
+        resolve_launch_profile(LLAMA_405B, _gpus(24564, 8))
+
+
+def test_resolve_launch_profile_overrides():
+    profile = resolve_launch_profile(
+        LLAMA_8B_FP8,
+        _gpus(24564, 4),
+        data_parallel=True,
+        overrides={"tensor_parallel_size": 2, "max_num_seqs": 64},
+    )
+
+    assert profile.tensor_parallel_size == 2
+    assert profile.max_num_seqs == 64
+    assert profile.data_parallel_size == 2
+
+
+def test_resolve_launch_profile_overridden_parallelism_skips_the_fit_check():
+    profile = resolve_launch_profile(
+        LLAMA_405B,
+        _gpus(24564, 8),
+        overrides={"tensor_parallel_size": 8, "kv_cache_dtype": "fp8"},
+    )
+
+    assert profile.tensor_parallel_size == 8
+    assert profile.pipeline_parallel_size == 1
+    assert profile.kv_cache_dtype == "fp8"
+
+
+def test_parse_overrides():
+    assert not parse_overrides(None)
+    assert parse_overrides('{"kv_cache_dtype": "fp8"}') == {"kv_cache_dtype": "fp8"}
+    with pytest.raises(SdkError):
+        parse_overrides("tensor_parallel_size=2")
+    with pytest.raises(SdkError, match="tensor_parallel"):
+        parse_overrides('{"tensor_parallel": 2}')
+
+
+def test_launch_profile_to_args():
+    args = LaunchProfile(max_num_batched_tokens=8192).to_args()
+
+    assert args[args.index("--max_num_batched_tokens") + 1] == "8192"
+    assert "--pipeline-parallel-size" not in args
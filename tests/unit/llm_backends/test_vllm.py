@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import stat
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from galadriel_node.llm_backends import vllm
+from galadriel_node.llm_backends import vllm_detached
+from galadriel_node.llm_backends.launch_profiles import LaunchProfile
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.node import run_node
+from galadriel_node.sdk.node import vllm_supervisor
+from galadriel_node.sdk.system.entities import GPUInfo
+
+FAKE_VLLM = f"""#!{sys.executable}
+import json, os, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+args = sys.argv[1:]
+port = int(args[args.index("--port") + 1])
+with open(os.path.join(os.environ["FAKE_VLLM_OUTPUT"], f"{{port}}.json"), "w") as f:
+    json.dump({{"argv": args, "gpus": os.environ.get("CUDA_VISIBLE_DEVICES")}}, f)
+if os.environ.get("FAKE_VLLM_CRASH"):
+    sys.exit(1)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{{"data": []}}')
+
+    def log_message(self, *args):
+        pass
+
+
+HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+"""
+
+GPU_INFO = GPUInfo(
+    gpu_model="NVIDIA GeForce RTX 4090", vram=24564, gpu_count=2, power_limit=450
+)
+
+
+@pytest.fixture
+def fake_vllm(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    executable = bin_dir / "vllm"
+    executable.write_text(FAKE_VLLM)
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_VLLM_OUTPUT", str(output_dir))
+    monkeypatch.chdir(tmp_path)
+    return output_dir
+
+
+def test_build_command():
+    command = vllm.build_command("mock_model", 19435, LaunchProfile())
+
+    assert command[:3] == ["vllm", "serve", "mock_model"]
+    assert command[command.index("--port") + 1] == "19435"
+    assert "--kv_cache_dtype" not in command
+    assert "--tensor-parallel-size" not in command
+
+
+def test_build_command_tensor_parallel():
+    profile = LaunchProfile(
+        tensor_parallel_size=4,
+        pipeline_parallel_size=2,
+        max_num_seqs=128,
+        kv_cache_dtype="fp8",
+    )
+
+    command = vllm.build_command("mock_model", vllm.VLLM_PORT, profile)
+
+    assert command[command.index("--tensor-parallel-size") + 1] == "4"
+    assert command[command.index("--pipeline-parallel-size") + 1] == "2"
+    assert command[command.index("--max_num_seqs") + 1] == "128"
+    assert command[command.index("--kv_cache_dtype") + 1] == "fp8"
+
+
+async def test_start_data_parallel_one_process_per_gpu(fake_vllm):
+    processes = vllm.start_data_parallel("mock_model", GPU_INFO)
+    try:
+        assert [p.port for p in processes] == [vllm.VLLM_PORT, vllm.VLLM_PORT + 1]
+        assert [p.log_file for p in processes] == ["vllm-0.log", "vllm-1.log"]
+
+        with patch(
+            "galadriel_node.sdk.node.check_llm.execute", new_callable=AsyncMock
+        ) as mock_check_llm:
+            mock_check_llm.return_value = True
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *[vllm_supervisor.wait_for_vllm(p, "mock_model") for p in processes]
+                ),
+                timeout=30,
+            )
+        assert mock_check_llm.await_count == 2
+    finally:
+        for process in processes:
+            vllm.stop(process.pid)
+
+    for process in processes:
+        with open(fake_vllm / f"{process.port}.json", encoding="utf-8") as f:
+            launched = json.load(f)
+        assert launched["gpus"] == ",".join(str(i) for i in process.gpu_ids)
+        assert launched["argv"][:2] == ["serve", "mock_model"]
+
+
+async def test_run_llm_data_parallel_process_dies(fake_vllm, monkeypatch):
+    monkeypatch.setenv("FAKE_VLLM_CRASH", "1")
+
+    with patch(
+        "galadriel_node.llm_backends.vllm.is_installed", return_value=True
+    ), patch("galadriel_node.llm_backends.vllm.get_gpu_info", return_value=GPU_INFO):
+        with pytest.raises(SdkError, match="died unexpectedly"):
+            await asyncio.wait_for(
+                run_node._run_llm_data_parallel("mock_model"), timeout=30
+            )
+
+
+def _wait_for_launch(path, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while not path.exists() or not path.read_text():
+        assert time.monotonic() < deadline, f"{path} was not written"
+        time.sleep(0.05)
+    time.sleep(0.05)
+    return json.loads(path.read_text())
+
+
+def test_respawn_reuses_launch_command(fake_vllm):
+    gpu_info = GPUInfo(gpu_model="NVIDIA", vram=24564, gpu_count=1, power_limit=0)
+    [process] = vllm.start_data_parallel("mock_model", gpu_info)
+    launch_file = fake_vllm / f"{process.port}.json"
+    first_pid = process.pid
+    _wait_for_launch(launch_file)
+    vllm.stop(first_pid)
+    launch_file.unlink()
+
+    pid = vllm.respawn(process, "mock_model")
+    try:
+        assert pid is not None and pid != first_pid
+        launched = _wait_for_launch(launch_file)
+    finally:
+        vllm.stop(pid)
+
+    assert launched["argv"] == process.command[1:]
+    assert launched["gpus"] == "0"
+
+
+def test_detached_vllm_is_reattached(fake_vllm, tmp_path):
+    state_file = str(tmp_path / "vllm-state.json")
+    with patch("galadriel_node.llm_backends.vllm.get_gpu_info", return_value=GPU_INFO):
+        processes, reattached = vllm_detached.start("mock_model", True, state_file)
+        try:
+            assert not reattached
+            for process in processes:
+                _wait_for_launch(fake_vllm / f"{process.port}.json")
+            state = vllm_detached.load_state(state_file)
+            assert [p.pid for p in state.processes] == [p.pid for p in processes]
+
+            again, reattached = vllm_detached.start("mock_model", True, state_file)
+
+            assert reattached
+            assert [p.pid for p in again] == [p.pid for p in processes]
+            assert [p.gpu_ids for p in again] == [[0], [1]]
+        finally:
+            for process in processes:
+                vllm.stop(process.pid)
+    with open(state_file, encoding="utf-8") as f:
+        assert "env" not in f.read()
+
+
+def test_detached_vllm_finds_restarted_process(fake_vllm, tmp_path):
+    state_file = str(tmp_path / "vllm-state.json")
+    with patch("galadriel_node.llm_backends.vllm.get_gpu_info", return_value=GPU_INFO):
+        processes, _ = vllm_detached.start("mock_model", False, state_file)
+        [process] = processes
+        _wait_for_launch(fake_vllm / f"{process.port}.json")
+        vllm.stop(process.pid)
+        new_pid = vllm.respawn(process, "mock_model")
+        try:
+            again, reattached = vllm_detached.start("mock_model", False, state_file)
+
+            assert reattached
+            assert again[0].pid == new_pid
+        finally:
+            vllm.stop(new_pid)
+
+
+def test_detached_vllm_with_other_model_is_replaced(fake_vllm, tmp_path):
+    state_file = str(tmp_path / "vllm-state.json")
+    with patch("galadriel_node.llm_backends.vllm.get_gpu_info", return_value=GPU_INFO):
+        [old], _ = vllm_detached.start("old_model", False, state_file)
+        _wait_for_launch(fake_vllm / f"{old.port}.json")
+        (fake_vllm / f"{old.port}.json").unlink()
+
+        [new], reattached = vllm_detached.start("mock_model", False, state_file)
+        try:
+            assert not reattached
+            assert not vllm.is_process_running(old.pid)
+            launched = _wait_for_launch(fake_vllm / f"{new.port}.json")
+            assert launched["argv"][:2] == ["serve", "mock_model"]
+        finally:
+            vllm.stop(new.pid)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from galadriel_node.sdk.protocol.health_check_protocol import HealthCheckProtocol
+from galadriel_node.sdk.system import utilization_sampler
+from galadriel_node.sdk.system.utilization_sampler import UtilizationSampler
+
+HEALTH_CHECK = {
+    "protocol_version": "1.0",
+    "message_type": 1,
+    "node_id": "node_id",
+    "nonce": "nonce",
+}
+
+
+def _mock_nvml(gpu_percents):
+    nvml = MagicMock()
+    nvml.NVMLError = Exception
+    nvml.nvmlDeviceGetCount.return_value = 1
+    nvml.nvmlDeviceGetMemoryInfo.return_value = MagicMock(used=50, total=100)
+    nvml.nvmlDeviceGetPowerUsage.return_value = 150000
+    nvml.nvmlDeviceGetEnforcedPowerLimit.return_value = 300000
+    nvml.nvmlDeviceGetUtilizationRates.side_effect = [
+        MagicMock(gpu=percent) for percent in gpu_percents
+    ]
+    return nvml
+
+
+def test_nvml_is_initialized_once():
+    nvml = _mock_nvml([10, 30, 80])
+    sampler = UtilizationSampler(interval=1, window=2)
+
+    with patch.object(utilization_sampler, "pynvml", nvml):
+        samples = [sampler.sample() for _ in range(3)]
+
+    nvml.nvmlInit.assert_called_once()
+    nvml.nvmlDeviceGetHandleByIndex.assert_called_once_with(0)
+    assert [sample.gpus[0].gpu_percent for sample in samples] == [10, 30, 80]
+    assert samples[0].gpus[0].vram_percent == 50
+    assert samples[0].gpus[0].power_percent == 50
+
+
+def test_cpu_percent_is_primed_before_the_first_sample():
+    nvml = _mock_nvml([10])
+
+    with patch.object(utilization_sampler, "pynvml", nvml), patch.object(
+        utilization_sampler.psutil, "cpu_percent", side_effect=[0.0, 42.0]
+    ):
+        sampler = UtilizationSampler(interval=1, window=1)
+        sample = sampler.sample()
+
+    assert sample.cpu_percent == 42
+
+
+def test_sampler_thread_keeps_a_windowed_average():
+    nvml = _mock_nvml([10, 30, 80] + [80] * 100)
+    sampler = UtilizationSampler(interval=0.01, window=2)
+
+    with patch.object(utilization_sampler, "pynvml", nvml):
+        sampler.start()
+        deadline = time.monotonic() + 5
+        while (
+            sampler.latest() is None or sampler.latest().gpus[0].gpu_percent != 80
+        ) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        sampler.stop()
+        sampler._thread.join(timeout=1)
+
+    assert sampler.latest().gpus[0].gpu_percent == 80
+    # Only the last two samples are averaged
+    assert sampler.average().gpus[0].gpu_percent in (55, 80)
+    nvml.nvmlShutdown.assert_called_once()
+
+
+async def test_health_check_reads_the_sampled_utilization():
+    nvml = _mock_nvml([40] * 100)
+    sampler = UtilizationSampler(interval=0.01, window=1)
+    protocol = HealthCheckProtocol(sampler)
+
+    with patch.object(utilization_sampler, "pynvml", nvml), patch(
+        "galadriel_node.sdk.protocol.health_check_protocol.report_utilization.execute"
+    ) as report_utilization:
+        # Before the first sample the health check samples once off the loop
+        first = json.loads(await protocol.handle(HEALTH_CHECK, "node_id"))
+        sampler.start()
+        while sampler.average() is None:
+            await asyncio.sleep(0.001)
+        second = json.loads(await protocol.handle(HEALTH_CHECK, "node_id"))
+        sampler.stop()
+        sampler._thread.join(timeout=1)
+
+    report_utilization.assert_not_called()
+    assert first["data"]["gpus"][0]["gpu_percent"] == 40
+    assert second["data"]["gpus"][0]["gpu_percent"] == 40
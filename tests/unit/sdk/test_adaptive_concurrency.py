@@ -0,0 +1,145 @@
+import asyncio
+
+from galadriel_node.sdk.adaptive_concurrency import AdaptiveLimit, StreamLatency
+from galadriel_node.sdk.admission import AdmissionController
+from galadriel_node.sdk.protocol.entities import (
+    InferenceResponse,
+    InferenceStatusCodes,
+)
+
+TOKEN_CHUNK = '{"choices":[{"index":0,"delta":{"content":"hi"}}]}'
+
+
+def _latency(time_to_first_token: float, inter_token_latency: float = 0.0):
+    latency = StreamLatency(started_at=100.0)
+    latency.first_token_at = 100.0 + time_to_first_token
+    latency.last_token_at = latency.first_token_at + inter_token_latency
+    latency.tokens = 2
+    return latency
+
+
+class SimulatedBackend:
+    """
+    A backend that batches every stream, each decode step takes longer once more
+    than `capacity` streams share it.
+    """
+
+    def __init__(self, step_time: float, capacity: int, tokens: int):
+        self.step_time = step_time
+        self.capacity = capacity
+        self.tokens = tokens
+        self.running = 0
+
+    async def execute(self, request_id: str):
+        self.running += 1
+        try:
+            for _ in range(self.tokens):
+                await asyncio.sleep(
+                    self.step_time * max(1.0, self.running / self.capacity)
+                )
+                yield InferenceResponse(
+                    request_id=request_id,
+                    status=InferenceStatusCodes.RUNNING,
+                    raw_chunk=TOKEN_CHUNK,
+                )
+        finally:
+            self.running -= 1
+
+
+def test_latency_is_measured_from_token_chunks():
+    latency = StreamLatency()
+    latency.chunk_received(
+        InferenceResponse(request_id="1", status=InferenceStatusCodes.RUNNING)
+    )
+    assert latency.time_to_first_token is None
+
+    for _ in range(3):
+        latency.chunk_received(
+            InferenceResponse(
+                request_id="1",
+                status=InferenceStatusCodes.RUNNING,
+                raw_chunk=TOKEN_CHUNK,
+            )
+        )
+
+    assert latency.tokens == 3
+    assert latency.time_to_first_token >= 0
+    assert latency.inter_token_latency >= 0
+
+
+def test_passthrough_chunks_without_a_delta_are_not_tokens():
+    latency = StreamLatency()
+    for raw_chunk in [
+        '{"choices":[{"index":0,"delta":{"role":"assistant","content":""}}]}',
+        '{"choices":[{"index":0,"delta":{"content":null,"tool_calls":[]}}]}',
+        '{"choices":[],"usage":{"prompt_tokens":3,"completion_tokens":2}}',
+    ]:
+        latency.chunk_received(
+            InferenceResponse(
+                request_id="1",
+                status=InferenceStatusCodes.RUNNING,
+                raw_chunk=raw_chunk,
+            )
+        )
+    assert latency.tokens == 0
+
+    latency.chunk_received(
+        InferenceResponse(
+            request_id="1",
+            status=InferenceStatusCodes.RUNNING,
+            raw_chunk='{"choices":[{"index":0,"delta":{"tool_calls":[{"index":0}]}}]}',
+        )
+    )
+    assert latency.tokens == 1
+
+
+def test_limit_grows_only_while_saturated_and_backs_off_on_misses():
+    adaptive = AdaptiveLimit(
+        max_limit=8, time_to_first_token_slo=1, inter_token_latency_slo=0.1
+    )
+    adaptive.stats.limit = 4
+
+    for _ in range(4):
+        adaptive.update(_latency(0.5), saturated=False)
+    assert adaptive.limit == 4
+    for _ in range(4):
+        adaptive.update(_latency(0.5), saturated=True)
+    assert adaptive.limit == 5
+
+    adaptive.update(_latency(0.5, inter_token_latency=0.2), saturated=True)
+    assert adaptive.limit == 3
+    # The stream started before the decrease does not shrink the limit again
+    adaptive.update(_latency(2), saturated=True)
+    assert adaptive.limit == 3
+    assert (adaptive.stats.increases, adaptive.stats.decreases) == (1, 1)
+    assert adaptive.stats.violations == 2
+
+
+async def test_limit_converges_to_the_backend_capacity():
+    backend = SimulatedBackend(step_time=0.005, capacity=4, tokens=4)
+    # Steps are at most 1.5 times slower, so up to 6 streams fit the SLO
+    adaptive = AdaptiveLimit(
+        max_limit=32, time_to_first_token_slo=1, inter_token_latency_slo=0.0075
+    )
+    controller = AdmissionController(0, queue_depth=32, adaptive_limit=adaptive)
+    peak = 0
+
+    async def client(client_id: int):
+        nonlocal peak
+        for index in range(20):
+            ticket = controller.admit()
+            assert ticket is not None
+            try:
+                latency = await ticket.wait()
+                async for chunk in backend.execute(f"{client_id}-{index}"):
+                    peak = max(peak, backend.running)
+                    latency.chunk_received(chunk)
+                ticket.record(latency)
+            finally:
+                ticket.release()
+
+    await asyncio.gather(*[client(client_id) for client_id in range(16)])
+
+    assert adaptive.stats.decreases > 0
+    assert 2 <= controller.limit <= 12
+    assert (controller.running, controller.queued) == (0, 0)
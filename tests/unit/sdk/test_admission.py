@@ -0,0 +1,121 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from galadriel_node.llm_backends import vllm
+from galadriel_node.sdk.admission import AdmissionController
+from galadriel_node.sdk.inflight_registry import InflightRegistry
+from galadriel_node.sdk.node import run_node
+from galadriel_node.sdk.protocol.entities import (
+    InferenceErrorStatusCodes,
+    InferenceResponse,
+    InferenceStatusCodes,
+)
+from galadriel_node.sdk.websocket_writer import MessagePriority
+
+
+async def test_requests_over_the_limit_wait_then_get_rejected():
+    controller = AdmissionController(limit=2, queue_depth=1)
+
+    running = [controller.admit(), controller.admit()]
+    waiting = controller.admit()
+
+    assert all(ticket.holds_slot for ticket in running)
+    assert not waiting.holds_slot
+    assert controller.admit() is None
+    assert (controller.running, controller.queued) == (2, 1)
+    assert (controller.admitted, controller.rejected) == (3, 1)
+
+
+async def test_released_slot_goes_to_the_oldest_waiter():
+    controller = AdmissionController(limit=1, queue_depth=2)
+    running = controller.admit()
+    first = controller.admit()
+    second = controller.admit()
+    waiter = asyncio.create_task(first.wait())
+
+    running.release()
+    await asyncio.wait_for(waiter, timeout=1)
+
+    assert first.holds_slot
+    assert not second.holds_slot
+    assert (controller.running, controller.queued) == (1, 1)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    controller = AdmissionController(limit=1, queue_depth=1)
+    running = controller.admit()
+    waiting = controller.admit()
+    waiter = asyncio.create_task(waiting.wait())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    waiting.release()
+    running.release()
+    # Released twice, the slot is only returned once
+    running.release()
+
+    assert (controller.running, controller.queued) == (0, 0)
+
+
+def test_limit_is_read_from_the_vllm_command():
+    processes = [
+        vllm.VllmProcess(
+            pid=0, port=port, log_file="", command=["vllm", "--max_num_seqs", "128"]
+        )
+        for port in (1, 2)
+    ]
+
+    with patch.object(run_node.config, "GALADRIEL_MAX_CONCURRENT_REQUESTS", 0):
+        controller = run_node._create_admission(processes)
+        assert controller.limit == 256
+        # External backends do not expose their limit
+        assert run_node._create_admission([]) is None
+
+
+async def test_full_node_rejects_with_rate_limit():
+    class FakeLlm:
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def execute(self, request, is_benchmark=False):
+            await self.release.wait()
+            yield InferenceResponse(
+                request_id=request.id, status=InferenceStatusCodes.DONE
+            )
+
+    fake_llm = FakeLlm()
+    writer = MagicMock()
+    writer.send = AsyncMock()
+    connection = run_node.NodeConnection(
+        websocket=MagicMock(),
+        writer=writer,
+        protocol_handler=MagicMock(),
+        ping_pong_protocol=MagicMock(),
+        registry=InflightRegistry(),
+    )
+    controller = AdmissionController(limit=1, queue_depth=1)
+
+    with patch.object(run_node, "llm", fake_llm), patch.object(
+        run_node, "admission", controller
+    ):
+        for request_id in ("1", "2", "3"):
+            await run_node._start_inference(
+                connection, {"id": request_id, "chat_request": {"messages": []}}
+            )
+        # Only the rejection was sent, the other requests are running or waiting
+        rejection = json.loads(writer.send.await_args.args[0])
+        assert writer.send.await_args.args[1] == MessagePriority.CONTROL
+        assert rejection["request_id"] == "3"
+        assert rejection["status"] == InferenceStatusCodes.ERROR.value
+        assert (
+            rejection["error"]["status_code"]
+            == InferenceErrorStatusCodes.RATE_LIMIT.value
+        )
+
+        fake_llm.release.set()
+        await connection.registry.drain()
+
+    assert writer.send.await_count == 3
+    assert (controller.running, controller.queued) == (0, 0)
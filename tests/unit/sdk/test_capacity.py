@@ -0,0 +1,94 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from aiohttp import web
+
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.admission import AdmissionController
+from galadriel_node.sdk.capacity import CapacityMonitor, parse_kv_cache_usage
+from galadriel_node.sdk.llm_router import LlmRouter
+from galadriel_node.sdk.protocol.entities import NodeCapacity
+from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
+
+METRICS = """# HELP vllm:gpu_cache_usage_perc GPU KV-cache usage. 1 means 100 percent usage.
+# TYPE vllm:gpu_cache_usage_perc gauge
+vllm:gpu_cache_usage_perc{model_name="model"} 0.25
+vllm:gpu_cache_usage_perc_other{model_name="model"} 0.9
+vllm:num_requests_running{model_name="model"} 3.0
+"""
+
+PING = {
+    "protocol_version": "1.1",
+    "message_type": 1,
+    "node_id": "node_id",
+    "nonce": "nonce",
+    "rtt": 10,
+    "ping_streak": 1,
+    "miss_streak": 0,
+}
+
+
+def _ping_pong_protocol(capacity):
+    api_ping_job = MagicMock()
+    api_ping_job.get_and_clear_ping_time = AsyncMock(return_value=[12])
+    return PingPongProtocol(api_ping_job, capacity=capacity)
+
+
+def test_parse_kv_cache_usage():
+    assert parse_kv_cache_usage(METRICS) == 0.25
+    assert parse_kv_cache_usage("") is None
+
+
+async def test_snapshot_reads_backend_metrics_and_admission():
+    async def metrics(_):
+        return web.Response(text=METRICS)
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    router = LlmRouter([f"http://127.0.0.1:{port}"])
+    admission = AdmissionController(limit=1, queue_depth=2)
+    admission.admit()
+    admission.admit()
+    monitor = CapacityMonitor(router, admission)
+    try:
+        await monitor.refresh()
+        router.streamed_tokens = 100
+        await monitor.refresh()
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    snapshot = monitor.snapshot
+    assert (snapshot.queued, snapshot.admission_limit) == (1, 1)
+    assert snapshot.kv_cache_usage == 0.25
+    assert snapshot.tokens_per_second > 0
+
+
+async def test_pong_reports_capacity_from_version_1_1():
+    capacity = MagicMock()
+    capacity.snapshot = NodeCapacity(
+        in_flight=3, queued=1, tokens_per_second=42.5, admission_limit=8
+    )
+    protocol = _ping_pong_protocol(capacity)
+
+    pong = json.loads(await protocol.handle(PING, "node_id"))["data"]
+    assert pong["protocol_version"] == "1.1"
+    assert pong["capacity"] == {
+        "in_flight": 3,
+        "queued": 1,
+        "tokens_per_second": 42.5,
+        "kv_cache_usage": None,
+        "admission_limit": 8,
+    }
+
+    # Servers still on 1.0 get the pong they know
+    pong = json.loads(
+        await protocol.handle(dict(PING, protocol_version="1.0"), "node_id")
+    )["data"]
+    assert pong["protocol_version"] == "1.0"
+    assert "capacity" not in pong
+    assert await protocol.handle(dict(PING, protocol_version="2.0"), "node_id") is None
@@ -0,0 +1,48 @@
+from aiohttp import web
+
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.node import check_llm
+
+
+async def _start_server(completion_status: int):
+    completions = []
+
+    async def models(_):
+        return web.json_response({"data": []})
+
+    async def chat_completions(request):
+        completions.append(await request.json())
+        return web.json_response({"choices": []}, status=completion_status)
+
+    app = web.Application()
+    app.router.add_get("/v1/models/", models)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}", completions
+
+
+async def test_check_llm_generates_tokens_over_the_pooled_session():
+    runner, base_url, completions = await _start_server(200)
+    try:
+        assert await check_llm.execute(base_url, "mock_model")
+        session = http_client.get_session()
+        assert await check_llm.execute(base_url, "mock_model")
+        # Both checks went through the same session
+        assert http_client.get_session() is session
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    assert completions[0]["model"] == "mock_model"
+    assert completions[0]["max_tokens"] == 5
+
+
+async def test_check_llm_fails_when_generation_fails():
+    runner, base_url, _ = await _start_server(500)
+    try:
+        assert not await check_llm.execute(base_url, "mock_model")
+    finally:
+        await http_client.close()
+        await runner.cleanup()
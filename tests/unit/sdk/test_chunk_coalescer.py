@@ -0,0 +1,64 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+from galadriel_node.sdk.chunk_coalescer import ChunkCoalescer
+from galadriel_node.sdk.chunk_coalescer import CoalescingStats
+
+
+def _chunk(i: int) -> str:
+    return json.dumps({"request_id": "id", "chunk": {"i": i}})
+
+
+async def test_chunks_within_window_are_sent_as_one_frame():
+    writer = AsyncMock()
+    stats = CoalescingStats()
+    coalescer = ChunkCoalescer(writer, 0.01, 10_000, stats)
+
+    for i in range(3):
+        await coalescer.add(_chunk(i))
+    writer.send.assert_not_called()
+    await asyncio.sleep(0.05)
+
+    writer.send.assert_awaited_once()
+    batch = json.loads(writer.send.await_args.args[0])
+    assert [c["chunk"]["i"] for c in batch["batch"]] == [0, 1, 2]
+    assert stats.chunks == 3
+    assert stats.frames == 1
+
+
+async def test_flush_on_byte_budget():
+    writer = AsyncMock()
+    stats = CoalescingStats()
+    chunk = _chunk(0)
+    coalescer = ChunkCoalescer(writer, 10.0, len(chunk) * 2, stats)
+
+    await coalescer.add(chunk)
+    writer.send.assert_not_called()
+    await coalescer.add(chunk)
+
+    writer.send.assert_awaited_once()
+    assert len(json.loads(writer.send.await_args.args[0])["batch"]) == 2
+    await coalescer.close()
+    assert stats.frames == 1
+
+
+async def test_single_chunk_is_sent_unwrapped():
+    writer = AsyncMock()
+    coalescer = ChunkCoalescer(writer, 10.0, 10_000)
+
+    await coalescer.add(_chunk(0))
+    await coalescer.close()
+
+    writer.send.assert_awaited_once_with(_chunk(0), wait=False)
+
+
+async def test_discard_drops_buffered_chunks():
+    writer = AsyncMock()
+    coalescer = ChunkCoalescer(writer, window_seconds=0.01, max_bytes=1024)
+
+    await coalescer.add(_chunk(0))
+    coalescer.discard()
+    await asyncio.sleep(0.05)
+
+    writer.send.assert_not_called()
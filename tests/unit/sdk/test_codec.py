@@ -0,0 +1,21 @@
+import pytest
+
+from galadriel_node.sdk import codec
+
+
+def test_roundtrip():
+    data = {
+        "protocol": "ping-pong",
+        "data": {"nonce": "abc", "api_ping_time": [1, None]},
+    }
+
+    encoded = codec.dumps(data)
+
+    assert isinstance(encoded, str)
+    assert codec.loads(encoded) == data
+    assert codec.loads(encoded.encode("utf-8")) == data
+
+
+def test_invalid_json_raises_decode_error():
+    with pytest.raises(codec.DecodeError):
+        codec.loads("{not json")
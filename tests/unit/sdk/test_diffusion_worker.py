@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from galadriel_node.sdk.diffusion_worker import DiffusionQueueFullError
+from galadriel_node.sdk.diffusion_worker import DiffusionWorker
+
+
+class BlockingPipeline:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def generate_images(self, prompt, image, n):
+        self.started.set()
+        self.release.wait(timeout=5)
+        return [f"{prompt}-{i}" for i in range(n)]
+
+
+class FailingPipeline:
+    def generate_images(self, prompt, image, n):
+        raise ValueError("generation failed")
+
+
+async def test_submit_resolves_on_loop():
+    pipeline = BlockingPipeline()
+    pipeline.release.set()
+    worker = DiffusionWorker(pipeline, queue_depth=2)
+
+    images = await asyncio.wait_for(worker.submit("cat", None, 2), timeout=5)
+
+    assert images == ["cat-0", "cat-1"]
+    worker.stop()
+
+
+async def test_submit_does_not_block_loop():
+    pipeline = BlockingPipeline()
+    worker = DiffusionWorker(pipeline, queue_depth=2)
+
+    future = worker.submit("cat", None, 1)
+    await asyncio.to_thread(pipeline.started.wait, 5)
+    # The loop is free while the worker is generating
+    await asyncio.sleep(0.01)
+    assert not future.done()
+
+    pipeline.release.set()
+    assert await asyncio.wait_for(future, timeout=5) == ["cat-0"]
+    worker.stop()
+
+
+async def test_submit_rejects_when_queue_full():
+    pipeline = BlockingPipeline()
+    worker = DiffusionWorker(pipeline, queue_depth=1)
+
+    running = worker.submit("first", None, 1)
+    await asyncio.to_thread(pipeline.started.wait, 5)
+    queued = worker.submit("second", None, 1)
+
+    with pytest.raises(DiffusionQueueFullError):
+        worker.submit("third", None, 1)
+
+    pipeline.release.set()
+    assert await asyncio.wait_for(running, timeout=5) == ["first-0"]
+    assert await asyncio.wait_for(queued, timeout=5) == ["second-0"]
+    worker.stop()
+
+
+@pytest.mark.parametrize("queue_depth", [0, -1])
+async def test_queue_stays_bounded_without_a_positive_depth(queue_depth):
+    pipeline = BlockingPipeline()
+    worker = DiffusionWorker(pipeline, queue_depth=queue_depth)
+
+    running = worker.submit("first", None, 1)
+    await asyncio.to_thread(pipeline.started.wait, 5)
+    queued = worker.submit("second", None, 1)
+
+    with pytest.raises(DiffusionQueueFullError):
+        worker.submit("third", None, 1)
+
+    pipeline.release.set()
+    await asyncio.wait_for(asyncio.gather(running, queued), timeout=5)
+    worker.stop()
+
+
+async def test_submit_propagates_errors():
+    worker = DiffusionWorker(FailingPipeline(), queue_depth=1)
+
+    with pytest.raises(ValueError, match="generation failed"):
+        await asyncio.wait_for(worker.submit("cat", None, 1), timeout=5)
+    worker.stop()
@@ -0,0 +1,108 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import websockets
+
+from galadriel_node.sdk.node import run_node
+from galadriel_node.sdk.node.endpoint_selector import EndpointSelector
+
+
+class StandIn:
+    """
+    A local Galadriel server stand-in, its handshake takes `delay` seconds longer.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.node_connections: list = []
+        self.server = None
+        self.uri = ""
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(
+            self._handle, "127.0.0.1", 0, process_request=self._process_request
+        )
+        self.uri = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/ws"
+        return self
+
+    async def __aexit__(self, *_):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _process_request(self, _, headers):
+        await asyncio.sleep(self.delay)
+        if headers.get("Authorization") is None:
+            return 401, [], b""
+        return None
+
+    async def _handle(self, websocket):
+        self.node_connections.append(websocket)
+        await websocket.wait_closed()
+
+
+async def test_select_picks_the_fastest_endpoint():
+    async with StandIn(0.1) as slow, StandIn() as fast:
+        selector = EndpointSelector([slow.uri, fast.uri], 0.2, 60)
+        assert await selector.select() == fast.uri
+
+    assert selector.stats.latencies[slow.uri] > selector.stats.latencies[fast.uri]
+    # Probes are rejected without credentials, they never register as a node
+    assert slow.node_connections == [] and fast.node_connections == []
+
+
+async def test_switches_only_beyond_the_margin():
+    async with StandIn(0.05) as current, StandIn(0.04) as other:
+        selector = EndpointSelector([current.uri, other.uri], 0.5, 60)
+        await selector.probe()
+        # 20% faster is within the margin, the node stays
+        assert selector._better_endpoint() is None
+
+        other.delay = 0
+        for _ in range(3):
+            await selector.probe()
+        assert selector._better_endpoint() == other.uri
+
+
+async def test_failed_endpoint_moves_to_the_next():
+    async with StandIn() as first, StandIn(0.05) as second:
+        selector = EndpointSelector([first.uri, second.uri], 0.2, 60)
+        await selector.select()
+        selector.failed(first.uri)
+
+    assert selector.current == second.uri
+    assert selector.latency(first.uri) is None
+    assert selector.stats.switches == 1
+
+
+async def test_node_moves_to_a_faster_endpoint_before_leaving_the_old_one():
+    api_ping_job = MagicMock()
+    api_ping_job.run = AsyncMock()
+    async with StandIn() as first, StandIn(0.2) as second:
+        rpc_urls = ",".join(uri.removesuffix("/ws") for uri in [first.uri, second.uri])
+        with patch.object(run_node.config, "GALADRIEL_RPC_PROBE_INTERVAL", 0.05), patch(
+            "galadriel_node.sdk.node.run_node.ApiPingJob", return_value=api_ping_job
+        ) as mock_api_ping_job, patch.object(
+            run_node.config, "GALADRIEL_API_DOMAIN", ""
+        ):
+            node = asyncio.create_task(
+                run_node._retry_connection(rpc_urls, "api_key", "node_id")
+            )
+            try:
+                while not first.node_connections:
+                    await asyncio.sleep(0.01)
+                first.delay, second.delay = 0.2, 0
+                while not second.node_connections:
+                    await asyncio.sleep(0.01)
+                # The old connection is closed once it drained
+                await asyncio.wait_for(
+                    first.node_connections[0].wait_closed(), timeout=5
+                )
+            finally:
+                node.cancel()
+                await asyncio.gather(node, return_exceptions=True)
+
+    assert len(first.node_connections) == 1
+    assert len(second.node_connections) == 1
+    # The API ping follows the endpoint the node is connected to
+    assert mock_api_ping_job.call_args.args[0] == first.uri.split("/")[2]
+    api_ping_job.set_domain.assert_called_with(second.uri.split("/")[2])
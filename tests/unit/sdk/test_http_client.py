@@ -0,0 +1,79 @@
+import asyncio
+from http import HTTPStatus
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from galadriel_node.sdk import api
+from galadriel_node.sdk import http_client
+
+
+async def _start_server(handler):
+    app = web.Application()
+    app.router.add_get("/node/info", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+async def test_memoized_get_is_fetched_once():
+    calls = []
+
+    async def node_info(_):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return web.json_response({"status": "online"})
+
+    runner, api_url = await _start_server(node_info)
+    try:
+        results = await asyncio.gather(
+            *[api.get(api_url, "node/info", "key", memoize=True) for _ in range(3)]
+        )
+        results[0][1]["status"] = "changed"
+        _, later = await api.get(api_url, "node/info", "key", memoize=True)
+        http_client.forget_responses()
+        await api.get(api_url, "node/info", "key", memoize=True)
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    assert results[1:] == [(HTTPStatus.OK, {"status": "online"})] * 2
+    # Callers get their own copy of the memoized response
+    assert later == {"status": "online"}
+    assert len(calls) == 2
+
+
+async def test_retries_connection_errors_only(monkeypatch):
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise aiohttp.ClientConnectionError()
+        return "ok"
+
+    monkeypatch.setattr(http_client, "RETRY_BASE_DELAY", 0)
+    assert await http_client.with_retry(call, retry_on=http_client.GET_ERRORS) == "ok"
+    assert len(attempts) == 3
+
+    async def fails():
+        attempts.append(1)
+        raise ValueError()
+
+    attempts.clear()
+    with pytest.raises(ValueError):
+        await http_client.with_retry(fails)
+    assert len(attempts) == 1
+
+
+def test_session_is_recreated_for_a_new_loop():
+    async def get_session():
+        return http_client.get_session()
+
+    first = asyncio.run(http_client.closing(get_session()))
+    second = asyncio.run(http_client.closing(get_session()))
+
+    assert first.closed
+    assert first is not second
@@ -0,0 +1,141 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+from aiohttp import web
+
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.inflight_registry import InflightRegistry, RequestState
+from galadriel_node.sdk.llm import Llm
+from galadriel_node.sdk.protocol.entities import InferenceRequest
+from galadriel_node.sdk.protocol.inference_cancel_protocol import (
+    InferenceCancelProtocol,
+)
+
+CHUNK = (
+    '{"id":"1","object":"chat.completion.chunk","created":1,"model":"m",'
+    '"choices":[{"index":0,"delta":{"content":"hi"},"finish_reason":null}]}'
+)
+
+
+async def _wait_forever():
+    await asyncio.Event().wait()
+
+
+async def test_cancel_request():
+    registry = InflightRegistry()
+    request = registry.start("id1", _wait_forever())
+    registry.start("id2", asyncio.sleep(0))
+    await asyncio.sleep(0)
+
+    assert registry.cancel("id1", "test")
+    await registry.drain()
+
+    assert request.state == RequestState.CANCELLED
+    assert request.cancel_reason == "test"
+    assert len(registry) == 0
+    assert (registry.completed, registry.cancelled) == (1, 1)
+    assert not registry.cancel("id1", "test")
+
+
+async def test_cancel_all_on_connection_loss():
+    registry = InflightRegistry()
+    for i in range(3):
+        registry.start(f"id{i}", _wait_forever())
+
+    assert registry.cancel_all("connection closed") == 3
+    await registry.drain()
+
+    assert registry.cancelled == 3
+
+
+async def test_record_chunk_and_failure():
+    registry = InflightRegistry()
+
+    async def fail():
+        raise ValueError("boom")
+
+    request = registry.start("id", _wait_forever())
+    registry.record_chunk("id", 10)
+    registry.record_chunk("id", 5)
+    assert (request.chunks, request.bytes_sent) == (2, 15)
+    assert request.first_chunk_at is not None
+    registry.cancel("id", "test")
+
+    failing = registry.start("failing", fail())
+    await registry.drain()
+
+    assert failing.state == RequestState.FAILED
+    assert registry.failed == 1
+
+
+async def test_duplicate_request_id_replaces_the_old_one():
+    registry = InflightRegistry()
+    old = registry.start("id", _wait_forever())
+    new = registry.start("id", _wait_forever())
+    await asyncio.sleep(0)
+
+    assert old.state == RequestState.CANCELLED
+    assert registry.get("id") is new
+    registry.cancel_all("test")
+    await registry.drain()
+
+
+async def test_cancel_protocol():
+    registry = InflightRegistry()
+    request = registry.start("id", _wait_forever())
+    protocol = InferenceCancelProtocol(registry)
+
+    data = {"protocol_version": "1.0", "node_id": "other", "request_id": "id"}
+    assert await protocol.handle(data, "node") is None
+    assert request.state == RequestState.RUNNING
+
+    data["node_id"] = "node"
+    assert await protocol.handle(data, "node") is None
+    await registry.drain()
+    assert request.state == RequestState.CANCELLED
+
+
+@pytest.mark.parametrize("sse_passthrough", [True, False])
+async def test_cancel_closes_the_backend_stream(sse_passthrough):
+    disconnected = asyncio.Event()
+    first_chunk = asyncio.Event()
+
+    async def handler(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        try:
+            while True:
+                await response.write(f"data: {CHUNK}\n\n".encode())
+                await asyncio.sleep(0.01)
+        except (ConnectionResetError, asyncio.CancelledError):
+            disconnected.set()
+            raise
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    llm = Llm(f"http://127.0.0.1:{runner.addresses[0][1]}", sse_passthrough)
+
+    async def consume():
+        request = InferenceRequest(id="id", chat_request={"model": "m", "messages": []})
+        async with aclosing(llm.execute(request)) as chunks:
+            async for _ in chunks:
+                first_chunk.set()
+                # Cancelled while waiting on the websocket, not inside the HTTP read
+                await asyncio.Event().wait()
+
+    registry = InflightRegistry()
+    try:
+        registry.start("id", consume())
+        await asyncio.wait_for(first_chunk.wait(), timeout=5)
+        registry.cancel("id", "connection closed")
+        await registry.drain()
+
+        await asyncio.wait_for(disconnected.wait(), timeout=5)
+    finally:
+        await http_client.close()
+        await runner.cleanup()
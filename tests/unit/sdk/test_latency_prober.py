@@ -0,0 +1,55 @@
+import asyncio
+
+from galadriel_node.sdk.latency_prober import LatencyProber
+from galadriel_node.sdk.latency_prober import parse_target
+from galadriel_node.sdk.latency_prober import percentile
+from galadriel_node.sdk.latency_prober import probe
+
+
+async def _start_server():
+    async def handle(_, writer):
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def test_parse_target():
+    assert parse_target("api.galadriel.com") == ("api.galadriel.com", 443)
+    assert parse_target("127.0.0.1:8080") == ("127.0.0.1", 8080)
+    assert parse_target("[::1]:8080") == ("::1", 8080)
+
+
+def test_percentile():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) is None
+
+
+async def test_probe_measures_tcp_connect():
+    server, target = await _start_server()
+    async with server:
+        result = await probe(target, tls=False)
+        # A plain TCP server fails the TLS handshake, the connect still counts
+        with_tls = await probe(target, timeout=1)
+
+    assert result.tcp_connect is not None and result.tcp_connect >= 0
+    assert result.rtt == result.tcp_connect
+    assert with_tls.tcp_connect is not None
+    assert with_tls.tls_handshake is None
+
+
+async def test_prober_keeps_a_window_per_target():
+    server, target = await _start_server()
+    # Nothing listens on port 1, the connection is refused
+    prober = LatencyProber([target, "127.0.0.1:1"], tls=False, window=3)
+    async with server:
+        for _ in range(5):
+            await prober.probe_all()
+
+    reachable, refused = prober.summaries()
+    assert (reachable.samples, reachable.failures) == (3, 0)
+    assert reachable.p50 is not None
+    assert (refused.samples, refused.failures) == (3, 3)
+    assert refused.p50 is None
@@ -1,7 +1,9 @@
+import json
 from urllib.parse import urljoin
 
 import openai
 import pytest
+from aiohttp import web
 from openai.types.chat import ChatCompletion
 from openai.types.chat import ChatCompletionChunk
 from openai.types.chat import ChatCompletionMessage
@@ -22,6 +24,7 @@ from galadriel_node.sdk.protocol.entities import (
     InferenceStatusCodes,
     InferenceErrorStatusCodes,
 )
+from galadriel_node.sdk import http_client
 from galadriel_node.sdk.llm import Llm
 
 INFERENCE_BASE_URL = "https://api.openai.com/v1"
@@ -207,3 +210,72 @@ async def test_detect_llm_engine(owned_by: str, llm_engine: LLMEngine):
 
     await llm.detect_llm_engine()
     assert llm.engine == llm_engine
+
+
+def _sse_app(events, status=200, body=""):
+    async def handler(request):
+        if status != 200:
+            return web.Response(status=status, text=body)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for event in events:
+            await response.write(f"data: {event}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handler)
+    return app
+
+
+async def _start_server(app) -> tuple:
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def test_llm_execute_sse_passthrough():
+    events = [
+        '{"id":"1","choices":[{"index":0,"delta":{"content":"hi"},"finish_reason":null}],"usage":null}',
+        '{"id":"1","choices":[{"index":0,"delta":{"content":""},"finish_reason":"stop"}],"usage":null}',
+        '{"id":"1","choices":[],"usage":{"prompt_tokens":3,"completion_tokens":2,"total_tokens":5}}',
+    ]
+    runner, base_url = await _start_server(_sse_app(events))
+    llm = Llm(base_url, sse_passthrough=True)
+    try:
+        request = InferenceRequest(id="test_id", chat_request={"model": "m"})
+        results = [item async for item in llm.execute(request)]
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    assert [r.raw_chunk for r in results[:3]] == events
+    assert results[0].status == InferenceStatusCodes.RUNNING
+    assert results[3].status == InferenceStatusCodes.DONE
+    # The raw chunk is spliced into the envelope as-is
+    assert json.loads(results[0].to_json()) == {
+        "request_id": "test_id",
+        "error": None,
+        "chunk": json.loads(events[0]),
+        "status": InferenceStatusCodes.RUNNING.value,
+    }
+
+
+async def test_llm_execute_sse_passthrough_http_error():
+    runner, base_url = await _start_server(_sse_app([], status=400, body="bad request"))
+    llm = Llm(base_url, sse_passthrough=True)
+    try:
+        request = InferenceRequest(id="test_id", chat_request={"model": "m"})
+        results = [item async for item in llm.execute(request)]
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    assert len(results) == 1
+    assert results[0].status == InferenceStatusCodes.ERROR
+    assert results[0].error.status_code == InferenceErrorStatusCodes.BAD_REQUEST
+    assert results[0].error.message == "LLM Engine error: Error code: 400 - bad request"
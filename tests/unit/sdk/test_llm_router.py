@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from galadriel_node.sdk.llm_router import LlmRouter
+from galadriel_node.sdk.protocol.entities import (
+    InferenceErrorStatusCodes,
+    InferenceRequest,
+    InferenceResponse,
+    InferenceStatusCodes,
+)
+
+BACKENDS = ["http://127.0.0.1:8001", "http://127.0.0.1:8002"]
+
+
+def _mock_execute(release: asyncio.Event):
+    async def execute(request, is_benchmark=False):
+        await release.wait()
+        yield InferenceResponse(request_id=request.id, status=InferenceStatusCodes.DONE)
+
+    return execute
+
+
+async def _drain(router: LlmRouter, request_id: str):
+    return [
+        chunk
+        async for chunk in router.execute(
+            InferenceRequest(id=request_id, chat_request={})
+        )
+    ]
+
+
+async def test_requests_go_to_least_loaded_backend():
+    router = LlmRouter(BACKENDS)
+    release = asyncio.Event()
+    for backend in router.backends:
+        backend.llm.execute = MagicMock(side_effect=_mock_execute(release))
+
+    tasks = [asyncio.create_task(_drain(router, f"id{i}")) for i in range(4)]
+    await asyncio.sleep(0)
+
+    assert [b.in_flight for b in router.backends] == [2, 2]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert router.in_flight() == 0
+
+
+async def test_unhealthy_backend_is_skipped():
+    router = LlmRouter(BACKENDS)
+    release = asyncio.Event()
+    release.set()
+    for backend in router.backends:
+        backend.llm.execute = MagicMock(side_effect=_mock_execute(release))
+    router.set_healthy(BACKENDS[0], False)
+
+    await _drain(router, "id")
+
+    router.backends[0].llm.execute.assert_not_called()
+    router.backends[1].llm.execute.assert_called_once()
+
+
+async def test_no_healthy_backend_returns_error():
+    router = LlmRouter(BACKENDS)
+    for url in BACKENDS:
+        router.set_healthy(url, False)
+
+    results = await _drain(router, "id")
+
+    assert len(results) == 1
+    assert results[0].status == InferenceStatusCodes.ERROR
+    assert results[0].error.status_code == InferenceErrorStatusCodes.UNKNOWN_ERROR
+
+
+async def test_probe_ejects_and_readmits_backend():
+    router = LlmRouter(BACKENDS)
+    backend = router.backends[0]
+
+    with patch(
+        "galadriel_node.sdk.node.checks.llm_http_check.execute", new_callable=AsyncMock
+    ) as mock_http_check:
+        mock_http_check.side_effect = Exception("connection refused")
+        await router._probe(backend)
+        assert not backend.healthy
+
+        mock_http_check.side_effect = None
+        mock_http_check.return_value.ok = True
+        await router._probe(backend)
+        assert backend.healthy
@@ -0,0 +1,73 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
+from galadriel_node.sdk.protocol.protocol_handler import (
+    MessageKind,
+    ProtocolHandler,
+    classify,
+)
+
+INFERENCE = {"id": "1", "chat_request": {"messages": []}}
+IMAGE_GENERATION = {"request_id": "1", "prompt": "a cat", "image": None, "n": 1}
+PING = {
+    "protocol": "ping-pong",
+    "data": {
+        "protocol_version": "1.0",
+        "message_type": 1,
+        "node_id": "node_id",
+        "nonce": "nonce",
+        "rtt": 10,
+        "ping_streak": 1,
+        "miss_streak": 0,
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "message, kind",
+    [
+        (INFERENCE, MessageKind.INFERENCE),
+        (IMAGE_GENERATION, MessageKind.IMAGE_GENERATION),
+        (PING, MessageKind.PROTOCOL),
+        ({"foo": "bar"}, MessageKind.UNKNOWN),
+        ([1, 2], MessageKind.UNKNOWN),
+    ],
+)
+def test_classify(message, kind):
+    assert classify(message) == kind
+
+
+async def test_dispatch_routes_by_kind():
+    writer = MagicMock()
+    writer.send = AsyncMock()
+    handler = ProtocolHandler("node_id", writer)
+    api_ping_job = MagicMock()
+    api_ping_job.get_and_clear_ping_time = AsyncMock(return_value=[])
+    handler.register("ping-pong", PingPongProtocol(api_ping_job))
+    inference_handler = AsyncMock()
+    handler.register_handler(MessageKind.INFERENCE, inference_handler)
+
+    await handler.dispatch(INFERENCE)
+    await handler.dispatch(PING)
+    # No image generation handler is registered on an LLM node
+    await handler.dispatch(IMAGE_GENERATION)
+
+    inference_handler.assert_awaited_once_with(INFERENCE)
+    writer.send.assert_awaited_once()
+    assert '"message_type":2' in writer.send.await_args.args[0].replace(" ", "")
+
+
+async def test_ping_pong_ignores_invalid_message_type():
+    protocol = PingPongProtocol(MagicMock())
+    data = dict(PING["data"], message_type=7)
+
+    assert await protocol.handle(data, "node_id") is None
+    assert (
+        await protocol.handle(
+            dict(PING["data"], message_type=3, reconnect_request=False), "node_id"
+        )
+        is None
+    )
+    assert not await protocol.get_reconnect_requested()
@@ -0,0 +1,197 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import websockets
+
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.inflight_registry import InflightRegistry
+from galadriel_node.sdk.node import run_node
+from galadriel_node.sdk.protocol.entities import (
+    InferenceResponse,
+    InferenceStatusCodes,
+)
+from galadriel_node.sdk.protocol.ping_pong_protocol import PingPongProtocol
+from galadriel_node.sdk.protocol.protocol_handler import ProtocolHandler
+
+RECONNECT_REQUEST = {
+    "protocol": "ping-pong",
+    "data": {
+        "protocol_version": "1.0",
+        "message_type": 3,
+        "node_id": "node_id",
+        "nonce": "nonce",
+        "reconnect_request": True,
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+async def close_http_session():
+    yield
+    # The capacity monitor of the node scrapes the backends with the shared session
+    await http_client.close()
+
+
+class FakeLlm:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def execute(self, request, is_benchmark=False):
+        yield InferenceResponse(
+            request_id=request.id, status=InferenceStatusCodes.RUNNING
+        )
+        await self.release.wait()
+        yield InferenceResponse(request_id=request.id, status=InferenceStatusCodes.DONE)
+
+
+async def test_reconnect_opens_new_connection_before_closing_the_old_one():
+    received = []
+    second_connected = asyncio.Event()
+    first_closed = asyncio.Event()
+
+    async def handler(websocket):
+        index = len(received)
+        received.append([])
+        if index == 0:
+            await websocket.send(json.dumps({"id": "req", "chat_request": {}}))
+            await websocket.send(json.dumps(RECONNECT_REQUEST))
+        else:
+            second_connected.set()
+        try:
+            async for message in websocket:
+                received[index].append(json.loads(message))
+        finally:
+            if index == 0:
+                first_closed.set()
+
+    fake_llm = FakeLlm()
+    api_ping_job = MagicMock()
+    api_ping_job.run = AsyncMock()
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        with patch.object(run_node, "llm", fake_llm), patch(
+            "galadriel_node.sdk.node.run_node.ApiPingJob", return_value=api_ping_job
+        ):
+            node = asyncio.create_task(
+                run_node._retry_connection(
+                    f"ws://127.0.0.1:{port}", "api_key", "node_id"
+                )
+            )
+            try:
+                # No backoff sleep and no waiting for the stream to finish
+                await asyncio.wait_for(second_connected.wait(), timeout=5)
+                assert not first_closed.is_set()
+
+                fake_llm.release.set()
+                await asyncio.wait_for(first_closed.wait(), timeout=5)
+            finally:
+                node.cancel()
+                await asyncio.gather(node, return_exceptions=True)
+
+    statuses = [message["status"] for message in received[0]]
+    assert statuses == [
+        InferenceStatusCodes.RUNNING.value,
+        InferenceStatusCodes.DONE.value,
+    ]
+    assert received[1] == []
+
+
+async def test_standby_connection_takes_over():
+    connections = []
+    standby_promoted = asyncio.Event()
+
+    async def handler(websocket):
+        connections.append(websocket)
+        if websocket.request_headers.get("Standby") is None:
+            # Drop the active connection once the standby is up
+            while len(connections) < 2:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            await websocket.close(code=1011)
+            return
+        async for message in websocket:
+            if json.loads(message).get("protocol") == "standby":
+                standby_promoted.set()
+
+    api_ping_job = MagicMock()
+    api_ping_job.run = AsyncMock()
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        with patch.object(run_node.config, "GALADRIEL_RECONNECT_STANDBY", True), patch(
+            "galadriel_node.sdk.node.run_node.ApiPingJob", return_value=api_ping_job
+        ):
+            node = asyncio.create_task(
+                run_node._retry_connection(
+                    f"ws://127.0.0.1:{port}", "api_key", "node_id"
+                )
+            )
+            try:
+                # Without waiting for the backoff of the failed connection
+                await asyncio.wait_for(standby_promoted.wait(), timeout=1)
+            finally:
+                node.cancel()
+                await asyncio.gather(node, return_exceptions=True)
+
+    standby_headers = [ws.request_headers.get("Standby") for ws in connections]
+    assert standby_headers[:2] == [None, "true"]
+
+
+class FakeWebsocket:
+    def __init__(self, messages):
+        self.messages = messages
+        self.closed = asyncio.Event()
+        self.open = True
+
+    async def recv(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await self.closed.wait()
+        raise websockets.ConnectionClosedOK(None, None)
+
+
+def _connection(websocket):
+    writer = MagicMock()
+    return run_node.NodeConnection(
+        websocket=websocket,
+        writer=writer,
+        protocol_handler=ProtocolHandler("node_id", writer),
+        ping_pong_protocol=PingPongProtocol(MagicMock()),
+        registry=InflightRegistry(),
+    )
+
+
+async def test_messages_do_not_create_tasks():
+    messages = [json.dumps({"protocol": "unknown", "data": {}})] * 50
+    websocket = FakeWebsocket(messages)
+    connection = _connection(websocket)
+
+    handler = asyncio.create_task(run_node._handle_websocket_messages(connection))
+    with patch.object(
+        run_node.asyncio, "create_task", wraps=asyncio.create_task
+    ) as create_task:
+        while websocket.messages:
+            await asyncio.sleep(0)
+        websocket.closed.set()
+        result = await asyncio.wait_for(handler, timeout=1)
+
+    assert result.retry
+    # The reader and the reconnect watcher
+    assert create_task.call_count == 2
+
+
+async def test_reconnect_request_is_handled_right_away():
+    websocket = FakeWebsocket([])
+    connection = _connection(websocket)
+
+    handler = asyncio.create_task(run_node._handle_websocket_messages(connection))
+    await asyncio.sleep(0)
+    await connection.ping_pong_protocol.set_reconnect_requested(True)
+    result = await asyncio.wait_for(handler, timeout=0.1)
+
+    assert result.immediate
+    assert not await connection.ping_pong_protocol.get_reconnect_requested()
+    # The reader keeps serving the old connection while it drains
+    assert not connection.reader.done()
+    connection.reader.cancel()
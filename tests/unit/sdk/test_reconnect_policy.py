@@ -0,0 +1,89 @@
+import random
+
+from galadriel_node.config import Config
+from galadriel_node.sdk.node.reconnect_policy import (
+    BACKOFF_MAX,
+    BACKOFF_MIN,
+    JITTER_BASE,
+    STABLE_UPTIME,
+    DisconnectKind,
+    ExponentialReconnectPolicy,
+    JitteredReconnectPolicy,
+    ReconnectStats,
+    get_reconnect_policy,
+)
+
+
+def test_jitter_policy_retries_clean_close_immediately():
+    policy = JitteredReconnectPolicy()
+
+    assert policy.next_delay(DisconnectKind.CLEAN, uptime=STABLE_UPTIME) == 0
+    assert policy.next_delay(DisconnectKind.CLEAN, uptime=STABLE_UPTIME) == 0
+    # A server closing every connection right away is backed off
+    assert policy.next_delay(DisconnectKind.CLEAN, uptime=0) == 0
+    assert policy.next_delay(DisconnectKind.CLEAN, uptime=0) >= JITTER_BASE
+
+
+def test_jitter_policy_spreads_failures():
+    random.seed(1)
+    delays = [
+        JitteredReconnectPolicy().next_delay(DisconnectKind.FAILED, uptime=0)
+        for _ in range(20)
+    ]
+
+    assert all(JITTER_BASE <= delay <= 3 * JITTER_BASE for delay in delays)
+    assert len(set(delays)) == len(delays)
+
+
+def test_jitter_policy_backs_off_up_to_the_cap():
+    random.seed(1)
+    policy = JitteredReconnectPolicy()
+    delays = [policy.next_delay(DisconnectKind.THROTTLED, uptime=0) for _ in range(30)]
+
+    assert all(BACKOFF_MIN <= delay <= BACKOFF_MAX for delay in delays)
+    assert max(delays) > BACKOFF_MAX / 2
+    # A stable connection resets the backoff
+    assert policy.next_delay(DisconnectKind.FAILED, uptime=STABLE_UPTIME) <= (
+        3 * JITTER_BASE
+    )
+
+
+def test_exponential_policy_resets_after_clean_close():
+    policy = ExponentialReconnectPolicy()
+
+    assert policy.next_delay(DisconnectKind.FAILED, uptime=0) == BACKOFF_MIN
+    assert policy.next_delay(DisconnectKind.FAILED, uptime=0) > BACKOFF_MIN
+    assert policy.next_delay(DisconnectKind.CLEAN, uptime=0) == BACKOFF_MIN
+
+
+def test_exponential_policy_resets_after_long_lived_abnormal_close():
+    policy = ExponentialReconnectPolicy()
+
+    # E.g. 1006 closes of connections that were up for an hour each
+    delays = [policy.next_delay(DisconnectKind.FAILED, uptime=3600) for _ in range(5)]
+
+    assert delays == [BACKOFF_MIN] * 5
+    # Failing again right away still backs off
+    assert policy.next_delay(DisconnectKind.FAILED, uptime=0) > BACKOFF_MIN
+
+
+def test_reconnect_stats():
+    stats = ReconnectStats(policy="jitter")
+    stats.connected()
+    assert stats.reconnects == 0
+
+    stats.disconnected()
+    stats.connected()
+    stats.disconnected()
+    stats.connected()
+
+    assert stats.reconnects == 2
+    assert 0 <= stats.mean_gap <= stats.max_gap
+
+
+def test_exponential_policy_is_the_default(monkeypatch):
+    monkeypatch.delenv("GALADRIEL_RECONNECT_POLICY", raising=False)
+    assert isinstance(
+        get_reconnect_policy(Config(is_load_env=False).GALADRIEL_RECONNECT_POLICY),
+        ExponentialReconnectPolicy,
+    )
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.node.startup import StartupTimeline, run_concurrently
+
+
+async def test_phases_run_concurrently():
+    timeline = StartupTimeline()
+    started = time.monotonic()
+
+    await run_concurrently(
+        timeline.phase("llm", asyncio.sleep(0.2)),
+        timeline.phase("hardware", asyncio.sleep(0.2)),
+    )
+
+    assert time.monotonic() - started < 0.35
+    assert [phase.name for phase in timeline.phases] == ["llm", "hardware"]
+    assert all(phase.duration >= 0.2 for phase in timeline.phases)
+
+
+async def test_earliest_failure_is_raised_after_all_phases_finish():
+    timeline = StartupTimeline()
+    finished = []
+
+    async def fail(message: str, delay: float):
+        await asyncio.sleep(delay)
+        raise SdkError(message)
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        finished.append("slow")
+
+    with pytest.raises(SdkError, match="llm"):
+        await run_concurrently(
+            timeline.phase("llm", fail("llm", 0.05)),
+            timeline.phase("hardware", fail("hardware", 0)),
+            timeline.phase("slow", slow()),
+        )
+
+    assert finished == ["slow"]
+    assert [phase.failed for phase in timeline.phases] == [True, True, False]
+
+
+async def test_render_timeline():
+    timeline = StartupTimeline()
+    await timeline.phase("version check", asyncio.sleep(0))
+    with pytest.raises(SdkError):
+        await timeline.phase("vLLM start", _raise())
+
+    rendered = timeline.render().splitlines()
+
+    assert rendered[0].startswith("Startup timeline")
+    assert "version check" in rendered[1]
+    assert rendered[2].endswith("failed")
+
+
+async def _raise():
+    raise SdkError("failed")
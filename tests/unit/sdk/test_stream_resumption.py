@@ -0,0 +1,204 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import websockets
+
+from galadriel_node.sdk import http_client
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.inflight_registry import InflightRegistry
+from galadriel_node.sdk.node import run_node
+from galadriel_node.sdk.protocol.entities import (
+    InferenceResponse,
+    InferenceStatusCodes,
+)
+from galadriel_node.sdk.stream_resumption import (
+    RESUMPTION_HEADER,
+    ResumableStream,
+    StreamResumer,
+)
+
+
+@pytest.fixture(autouse=True)
+async def close_http_session():
+    yield
+    # The capacity monitor of the node scrapes the backends with the shared session
+    await http_client.close()
+
+
+def _chunk():
+    return InferenceResponse(request_id="req", status=InferenceStatusCodes.RUNNING)
+
+
+# Room for a single encoded chunk
+MAX_BYTES = len(_chunk().to_json()) + 10
+
+
+class FakeLlm:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def execute(self, request, is_benchmark=False):
+        yield InferenceResponse(
+            request_id=request.id, status=InferenceStatusCodes.RUNNING
+        )
+        yield InferenceResponse(
+            request_id=request.id, status=InferenceStatusCodes.RUNNING
+        )
+        await self.release.wait()
+        yield InferenceResponse(request_id=request.id, status=InferenceStatusCodes.DONE)
+
+
+async def test_ack_drops_buffered_chunks():
+    writer = MagicMock()
+    writer.send = AsyncMock()
+    stream = ResumableStream("req", writer, max_bytes=10000, max_age=30)
+    for _ in range(3):
+        await stream.send(_chunk())
+
+    stream.ack(1)
+
+    assert writer.send.await_count == 3
+    assert (stream.first_seq, stream.next_seq) == (2, 3)
+    assert json.loads(writer.send.await_args.args[0])["seq"] == 2
+
+
+async def test_detached_stream_fails_when_buffer_is_full():
+    stream = ResumableStream("req", None, max_bytes=MAX_BYTES, max_age=30)
+    await stream.send(_chunk())
+
+    with pytest.raises(SdkError):
+        await stream.send(_chunk())
+    assert stream.truncated
+
+
+async def test_connected_stream_over_bounds_is_not_resumable():
+    writer = MagicMock()
+    writer.send = AsyncMock()
+    stream = ResumableStream("req", writer, max_bytes=MAX_BYTES, max_age=30)
+    await stream.send(_chunk())
+    await stream.send(_chunk())
+
+    assert stream.truncated
+    assert stream.first_seq == 1
+
+
+async def test_overflowed_stream_is_not_resumed():
+    resumer = StreamResumer(max_bytes=MAX_BYTES, max_age=30)
+    registry = InflightRegistry()
+    writer = MagicMock()
+    writer.send = AsyncMock()
+    for request_id in ["running", "finished"]:
+        resumer.open(request_id, writer)
+    running = registry.start("running", asyncio.Event().wait())
+    registry.start("finished", asyncio.sleep(0))
+
+    await resumer.disconnected(registry, writer)
+    for request_id in ["running", "finished"]:
+        stream = resumer.get(request_id)
+        await stream.send(_chunk())
+        with pytest.raises(SdkError):
+            await stream.send(_chunk())
+    # The request gave up on the full buffer, it never sent a final chunk
+    resumer.finish("finished")
+    assert resumer.get("finished") is None
+
+    new_writer = MagicMock()
+    new_writer.send = AsyncMock()
+    await resumer.connected("node_id", InflightRegistry(), new_writer)
+    await asyncio.gather(running.task, return_exceptions=True)
+
+    new_writer.send.assert_not_awaited()
+    assert running.task.cancelled()
+    assert resumer.get("running") is None
+    assert resumer.resumed == 0
+
+
+async def test_expired_request_is_cancelled():
+    resumer = StreamResumer(max_bytes=10000, max_age=0)
+    registry = InflightRegistry()
+    writer = MagicMock()
+    resumer.open("req", writer)
+    request = registry.start("req", asyncio.Event().wait())
+
+    await resumer.disconnected(registry, writer)
+    assert len(registry) == 0
+    await asyncio.sleep(0.01)
+    resumer.sweep()
+    await asyncio.gather(request.task, return_exceptions=True)
+
+    assert request.task.cancelled()
+    assert resumer.expired == 1
+    assert resumer.get("req") is None
+
+
+async def test_stream_resumes_on_new_connection():
+    received = []
+    first_closed = asyncio.Event()
+    resumed = asyncio.Event()
+
+    async def handler(websocket):
+        index = len(received)
+        received.append([])
+        if index == 0:
+            await websocket.send(
+                json.dumps({"id": "req", "chat_request": {"messages": []}})
+            )
+        async for message in websocket:
+            message = json.loads(message)
+            received[index].append(message)
+            if index == 0 and message.get("seq") == 1:
+                # Ack the first chunk only, then drop the connection
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "protocol": "stream-ack",
+                            "data": {
+                                "protocol_version": "1.0",
+                                "node_id": "node_id",
+                                "request_id": "req",
+                                "seq": 0,
+                            },
+                        }
+                    )
+                )
+                await websocket.close()
+                first_closed.set()
+            if index == 1 and message.get("status") == InferenceStatusCodes.DONE.value:
+                resumed.set()
+
+    fake_llm = FakeLlm()
+    api_ping_job = MagicMock()
+    api_ping_job.run = AsyncMock()
+    async with websockets.serve(
+        handler, "127.0.0.1", 0, extra_headers={RESUMPTION_HEADER: "1.0"}
+    ) as server:
+        port = server.sockets[0].getsockname()[1]
+        # The jitter policy retries the clean close right away
+        with patch.object(run_node, "llm", fake_llm), patch.object(
+            run_node.config, "GALADRIEL_STREAM_RESUMPTION", True
+        ), patch.object(run_node.config, "GALADRIEL_RECONNECT_POLICY", "jitter"), patch(
+            "galadriel_node.sdk.node.run_node.ApiPingJob", return_value=api_ping_job
+        ):
+            node = asyncio.create_task(
+                run_node._retry_connection(
+                    f"ws://127.0.0.1:{port}", "api_key", "node_id"
+                )
+            )
+            try:
+                await asyncio.wait_for(first_closed.wait(), timeout=5)
+                fake_llm.release.set()
+                await asyncio.wait_for(resumed.wait(), timeout=5)
+            finally:
+                node.cancel()
+                await asyncio.gather(node, return_exceptions=True)
+
+    assert [message["seq"] for message in received[0]] == [0, 1]
+    resume, *chunks = received[1]
+    assert resume["protocol"] == "stream-resume"
+    [resumable] = resume["data"]["requests"]
+    assert (resumable["request_id"], resumable["first_seq"]) == ("req", 1)
+    # The unacked chunk is replayed, the acked one is not
+    assert [chunk["seq"] for chunk in chunks] == [1, 2]
+    assert chunks[-1]["status"] == InferenceStatusCodes.DONE.value
@@ -0,0 +1,130 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from galadriel_node.llm_backends.vllm import VllmProcess
+from galadriel_node.sdk.entities import SdkError
+from galadriel_node.sdk.llm_router import LlmRouter
+from galadriel_node.sdk.node import vllm_supervisor
+from galadriel_node.sdk.node.vllm_supervisor import VllmSupervisor
+from galadriel_node.sdk.protocol.entities import (
+    InferenceErrorStatusCodes,
+    InferenceRequest,
+    InferenceStatusCodes,
+)
+
+PORT = 19434
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def _supervisor(router: LlmRouter, process: VllmProcess) -> VllmSupervisor:
+    return VllmSupervisor(
+        [process], "mock_model", router, check_interval=0.01, max_failed_probes=3
+    )
+
+
+async def test_dead_process_is_restarted_and_readmitted():
+    router = LlmRouter([BASE_URL])
+    process = VllmProcess(pid=1, port=PORT, log_file="vllm.log")
+    supervisor = _supervisor(router, process)
+    restarted = asyncio.Event()
+    ready = asyncio.Event()
+
+    async def wait_for_vllm(_process, _model_id, **_):
+        restarted.set()
+        await ready.wait()
+
+    with patch(
+        "galadriel_node.llm_backends.vllm.is_process_running", return_value=False
+    ), patch("galadriel_node.llm_backends.vllm.stop") as mock_stop, patch(
+        "galadriel_node.llm_backends.vllm.respawn", return_value=2
+    ) as mock_respawn, patch(
+        "galadriel_node.sdk.node.vllm_supervisor.wait_for_vllm",
+        side_effect=wait_for_vllm,
+    ):
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.wait_for(restarted.wait(), timeout=1)
+
+        # While vLLM restarts, requests fail fast instead of hitting the dead backend
+        assert not router.healthy_backends()
+        chunks = [
+            chunk
+            async for chunk in router.execute(
+                InferenceRequest(id="id", chat_request={})
+            )
+        ]
+        assert chunks[0].status == InferenceStatusCodes.ERROR
+        assert chunks[0].error.status_code == InferenceErrorStatusCodes.UNKNOWN_ERROR
+
+        ready.set()
+        await asyncio.sleep(0)
+        task.cancel()
+
+    assert router.healthy_backends()
+    assert supervisor.restarts == 1
+    assert process.pid == 2
+    mock_stop.assert_called_with(1)
+    mock_respawn.assert_called_with(process, "mock_model")
+
+
+async def test_restart_after_consecutive_failed_probes():
+    router = LlmRouter([BASE_URL])
+    process = VllmProcess(pid=1, port=PORT, log_file="vllm.log")
+    supervisor = _supervisor(router, process)
+    probe = AsyncMock(side_effect=[True, False, False, True, False, False, False])
+    supervisor._probe = probe
+    restarted = asyncio.Event()
+
+    with patch(
+        "galadriel_node.llm_backends.vllm.is_process_running", return_value=True
+    ), patch("galadriel_node.llm_backends.vllm.stop"), patch(
+        "galadriel_node.llm_backends.vllm.respawn", return_value=2
+    ), patch(
+        "galadriel_node.sdk.node.vllm_supervisor.wait_for_vllm",
+        new_callable=AsyncMock,
+        side_effect=lambda *_, **__: restarted.set(),
+    ):
+        task = asyncio.create_task(supervisor.run())
+        await asyncio.wait_for(restarted.wait(), timeout=1)
+        task.cancel()
+
+    # Two failures in a row are tolerated, the third one triggers the restart
+    assert probe.await_count == 7
+
+
+async def test_failed_restart_is_retried_with_backoff():
+    router = LlmRouter([BASE_URL])
+    process = VllmProcess(pid=1, port=PORT, log_file="vllm.log")
+    supervisor = _supervisor(router, process)
+    sleep = AsyncMock()
+
+    with patch("galadriel_node.llm_backends.vllm.stop"), patch(
+        "galadriel_node.llm_backends.vllm.respawn", side_effect=[None, None, 3]
+    ), patch(
+        "galadriel_node.sdk.node.vllm_supervisor.wait_for_vllm", new_callable=AsyncMock
+    ), patch(
+        "galadriel_node.sdk.node.vllm_supervisor.asyncio.sleep", sleep
+    ):
+        await supervisor._restart(process)
+
+    assert process.pid == 3
+    assert [call.args[0] for call in sleep.await_args_list] == [5, 10]
+
+
+async def test_restart_gives_up_after_the_timeout():
+    process = VllmProcess(pid=1, port=PORT, log_file="vllm.log")
+
+    with patch(
+        "galadriel_node.llm_backends.vllm.is_process_running", return_value=True
+    ), patch(
+        "galadriel_node.sdk.node.checks.llm_http_check.execute",
+        side_effect=ConnectionError(),
+    ), patch.object(
+        vllm_supervisor, "WAIT_POLL_INTERVAL", 0.01
+    ):
+        with pytest.raises(SdkError, match="was not ready after"):
+            await asyncio.wait_for(
+                vllm_supervisor.wait_for_vllm(process, "mock_model", timeout=0.05),
+                timeout=5,
+            )
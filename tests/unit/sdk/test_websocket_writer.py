@@ -0,0 +1,80 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import websockets
+
+from galadriel_node.sdk.websocket_writer import MessagePriority
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
+
+
+async def test_control_messages_are_sent_first():
+    websocket = AsyncMock()
+    writer = WebsocketWriter(websocket)
+
+    await writer.send("chunk1")
+    await writer.send("chunk2")
+    await writer.send("pong", MessagePriority.CONTROL)
+    writer.start()
+    await writer.join()
+    await writer.stop()
+
+    sent = [c.args[0] for c in websocket.send.await_args_list]
+    assert sent == ["pong", "chunk1", "chunk2"]
+
+
+async def test_inference_producers_wait_for_free_slots():
+    websocket = AsyncMock()
+    writer = WebsocketWriter(websocket, max_pending_inference_messages=1)
+
+    await writer.send("chunk1")
+    blocked = asyncio.create_task(writer.send("chunk2"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    # Control messages never wait for inference slots
+    await writer.send("pong", MessagePriority.CONTROL)
+
+    writer.start()
+    await blocked
+    await writer.join()
+    await writer.stop()
+
+    sent = [c.args[0] for c in websocket.send.await_args_list]
+    assert sent == ["pong", "chunk1", "chunk2"]
+
+
+async def test_send_raises_after_connection_closed():
+    websocket = AsyncMock()
+    websocket.send.side_effect = websockets.ConnectionClosedOK(None, None)
+    writer = WebsocketWriter(websocket)
+    writer.start()
+
+    await writer.send("chunk1")
+    await writer.join()
+
+    with pytest.raises(websockets.ConnectionClosed):
+        await writer.send("chunk2")
+    await writer.stop()
+
+
+async def test_waiting_send_raises_when_the_write_fails():
+    websocket = AsyncMock()
+    websocket.send.side_effect = websockets.ConnectionClosedError(None, None)
+    writer = WebsocketWriter(websocket)
+    writer.start()
+
+    with pytest.raises(websockets.ConnectionClosed):
+        await writer.send("done", wait=True)
+    await writer.stop()
+
+
+async def test_waiting_send_fails_when_the_writer_stops():
+    writer = WebsocketWriter(AsyncMock())
+    delivery = asyncio.create_task(writer.send("done", wait=True))
+    await asyncio.sleep(0)
+
+    writer.start()
+    await writer.stop()
+
+    with pytest.raises(ConnectionError):
+        await delivery
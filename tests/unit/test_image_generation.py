@@ -1,6 +1,5 @@
 import json
 import pytest
-import asyncio
 from unittest.mock import MagicMock, AsyncMock, patch
 from websockets import WebSocketClientProtocol
 from galadriel_node.sdk.diffusers import Diffusers
@@ -11,6 +10,7 @@ from galadriel_node.sdk.image_generation import (
 from galadriel_node.sdk.protocol.entities import (
     ImageGenerationWebsocketRequest,
 )
+from galadriel_node.sdk.websocket_writer import WebsocketWriter
 
 
 def mock_diffusers_init(self, model: str):
@@ -31,8 +31,8 @@ def websocket():
 
 
 @pytest.fixture
-def send_lock():
-    return asyncio.Lock()
+def writer(websocket):
+    return WebsocketWriter(websocket)
 
 
 @pytest.fixture
@@ -43,8 +43,11 @@ def image_request():
 
 
 @pytest.mark.asyncio
-async def test_process_request(image_generation, image_request, websocket, send_lock):
-    await image_generation.process_request(image_request, websocket, send_lock)
+async def test_process_request(image_generation, image_request, websocket, writer):
+    writer.start()
+    await image_generation.process_request(image_request, writer)
+    await writer.join()
+    await writer.stop()
     websocket.send.assert_called_once()
     args = websocket.send.call_args.args
     response_data = json.loads(args[0])
@@ -73,10 +76,3 @@ def test_validate_request_invalid_data(image_generation):
     data = {"invalid_key": "invalid_value"}
     request = validate_image_generation_request(data)
     assert request is None
-
-
-@pytest.mark.asyncio
-async def test_is_idle(image_generation):
-    assert await image_generation.no_pending_requests() is True
-    await image_generation.counter.increment()
-    assert await image_generation.no_pending_requests() is False